@@ -0,0 +1,44 @@
+"""Helpers to run the integration against a minimal, offline Home Assistant core."""
+
+from __future__ import annotations
+
+import logging
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import device_registry as dr  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+
+from custom_components.sensor_proxy.const import DOMAIN  # noqa: E402
+
+ENERGY_ATTRIBUTES = {
+    "unit_of_measurement": "kWh",
+    "device_class": "energy",
+    "state_class": "total_increasing",
+}
+
+
+async def async_create_hass(config_dir: str) -> HomeAssistant:
+    """Return a core with loaded (empty) device and entity registries."""
+    hass = HomeAssistant(config_dir)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    return hass
+
+
+def create_sensor_platform(hass: HomeAssistant) -> EntityPlatform:
+    """Return the sensor platform proxies and meters are added to."""
+    return EntityPlatform(
+        hass=hass,
+        logger=logging.getLogger(__name__),
+        domain="sensor",
+        platform_name=DOMAIN,
+        platform=None,
+        scan_interval=timedelta(seconds=30),
+        entity_namespace=None,
+    )
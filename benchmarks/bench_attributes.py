@@ -0,0 +1,90 @@
+"""Measure memory held by proxies mirroring sources with large attribute dicts.
+
+Run from the repository root::
+
+    python benchmarks/bench_attributes.py --proxies 5000 --keys 50
+
+``copy`` reproduces the previous behaviour (a full attribute copy per proxy),
+``passthrough`` shares the source's ReadOnlyDict and ``include`` mirrors a
+few selected keys only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.sensor_proxy.config import AttributeFilter  # noqa: E402
+from custom_components.sensor_proxy.proxy_sensor import (  # noqa: E402
+    SensorProxySensor,
+)
+
+MODES = {
+    "copy": AttributeFilter(include=None, exclude=frozenset()),
+    "passthrough": None,
+    "include": AttributeFilter(include=("friendly_name",), exclude=frozenset()),
+}
+
+
+async def _run(mode: str, proxies: int, keys: int) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        attributes = {f"attribute_{i}": f"value_{i}" for i in range(keys)}
+        attributes.update(unit_of_measurement="W", friendly_name="Source")
+        for i in range(proxies):
+            hass.states.async_set(f"sensor.bench_source_{i}", "1", attributes)
+
+        gc.collect()
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        entities = [
+            SensorProxySensor(
+                hass,
+                f"proxy {i}",
+                f"sensor.bench_source_{i}",
+                f"proxy_{i}",
+                attribute_filter=MODES[mode],
+            )
+            for i in range(proxies)
+        ]
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert all(entity.available for entity in entities)
+        await hass.async_stop(force=True)
+
+    return {
+        "mode": mode,
+        "proxies": proxies,
+        "keys": keys,
+        "total_kib": (after - before) / 1024,
+        "bytes_per_proxy": (after - before) / proxies,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--proxies", type=int, default=5000)
+    parser.add_argument("--keys", type=int, default=50)
+    args = parser.parse_args()
+
+    for mode in MODES:
+        result = asyncio.run(_run(mode, args.proxies, args.keys))
+        print(
+            "{mode:<12} proxies={proxies} keys={keys} "
+            "total={total_kib:.0f}KiB per_proxy={bytes_per_proxy:.0f}B".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
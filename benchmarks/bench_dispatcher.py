@@ -0,0 +1,120 @@
+"""Compare event-to-write latency of the shared dispatcher with per-entity tracking.
+
+Run from the repository root::
+
+    python benchmarks/bench_dispatcher.py --proxies 1800
+
+Each simulated proxy records the time its callback runs; the latency is measured
+from just before ``hass.states.async_set`` on the source to that callback.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.event import async_track_state_change_event  # noqa: E402
+
+from custom_components.sensor_proxy.dispatcher import (  # noqa: E402
+    async_get_dispatcher,
+)
+
+
+async def _run(mode: str, proxies: int, sources: int, rounds: int) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        source_ids = [f"sensor.bench_source_{i}" for i in range(sources)]
+        for entity_id in source_ids:
+            hass.states.async_set(entity_id, "0")
+
+        received = 0
+
+        def _on_event(event) -> None:
+            nonlocal received
+            received += 1
+
+        start = time.perf_counter()
+        unsubs = []
+        dispatcher = async_get_dispatcher(hass)
+        for i in range(proxies):
+            # A fresh bound method per proxy, like one SensorProxySensor each
+            listener = _Proxy(_on_event).on_event
+            source = source_ids[i % sources]
+            if mode == "per_entity":
+                unsubs.append(async_track_state_change_event(hass, source, listener))
+            else:
+                unsubs.append(dispatcher.async_register(source, listener))
+        register_s = time.perf_counter() - start
+
+        latencies: list[float] = []
+        for value in range(1, rounds + 1):
+            for entity_id in source_ids:
+                t0 = time.perf_counter_ns()
+                hass.states.async_set(entity_id, str(value))
+                await asyncio.sleep(0)
+                latencies.append((time.perf_counter_ns() - t0) / 1000)
+
+        start = time.perf_counter()
+        for unsub in unsubs:
+            unsub()
+        unregister_s = time.perf_counter() - start
+
+        await hass.async_stop(force=True)
+
+    return {
+        "mode": mode,
+        "proxies": proxies,
+        "sources": sources,
+        "events": len(latencies),
+        "callbacks": received,
+        "register_ms": register_s * 1000,
+        "unregister_ms": unregister_s * 1000,
+        "latency_us_mean": statistics.fmean(latencies),
+        "latency_us_p99": statistics.quantiles(latencies, n=100)[98],
+    }
+
+
+class _Proxy:
+    __slots__ = ("_sink",)
+
+    def __init__(self, sink) -> None:
+        self._sink = sink
+
+    def on_event(self, event) -> None:
+        self._sink(event)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--proxies", type=int, default=1800)
+    parser.add_argument(
+        "--sources",
+        type=int,
+        default=None,
+        help="distinct sources (default: one per proxy; fewer means shared sources)",
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    sources = args.sources or args.proxies
+
+    for mode in ("per_entity", "dispatcher"):
+        result = asyncio.run(_run(mode, args.proxies, sources, args.rounds))
+        print(
+            "{mode:<11} proxies={proxies} sources={sources} events={events} "
+            "register={register_ms:.1f}ms unregister={unregister_ms:.1f}ms "
+            "latency mean={latency_us_mean:.1f}us p99={latency_us_p99:.1f}us".format(
+                **result
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
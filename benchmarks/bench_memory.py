@@ -0,0 +1,118 @@
+"""Measure the memory held per proxy for large fleets of plain mirrors.
+
+Run from the repository root::
+
+    python benchmarks/bench_memory.py --proxies 10000
+
+The proxies come from one multi-entity block with utility meter options and
+templates, like a typical fleet configuration, and are added to a platform on
+an in-memory core (see ``_hass.py``). Allocations from expanding the config
+to the sources' first update being mirrored are traced. The run reports the
+bytes per proxy in total (including Home Assistant's states and registry
+entries), the part allocated from the integration's code, the size of a
+proxy object with its instance ``__dict__``, and the number of entries in
+that dict.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import sys
+import tempfile
+import tracemalloc
+
+from _hass import ENERGY_ATTRIBUTES, async_create_hass, create_sensor_platform
+
+from custom_components.sensor_proxy import sensor
+from custom_components.sensor_proxy.schema import PLATFORM_SCHEMA
+
+# Traces with a frame in the integration count as its own allocations
+_OWN_CODE = "*custom_components/sensor_proxy/*"
+
+
+def _block(size: int) -> dict:
+    return PLATFORM_SCHEMA(
+        {
+            "platform": "sensor_proxy",
+            "source_base": "sensor.bench",
+            "name_base": "proxy",
+            "unique_id_base": "proxy",
+            "sensors": [
+                {
+                    "suffix": str(i),
+                    "create_utility_meters": False,
+                    "utility_meter_types": ["daily", "monthly"],
+                    "utility_name_template": "proxy_{cycle}",
+                    "utility_unique_id_template": "proxy_{cycle}",
+                }
+                for i in range(size)
+            ],
+        }
+    )
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        source_ids = [f"sensor.bench_{i}" for i in range(args.proxies)]
+        for entity_id in source_ids:
+            hass.states.async_set(entity_id, "1.5", ENERGY_ATTRIBUTES)
+        block = _block(args.proxies)
+        entity_platform = create_sensor_platform(hass)
+
+        gc.collect()
+        tracemalloc.start(32)
+        before = tracemalloc.take_snapshot()
+        proxies: list = []
+        await sensor.async_setup_platform(hass, block, proxies.extend)
+        await entity_platform.async_add_entities(proxies)
+        await hass.async_block_till_done()
+        for entity_id in source_ids:
+            hass.states.async_set(entity_id, "2.5", ENERGY_ATTRIBUTES)
+        await hass.async_block_till_done()
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        assert all(proxy.native_value == "2.5" for proxy in proxies)
+        total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        own_filter = [tracemalloc.Filter(True, _OWN_CODE, all_frames=True)]
+        own = sum(
+            stat.size_diff
+            for stat in after.filter_traces(own_filter).compare_to(
+                before.filter_traces(own_filter), "filename"
+            )
+        )
+        instance = sum(
+            sys.getsizeof(proxy) + sys.getsizeof(vars(proxy)) for proxy in proxies
+        )
+        dict_entries = sum(len(vars(proxy)) for proxy in proxies)
+        await hass.async_stop(force=True)
+
+    return {
+        "proxies": args.proxies,
+        "total_mib": total / 1024 / 1024,
+        "bytes_per_proxy": total / args.proxies,
+        "own_per_proxy": own / args.proxies,
+        "instance_bytes": instance / args.proxies,
+        "dict_entries": dict_entries / args.proxies,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--proxies", type=int, default=10000)
+    args = parser.parse_args()
+
+    result = asyncio.run(_run(args))
+    print(
+        "proxies={proxies} total={total_mib:.1f}MiB per_proxy={bytes_per_proxy:.0f}B "
+        "integration={own_per_proxy:.0f}B instance={instance_bytes:.0f}B "
+        "__dict__ entries={dict_entries:.0f}".format(**result)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Measure startup time until all utility meters are available.
+
+Run from the repository root::
+
+    python benchmarks/bench_meter_creation.py --proxies 500
+
+``per_proxy`` creates the meters of each proxy with its own registry pass and
+its own ``async_add_entities`` call, concurrently, like the previous one-task-
+per-proxy startup. ``batched`` hands all proxies to the creation queue at once.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from _hass import ENERGY_ATTRIBUTES, async_create_hass, create_sensor_platform
+
+from custom_components.sensor_proxy.meter_queue import async_get_meter_queue
+from custom_components.sensor_proxy.proxy_sensor import SensorProxySensor
+
+
+async def _run(mode: str, proxies: int, meter_types: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        platform = create_sensor_platform(hass)
+        for i in range(proxies):
+            hass.states.async_set(f"sensor.bench_energy_{i}", str(i), ENERGY_ATTRIBUTES)
+        entities = [
+            SensorProxySensor(
+                hass,
+                f"proxy energy {i}",
+                f"sensor.bench_energy_{i}",
+                f"proxy_energy_{i}",
+                create_utility_meters=True,
+                utility_meter_types=meter_types,
+            )
+            for i in range(proxies)
+        ]
+        await platform.async_add_entities(entities)
+        await hass.async_block_till_done()
+
+        queue = async_get_meter_queue(hass)
+        start = time.perf_counter()
+        if mode == "per_proxy":
+            await asyncio.gather(
+                *(queue.async_create_meters([entity]) for entity in entities)
+            )
+        else:
+            await queue.async_create_meters(entities)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - start
+
+        meters = sum(
+            1
+            for entity in entities
+            for meter_type in meter_types
+            if hass.states.get(f"{entity.entity_id}_{meter_type}") is not None
+        )
+        await hass.async_stop(force=True)
+
+    return {
+        "mode": mode,
+        "proxies": proxies,
+        "meters": meters,
+        "elapsed_ms": elapsed * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--proxies", type=int, default=500)
+    parser.add_argument(
+        "--meter-types", nargs="+", default=["daily", "weekly", "monthly", "yearly"]
+    )
+    args = parser.parse_args()
+
+    for mode in ("per_proxy", "batched"):
+        result = asyncio.run(_run(mode, args.proxies, args.meter_types))
+        print(
+            "{mode:<10} proxies={proxies} meters={meters} "
+            "all meters available after {elapsed_ms:.0f}ms".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
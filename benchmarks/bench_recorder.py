@@ -0,0 +1,136 @@
+"""Estimate recorder rows per hour written for proxies under each recording policy.
+
+Run from the repository root::
+
+    python benchmarks/bench_recorder.py --proxies 200 --hz 1 --seconds 20
+
+Each source updates ``--hz`` times per second on an in-memory core (see
+``_hass.py``). A share of the updates (``--attribute-only``) only changes an
+attribute, as many devices do with e.g. ``last_seen`` or signal strength.
+Every ``state_changed`` event of a proxy is one row in the recorder's
+``states`` table. Its attributes are stored as the recorder itself encodes
+them, deduplicated by content: a new ``state_attributes`` row is only written
+for attributes not stored before. States rows are scaled to one hour; the
+distinct attribute rows are reported for the whole run, since with ``state``
+they stop growing after the first write of each proxy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from _hass import async_create_hass, create_sensor_platform
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.const import EVENT_STATE_CHANGED
+
+from custom_components.sensor_proxy import sensor
+from custom_components.sensor_proxy.schema import PLATFORM_SCHEMA
+
+POLICIES = {
+    "all": {"recording": "all"},
+    "state": {"recording": "state"},
+}
+
+
+def _block(size: int, options: dict) -> dict:
+    return PLATFORM_SCHEMA(
+        {
+            "platform": "sensor_proxy",
+            "source_base": "sensor.bench",
+            "name_base": "proxy",
+            "unique_id_base": "proxy",
+            "sensors": [{"suffix": str(i), **options} for i in range(size)],
+        }
+    )
+
+
+async def _run(policy: str, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        source_ids = [f"sensor.bench_{i}" for i in range(args.proxies)]
+        values = dict.fromkeys(source_ids, 0)
+        for entity_id in source_ids:
+            hass.states.async_set(entity_id, "0", {"unit_of_measurement": "W"})
+
+        entity_platform = create_sensor_platform(hass)
+        proxies: list = []
+        await sensor.async_setup_platform(
+            hass, _block(args.proxies, POLICIES[policy]), proxies.extend
+        )
+        await entity_platform.async_add_entities(proxies)
+        await hass.async_block_till_done()
+
+        proxy_ids = {proxy.entity_id for proxy in proxies}
+        rows = 0
+        attributes: set[bytes] = set()
+        attribute_bytes = 0
+
+        def _count(event) -> None:
+            nonlocal rows, attribute_bytes
+            if event.data["entity_id"] in proxy_ids:
+                rows += 1
+                shared = StateAttributes.shared_attrs_bytes_from_event(event, None)
+                if shared not in attributes:
+                    attributes.add(shared)
+                    attribute_bytes += len(shared)
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _count)
+
+        rng = random.Random(0)
+        interval = 1 / args.hz
+        ticks = int(args.seconds * args.hz)
+        start = time.perf_counter()
+        for tick in range(ticks):
+            for entity_id in source_ids:
+                if rng.random() >= args.attribute_only:
+                    values[entity_id] += rng.randint(1, 50)
+                hass.states.async_set(
+                    entity_id,
+                    str(values[entity_id]),
+                    {"unit_of_measurement": "W", "rssi": rng.randint(-90, -40)},
+                )
+            await asyncio.sleep(
+                max(0, start + (tick + 1) * interval - time.perf_counter())
+            )
+        elapsed = time.perf_counter() - start
+
+        await hass.async_stop(force=True)
+
+    scale = 3600 / elapsed
+    return {
+        "policy": policy,
+        "proxies": args.proxies,
+        "state_rows_per_hour": rows * scale,
+        "attribute_rows": len(attributes),
+        "attribute_kib": attribute_bytes / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--proxies", type=int, default=200)
+    parser.add_argument("--hz", type=float, default=1)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument(
+        "--attribute-only",
+        type=float,
+        default=0.3,
+        help="share of source updates that only change an attribute",
+    )
+    args = parser.parse_args()
+
+    for policy in POLICIES:
+        result = asyncio.run(_run(policy, args))
+        print(
+            "{policy:<6} proxies={proxies} states rows/h={state_rows_per_hour:.0f} "
+            "attribute rows={attribute_rows} "
+            "({attribute_kib:.1f} KiB)".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
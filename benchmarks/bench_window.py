@@ -0,0 +1,134 @@
+"""Measure the cost of windowed proxies updated at a fixed rate.
+
+Run from the repository root::
+
+    python benchmarks/bench_window.py --proxies 1000 --hz 10 --seconds 10
+
+Every source is set ``--hz`` times per second, in real time, on an in-memory
+core (see ``_hass.py``). For plain mirroring and each window function the run
+reports the event-loop time spent per source update, the share of wall time
+the loop was busy, and the memory per proxy allocated during setup (the
+window's ring buffer is preallocated, so it does not grow while running).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import tracemalloc
+
+from _hass import async_create_hass, create_sensor_platform
+
+from custom_components.sensor_proxy import sensor
+from custom_components.sensor_proxy.schema import PLATFORM_SCHEMA
+from custom_components.sensor_proxy.window import WINDOW_FUNCTIONS
+
+POWER_ATTRIBUTES = {
+    "unit_of_measurement": "W",
+    "device_class": "power",
+    "state_class": "measurement",
+}
+
+
+def _block(size: int, function: str | None, samples: int, duration: int) -> dict:
+    window = (
+        {}
+        if function is None
+        else {
+            "window": {
+                "function": function,
+                "max_samples": samples,
+                "duration": duration,
+            }
+        }
+    )
+    return PLATFORM_SCHEMA(
+        {
+            "platform": "sensor_proxy",
+            "source_base": "sensor.bench",
+            "name_base": "proxy",
+            "unique_id_base": "proxy",
+            "sensors": [{"suffix": str(i), **window} for i in range(size)],
+        }
+    )
+
+
+async def _run(function: str | None, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        source_ids = [f"sensor.bench_{i}" for i in range(args.proxies)]
+        for entity_id in source_ids:
+            hass.states.async_set(entity_id, "0", POWER_ATTRIBUTES)
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        entity_platform = create_sensor_platform(hass)
+        proxies: list = []
+        await sensor.async_setup_platform(
+            hass,
+            _block(args.proxies, function, args.samples, args.duration),
+            proxies.extend,
+        )
+        await entity_platform.async_add_entities(proxies)
+        await hass.async_block_till_done()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+        rng = random.Random(0)
+        interval = 1 / args.hz
+        ticks = int(args.seconds * args.hz)
+        busy = 0.0
+        start = time.perf_counter()
+        for tick in range(ticks):
+            tick_start = time.perf_counter()
+            for entity_id in source_ids:
+                hass.states.async_set(
+                    entity_id, f"{rng.uniform(0, 3000):.1f}", POWER_ATTRIBUTES
+                )
+            await asyncio.sleep(0)
+            busy += time.perf_counter() - tick_start
+            # Hold the update rate; an overloaded loop simply falls behind
+            await asyncio.sleep(
+                max(0, start + (tick + 1) * interval - time.perf_counter())
+            )
+        elapsed = time.perf_counter() - start
+        written = hass.data["sensor_proxy"]["write_stats"]["written"]
+
+        await hass.async_stop(force=True)
+
+    events = ticks * args.proxies
+    return {
+        "mode": function or "mirror",
+        "proxies": args.proxies,
+        "events": events,
+        "written": written,
+        "update_us": busy / events * 1_000_000,
+        "loop_busy_percent": busy / elapsed * 100,
+        "memory_bytes_per_proxy": allocated / args.proxies,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--proxies", type=int, default=1000)
+    parser.add_argument("--hz", type=float, default=10)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--samples", type=int, default=100, help="window max_samples")
+    parser.add_argument("--duration", type=int, default=60, help="window seconds")
+    args = parser.parse_args()
+
+    for function in (None, *WINDOW_FUNCTIONS):
+        result = asyncio.run(_run(function, args))
+        print(
+            "{mode:<6} proxies={proxies} events={events} written={written} "
+            "update={update_us:.1f}us loop busy={loop_busy_percent:.0f}% "
+            "mem/proxy={memory_bytes_per_proxy:.0f}B".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Offline load-test suite for proxies and utility meters, with JSON output.
+
+Run from the repository root::
+
+    python benchmarks/run_suite.py --sizes 100 1000 10000 --output results.json
+
+Every size runs on a fresh in-memory Home Assistant core with empty registries
+(see ``_hass.py``); nothing is loaded from disk or the network. Per size it
+measures:
+
+- ``setup_ms``: ``async_setup_platform`` for one multi-entity block of N proxies
+  plus adding the entities to the platform
+- ``latency_us_mean`` / ``latency_us_p99``: source ``async_set`` to proxy write
+- ``writes_per_second``: proxy state writes while all sources update in rounds
+- ``memory_bytes_per_proxy``: traced allocations of setup, divided by N
+- ``meter_create_ms`` / ``meter_cleanup_ms``: creating 4 utility meters for each
+  of N energy proxies, and removing the proxies (and so their meters) from the
+  entity registry
+
+Compare two result files to spot regressions between releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from _hass import ENERGY_ATTRIBUTES, async_create_hass, create_sensor_platform
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.sensor_proxy import sensor
+from custom_components.sensor_proxy.meter_queue import async_get_meter_queue
+from custom_components.sensor_proxy.schema import PLATFORM_SCHEMA
+
+MANIFEST = Path(__file__).resolve().parents[1] / (
+    "custom_components/sensor_proxy/manifest.json"
+)
+METER_TYPES = ["daily", "weekly", "monthly", "yearly"]
+POWER_ATTRIBUTES = {"unit_of_measurement": "W", "device_class": "power"}
+
+
+def _block(size: int, meters: bool) -> dict:
+    return PLATFORM_SCHEMA(
+        {
+            "platform": "sensor_proxy",
+            "source_base": "sensor.bench",
+            "name_base": "proxy",
+            "unique_id_base": "proxy",
+            "sensors": [
+                {
+                    "suffix": str(i),
+                    **(
+                        {
+                            "create_utility_meters": True,
+                            "utility_meter_types": METER_TYPES,
+                        }
+                        if meters
+                        else {}
+                    ),
+                }
+                for i in range(size)
+            ],
+        }
+    )
+
+
+async def _async_setup(hass, size: int, meters: bool):
+    """Set up N proxies through the sensor platform; return (platform, proxies)."""
+    entity_platform = create_sensor_platform(hass)
+    proxies: list = []
+    await sensor.async_setup_platform(hass, _block(size, meters), proxies.extend)
+    await entity_platform.async_add_entities(proxies)
+    return entity_platform, proxies
+
+
+async def _bench_updates(size: int, rounds: int) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        source_ids = [f"sensor.bench_{i}" for i in range(size)]
+        for entity_id in source_ids:
+            hass.states.async_set(entity_id, "0", POWER_ATTRIBUTES)
+
+        start = time.perf_counter()
+        _, proxies = await _async_setup(hass, size, meters=False)
+        await hass.async_block_till_done()
+        setup_s = time.perf_counter() - start
+
+        latencies: list[float] = []
+        written_before = hass.data["sensor_proxy"]["write_stats"]["written"]
+        start = time.perf_counter()
+        for value in range(1, rounds + 1):
+            for entity_id in source_ids:
+                t0 = time.perf_counter_ns()
+                hass.states.async_set(entity_id, str(value), POWER_ATTRIBUTES)
+                latencies.append((time.perf_counter_ns() - t0) / 1000)
+            await asyncio.sleep(0)
+        elapsed = time.perf_counter() - start
+        writes = hass.data["sensor_proxy"]["write_stats"]["written"] - written_before
+
+        await hass.async_stop(force=True)
+
+    return {
+        "setup_ms": setup_s * 1000,
+        "latency_us_mean": statistics.fmean(latencies),
+        "latency_us_p99": statistics.quantiles(latencies, n=100)[98],
+        "writes": writes,
+        "writes_per_second": writes / elapsed,
+        "proxies_created": len(proxies),
+    }
+
+
+async def _bench_memory(size: int) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        for i in range(size):
+            hass.states.async_set(f"sensor.bench_{i}", "0", POWER_ATTRIBUTES)
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        await _async_setup(hass, size, meters=False)
+        await hass.async_block_till_done()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+        await hass.async_stop(force=True)
+
+    return {"memory_bytes_per_proxy": allocated / size}
+
+
+async def _bench_meters(size: int) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        for i in range(size):
+            hass.states.async_set(f"sensor.bench_{i}", str(i), ENERGY_ATTRIBUTES)
+        _, proxies = await _async_setup(hass, size, meters=True)
+        await hass.async_block_till_done()
+
+        start = time.perf_counter()
+        await async_get_meter_queue(hass).async_create_meters(proxies)
+        await hass.async_block_till_done()
+        create_s = time.perf_counter() - start
+        meters = len(hass.data["sensor_proxy"]["created_utility_meters"])
+
+        # Same path as a proxy dropped by sensor_proxy.reload
+        entity_registry = er.async_get(hass)
+        start = time.perf_counter()
+        for proxy in proxies:
+            entity_registry.async_remove(proxy.entity_id)
+        await hass.async_block_till_done()
+        cleanup_s = time.perf_counter() - start
+        remaining = len(hass.states.async_entity_ids("sensor")) - size
+
+        await hass.async_stop(force=True)
+
+    return {
+        "meters_created": meters,
+        "meter_create_ms": create_s * 1000,
+        "meter_cleanup_ms": cleanup_s * 1000,
+        "entities_left_after_cleanup": remaining,
+    }
+
+
+async def _run(size: int, rounds: int) -> dict:
+    return {
+        "proxies": size,
+        **await _bench_updates(size, rounds),
+        **await _bench_memory(size),
+        **await _bench_meters(size),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write JSON here (default: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        results.append(asyncio.run(_run(size, args.rounds)))
+        print(
+            "proxies={proxies} setup={setup_ms:.0f}ms "
+            "latency mean={latency_us_mean:.1f}us p99={latency_us_p99:.1f}us "
+            "writes/s={writes_per_second:.0f} mem/proxy={memory_bytes_per_proxy:.0f}B "
+            "meters={meters_created} create={meter_create_ms:.0f}ms "
+            "cleanup={meter_cleanup_ms:.0f}ms".format(**results[-1]),
+            file=sys.stderr,
+        )
+
+    report = {
+        "integration_version": json.loads(MANIFEST.read_text())["version"],
+        "homeassistant_version": HA_VERSION,
+        "python_version": platform.python_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "rounds": args.rounds,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,45 @@
+from typing import Any
+
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.discovery import async_load_platform
 
-from .const import DOMAIN
+from .const import (
+    CONF_DIAGNOSTICS,
+    CONF_PROXIES,
+    DOMAIN,
+    SERVICE_CREATE_PROXIES,
+    SERVICE_DUMP_DIAGNOSTICS,
+    SERVICE_RELOAD,
+    SERVICE_REMOVE_PROXIES,
+)
+from .diagnostics import async_get_diagnostics
+from .managed import async_get_managed_proxies
+from .reload import async_reload_yaml_proxies
+from .schema import RECORDING_SCHEMA
+from .state_store import async_get_state_store
+from .stats import async_get_stats
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
-    """Set up the integration from YAML (no-op here)."""
+    """Set up the integration: global options, state store and services.
+
+    Reads the `sensor_proxy:` defaults, enables diagnostics when asked, loads
+    the stored proxy states and service-created proxies, and registers the
+    reload, dump_diagnostics, create_proxies and remove_proxies services.
+    """
     # Read global configuration under `sensor_proxy:` and store defaults
     from .const import (
+        CONF_BACKFILL_UTILITY_METERS,
         CONF_CREATE_UTILITY_METERS,
+        CONF_RECORDING,
         CONF_UTILITY_METER_TYPES,
+        DEFAULT_BACKFILL_UTILITY_METERS,
         DEFAULT_CREATE_UTILITY_METERS,
+        DEFAULT_RECORDING,
         DEFAULT_UTILITY_METER_TYPES,
     )
 
@@ -22,10 +51,86 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     hass.data[DOMAIN][CONF_UTILITY_METER_TYPES] = conf.get(
         CONF_UTILITY_METER_TYPES, DEFAULT_UTILITY_METER_TYPES
     )
+    hass.data[DOMAIN][CONF_BACKFILL_UTILITY_METERS] = conf.get(
+        CONF_BACKFILL_UTILITY_METERS, DEFAULT_BACKFILL_UTILITY_METERS
+    )
+
+    # Recorder policy for proxies without their own `recording` option
+    recording = vol.Schema(RECORDING_SCHEMA, extra=vol.ALLOW_EXTRA)(conf)
+    hass.data[DOMAIN][CONF_RECORDING] = recording.get(CONF_RECORDING, DEFAULT_RECORDING)
 
     # Keep track of created utility meters for cleanup/bookkeeping
     hass.data[DOMAIN].setdefault("created_utility_meters", {})
 
+    # Callback timing and the aggregate statistics sensor are opt-in
+    if conf.get(CONF_DIAGNOSTICS, False):
+        async_get_stats(hass).timing = True
+        hass.async_create_task(
+            async_load_platform(
+                hass, Platform.SENSOR, DOMAIN, {CONF_DIAGNOSTICS: True}, config
+            )
+        )
+
+    # Last known proxy states, so proxies are available before their sources
+    await async_get_state_store(hass).async_load()
+
+    async def _async_reload(call: ServiceCall) -> dict[str, int]:
+        """Re-read YAML proxies and apply only what changed."""
+        return await async_reload_yaml_proxies(hass)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RELOAD,
+        _async_reload,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_dump_diagnostics(call: ServiceCall) -> dict[str, Any]:
+        """Return the diagnostics data; YAML installs have no entry to download."""
+        return async_get_diagnostics(hass)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_DIAGNOSTICS,
+        _async_dump_diagnostics,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    # Proxies created by service; their platform is loaded once there are any
+    managed = async_get_managed_proxies(hass)
+    await managed.async_load(config)
+
+    async def _async_create_proxies(call: ServiceCall) -> dict[str, Any]:
+        """Add a list of proxy definitions in one batch."""
+        return await managed.async_create(call.data[CONF_PROXIES])
+
+    async def _async_remove_proxies(call: ServiceCall) -> dict[str, Any]:
+        """Remove a list of service-created proxies in one batch."""
+        return await managed.async_remove(call.data[CONF_PROXIES])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CREATE_PROXIES,
+        _async_create_proxies,
+        schema=vol.Schema(
+            {vol.Required(CONF_PROXIES): vol.All(cv.ensure_list, [dict])}
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REMOVE_PROXIES,
+        _async_remove_proxies,
+        schema=vol.Schema(
+            {
+                vol.Required(CONF_PROXIES): vol.All(
+                    cv.ensure_list, [vol.Any(cv.string, dict)]
+                )
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     return True
 
 
@@ -0,0 +1,188 @@
+"""Incremental aggregation functions for aggregate proxies."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from abc import ABC, abstractmethod
+
+__all__ = [
+    "AGGREGATE_FUNCTIONS",
+    "Aggregator",
+    "ExtremeAggregator",
+    "MeanAggregator",
+    "SumAggregator",
+    "create_aggregator",
+]
+
+AGGREGATE_SUM = "sum"
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+AGGREGATE_MAX = "max"
+AGGREGATE_FUNCTIONS = (AGGREGATE_SUM, AGGREGATE_MEAN, AGGREGATE_MIN, AGGREGATE_MAX)
+
+# Recompute the float sum exactly after this many incremental changes
+SUM_RESYNC_INTERVAL = 10_000
+
+
+class Aggregator(ABC):
+    """Value per source key, combined into one result.
+
+    ``update`` returns False when the key's value did not change. ``None``
+    marks a source without a numeric value; it does not take part.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self) -> None:
+        self._values: dict[str, float | None] = {}
+
+    @property
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of sources with a value."""
+
+    def value(self, key: str) -> float | None:
+        """Return the current value of ``key``."""
+        return self._values.get(key)
+
+    @abstractmethod
+    def update(self, key: str, value: float | None) -> bool:
+        """Set the value of ``key``; return False if it did not change."""
+
+    def remove(self, key: str) -> bool:
+        """Forget ``key``; return False if it was not known."""
+        if key not in self._values:
+            return False
+        self.update(key, None)
+        del self._values[key]
+        return True
+
+    @abstractmethod
+    def result(self) -> float | None:
+        """Return the combined value, or None without any source value."""
+
+    def result_key(self) -> str | None:
+        """Return the source the result comes from (min/max only)."""
+        return None
+
+
+class SumAggregator(Aggregator):
+    """Running sum: O(1) per change."""
+
+    __slots__ = ("_total", "_count", "_changes")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._total = 0.0
+        self._count = 0
+        self._changes = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def update(self, key: str, value: float | None) -> bool:
+        values = self._values
+        old = values.get(key)
+        if old == value and key in values:
+            return False
+        values[key] = value
+        if old is not None:
+            self._total -= old
+            self._count -= 1
+        if value is not None:
+            self._total += value
+            self._count += 1
+
+        self._changes += 1
+        if self._changes >= SUM_RESYNC_INTERVAL:
+            # Drop the rounding error accumulated by incremental updates
+            self._changes = 0
+            self._total = math.fsum(v for v in values.values() if v is not None)
+        return True
+
+    def result(self) -> float | None:
+        return self._total if self._count else None
+
+
+class MeanAggregator(SumAggregator):
+    """Running mean: O(1) per change."""
+
+    __slots__ = ()
+
+    def result(self) -> float | None:
+        return self._total / self._count if self._count else None
+
+
+class ExtremeAggregator(Aggregator):
+    """Running minimum or maximum using a heap with lazy deletion.
+
+    A change pushes the new value; superseded entries stay in the heap until
+    they reach the top and are skipped there. The heap is rebuilt when stale
+    entries dominate, so a change costs O(log n) amortised.
+    """
+
+    __slots__ = ("_sign", "_heap", "_versions", "_count")
+
+    def __init__(self, maximum: bool) -> None:
+        super().__init__()
+        # heapq is a min-heap; negate values to track the maximum
+        self._sign = -1.0 if maximum else 1.0
+        self._heap: list[tuple[float, str, int]] = []
+        # Kept after a key is removed, so its stale heap entries never match again
+        self._versions: dict[str, int] = {}
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def update(self, key: str, value: float | None) -> bool:
+        values = self._values
+        old = values.get(key)
+        if old == value and key in values:
+            return False
+        values[key] = value
+        self._count += (value is not None) - (old is not None)
+        version = self._versions[key] = self._versions.get(key, 0) + 1
+        if value is not None:
+            heapq.heappush(self._heap, (self._sign * value, key, version))
+            if len(self._heap) > 2 * len(values) + 32:
+                self._rebuild()
+        return True
+
+    def _rebuild(self) -> None:
+        versions = self._versions
+        self._heap = [
+            (self._sign * value, key, versions[key])
+            for key, value in self._values.items()
+            if value is not None
+        ]
+        heapq.heapify(self._heap)
+
+    def _top(self) -> tuple[float, str, int] | None:
+        heap = self._heap
+        versions = self._versions
+        while heap and versions.get(heap[0][1]) != heap[0][2]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def result(self) -> float | None:
+        top = self._top()
+        return None if top is None else self._sign * top[0]
+
+    def result_key(self) -> str | None:
+        top = self._top()
+        return None if top is None else top[1]
+
+
+def create_aggregator(function: str) -> Aggregator:
+    """Return an empty aggregator for one of ``AGGREGATE_FUNCTIONS``."""
+    if function == AGGREGATE_SUM:
+        return SumAggregator()
+    if function == AGGREGATE_MEAN:
+        return MeanAggregator()
+    if function in (AGGREGATE_MIN, AGGREGATE_MAX):
+        return ExtremeAggregator(maximum=function == AGGREGATE_MAX)
+    raise ValueError(f"Unknown aggregate function: {function}")
@@ -0,0 +1,345 @@
+"""Proxy sensor combining the states of many sources."""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import MATCH_ALL
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+
+from .aggregate import (
+    AGGREGATE_MAX,
+    AGGREGATE_MEAN,
+    AGGREGATE_MIN,
+    AGGREGATE_SUM,
+    create_aggregator,
+)
+from .config import AggregateDefinition, UpdateOptions
+from .dispatcher import async_get_dispatcher
+from .proxy_sensor import SensorProxySensor, _source_pending
+from .source_index import async_get_source_index
+from .transform import NumberFunction, unit_converter
+
+__all__ = ["SensorProxyAggregate", "SensorProxyAggregateStateOnly"]
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_AGGREGATE = "aggregate"
+ATTR_SOURCES = "sources"
+ATTR_VALID_SOURCES = "valid_sources"
+ATTR_EXTREME_ENTITY_ID = "entity_id"
+
+_TOTAL_STATE_CLASSES = (SensorStateClass.TOTAL, SensorStateClass.TOTAL_INCREASING)
+
+
+class SensorProxyAggregate(SensorProxySensor):
+    """Sum, mean, min or max over many sources, updated per changed source.
+
+    Uses the same dispatcher, throttle, snapshot and utility meter machinery
+    as ``SensorProxySensor``; only the way a source state becomes the proxy
+    state differs. Each source change is one ``Aggregator.update`` call: O(1)
+    for sum and mean, a heap push for min and max. Unit, device class and icon
+    come from the first numeric source; the other sources are converted to
+    that unit with Home Assistant's unit converters, and left out (logged)
+    when they cannot be. A sum of energy totals keeps the last valid value of
+    an unavailable source, so utility meters do not count it twice when it
+    returns.
+    """
+
+    __slots__ = (
+        "_function",
+        "_pattern",
+        "_sources",
+        "_aggregator",
+        "_precision",
+        "_unit_source",
+        "_unit_converters",
+        "_unconvertible",
+        "_listener",
+        "_source_unsubs",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: Optional[str],
+        unique_id: Optional[str],
+        function: str,
+        sources: Optional[Iterable[str]] = None,
+        pattern: Optional[str] = None,
+        device_id: Optional[str] = None,
+        create_utility_meters: Optional[bool] = None,
+        utility_meter_types: Optional[Iterable[str]] = None,
+        utility_name_template: Optional[str] = None,
+        utility_unique_id_template: Optional[str] = None,
+        update_options: Optional[UpdateOptions] = None,
+    ) -> None:
+        self._function = function
+        self._pattern = pattern
+        self._sources: dict[str, None] = dict.fromkeys(sources or ())
+        self._aggregator = create_aggregator(function)
+        # Decimals of the most precise source, used to round away float noise
+        self._precision = 0
+        self._unit_source: str | None = None
+        # (source unit, aggregate unit) -> conversion, None if not convertible
+        self._unit_converters: dict[
+            tuple[str | None, str | None], NumberFunction | None
+        ] = {}
+        # Sources left out for their unit, logged once until they take part again
+        self._unconvertible: set[str] = set()
+        self._listener: Callable[[Event[EventStateChangedData]], None] | None = None
+        self._source_unsubs: list[CALLBACK_TYPE] = []
+        super().__init__(
+            hass,
+            name,
+            None,
+            unique_id,
+            device_id,
+            create_utility_meters=create_utility_meters,
+            utility_meter_types=utility_meter_types,
+            utility_name_template=utility_name_template,
+            utility_unique_id_template=utility_unique_id_template,
+            update_options=update_options,
+        )
+
+    @classmethod
+    def from_definition(
+        cls, hass: HomeAssistant, definition: AggregateDefinition
+    ) -> SensorProxyAggregate:
+        """Create the aggregate described by an expanded YAML definition."""
+        return cls(
+            hass,
+            definition.name,
+            definition.unique_id,
+            definition.function,
+            sources=definition.sources,
+            pattern=definition.pattern,
+            device_id=definition.device_id,
+            create_utility_meters=definition.create_utility_meters,
+            utility_meter_types=definition.utility_meter_types,
+            utility_name_template=definition.utility_name_template,
+            utility_unique_id_template=definition.utility_unique_id_template,
+            update_options=definition.update_options,
+        )
+
+    @property
+    def collapsible(self) -> bool:
+        return False
+
+    @property
+    def definition_key(self) -> str:
+        if self._attr_unique_id:
+            return self._attr_unique_id
+        return f"{self._function}:{self._attr_name}"
+
+    @property
+    def backfill_statistic_id(self) -> str | None:
+        # No single statistic holds the aggregate's history
+        return None
+
+    @callback
+    def _async_track_sources(
+        self, listener: Callable[[Event[EventStateChangedData]], None]
+    ) -> CALLBACK_TYPE:
+        self._listener = listener
+        if self._pattern is not None:
+            index = async_get_source_index(self.hass)
+            self._sources.update(dict.fromkeys(index.async_match(self._pattern)))
+            self._source_unsubs.append(
+                index.async_watch(self._pattern, self._async_source_added)
+            )
+        dispatcher = async_get_dispatcher(self.hass)
+        for entity_id in self._sources:
+            self._source_unsubs.append(dispatcher.async_register(entity_id, listener))
+        return self._async_untrack_sources
+
+    @callback
+    def _async_untrack_sources(self) -> None:
+        for unsub in self._source_unsubs:
+            unsub()
+        self._source_unsubs.clear()
+
+    @callback
+    def _async_source_added(self, entity_id: str) -> None:
+        """Include a source that started matching the pattern."""
+        if entity_id in self._sources or self._listener is None:
+            return
+        self._sources[entity_id] = None
+        self._source_unsubs.append(
+            async_get_dispatcher(self.hass).async_register(entity_id, self._listener)
+        )
+        self._async_source_changed(entity_id, None, self.hass.states.get(entity_id))
+
+    def update(self) -> None:
+        self._update_sources()
+        self._apply_result()
+
+    def _update_sources(self) -> None:
+        states = self._hass.states
+        for entity_id in self._sources:
+            self._aggregator.update(
+                entity_id, self._source_value(entity_id, states.get(entity_id))
+            )
+
+    def _sources_pending(self) -> bool:
+        # Only while none of the sources is loaded yet
+        states = self._hass.states
+        return all(
+            _source_pending(states.get(entity_id)) for entity_id in self._sources
+        )
+
+    def _apply_source_state(self, entity_id: str, source_state) -> bool:
+        unit = self._attr_native_unit_of_measurement
+        changed = self._aggregator.update(
+            entity_id, self._source_value(entity_id, source_state)
+        )
+        if self._attr_native_unit_of_measurement != unit:
+            # The unit source switched units; convert the other sources again
+            self._update_sources()
+            changed = True
+        if not changed and not self._restored:
+            return False
+        return self._apply_result()
+
+    def _source_value(self, entity_id: str, source_state) -> float | None:
+        """Return the numeric value of a source state (None = not taking part)."""
+        value = None
+        if source_state is not None:
+            try:
+                value = float(source_state.state)
+            except ValueError:
+                pass
+            else:
+                if not math.isfinite(value):
+                    value = None
+        if value is None:
+            if (
+                self._function == AGGREGATE_SUM
+                and self._attr_state_class in _TOTAL_STATE_CLASSES
+            ):
+                # An unavailable energy total still counts with its last value
+                return self._aggregator.value(entity_id)
+            return None
+
+        unit = source_state.attributes.get("unit_of_measurement")
+        if self._unit_source is None or self._unit_source == entity_id:
+            self._unit_source = entity_id
+            self._mirror_source_attributes(source_state.attributes)
+        elif unit != self._attr_native_unit_of_measurement:
+            if (value := self._converted(entity_id, value, unit)) is None:
+                return None
+            # Decimals of the converted value, e.g. 1500 W -> 1.5 kW
+            fraction = repr(round(value, 6)).partition(".")[2].rstrip("0")
+            if len(fraction) > self._precision and fraction.isdigit():
+                self._precision = len(fraction)
+            return value
+
+        _, _, fraction = source_state.state.partition(".")
+        if len(fraction) > self._precision and fraction.isdigit():
+            self._precision = len(fraction)
+        self._unconvertible.discard(entity_id)
+        return value
+
+    def _converted(
+        self, entity_id: str, value: float, unit: str | None
+    ) -> float | None:
+        """Return ``value`` in the aggregate's unit; None if it cannot be converted."""
+        target = self._attr_native_unit_of_measurement
+        key = (unit, target)
+        if key in self._unit_converters:
+            convert = self._unit_converters[key]
+        else:
+            convert = self._unit_converters[key] = (
+                None if target is None else unit_converter(unit, target)
+            )
+        if convert is None:
+            if entity_id not in self._unconvertible:
+                self._unconvertible.add(entity_id)
+                _LOGGER.warning(
+                    "Aggregate %s leaves out %s: its unit %s cannot be converted to %s",
+                    self.name,
+                    entity_id,
+                    unit,
+                    target,
+                )
+            return None
+        self._unconvertible.discard(entity_id)
+        return convert(value)
+
+    def _mirror_source_attributes(self, attrs: Mapping[str, Any]) -> None:
+        state_class = attrs.get("state_class")
+        if self._function != AGGREGATE_SUM and state_class in _TOTAL_STATE_CLASSES:
+            # A mean or extreme of totals is not itself a total
+            state_class = None
+        self._attr_native_unit_of_measurement = attrs.get("unit_of_measurement")
+        self._attr_device_class = attrs.get("device_class")
+        self._attr_state_class = state_class
+        self._attr_icon = attrs.get("icon")
+
+    def _apply_result(self) -> bool:
+        """Set the proxy state from the aggregate; return False if unchanged."""
+        aggregator = self._aggregator
+        result = aggregator.result()
+        if result is None:
+            if self._restored:
+                if self._sources_pending():
+                    return False
+                # A source reported, but no numeric value: the snapshot is stale
+                self._drop_snapshot()
+                return True
+            if not self._attr_available:
+                return False
+            self._attr_available = False
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            _LOGGER.info("Aggregate %s has no numeric source left", self.name)
+            return True
+
+        decimals = self._precision + (2 if self._function == AGGREGATE_MEAN else 0)
+        value = round(result, decimals) if decimals else int(round(result))
+        attributes: dict[str, Any] = {
+            ATTR_AGGREGATE: self._function,
+            ATTR_SOURCES: len(self._sources),
+            ATTR_VALID_SOURCES: aggregator.count,
+        }
+        if self._function in (AGGREGATE_MIN, AGGREGATE_MAX):
+            attributes[ATTR_EXTREME_ENTITY_ID] = aggregator.result_key()
+
+        if (
+            self._attr_available
+            and not self._restored
+            and value == self._attr_native_value
+            and attributes == self._attr_extra_state_attributes
+        ):
+            return False
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        self._attr_available = True
+        if self._restored:
+            self._end_restore()
+        return True
+
+    def _meter_source_attributes(self) -> Mapping[str, Any] | None:
+        if not self._attr_available:
+            return None
+        return {
+            "state_class": self._attr_state_class,
+            "device_class": self._attr_device_class,
+        }
+
+
+class SensorProxyAggregateStateOnly(SensorProxyAggregate):
+    """An aggregate whose attributes are not recorded (``recording: state``)."""
+
+    __slots__ = ()
+
+    _unrecorded_attributes = frozenset({MATCH_ALL})
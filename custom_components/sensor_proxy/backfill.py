@@ -0,0 +1,208 @@
+"""Backfill of new utility meters from the recorder's long-term statistics."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
+
+from homeassistant.components.utility_meter.const import HOURLY, QUARTER_HOURLY
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import EnergyConverter
+
+from .reset_scheduler import period_start
+
+if TYPE_CHECKING:
+    from .proxy_sensor import SensorProxySensor
+    from .virtual_meter import UtilityMeterEngine
+
+__all__ = ["BACKFILL_BATCH_SIZE", "async_backfill_meters"]
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORDER_DOMAIN = "recorder"
+
+# Upper bound of proxies whose statistics are read by one recorder query
+BACKFILL_BATCH_SIZE = 50
+
+# Cycles shorter than the hourly statistics they would be read from
+_SKIPPED_METER_TYPES = frozenset((QUARTER_HOURLY, HOURLY))
+
+
+@dataclass(slots=True)
+class _Backfill:
+    """The cycles of one proxy's meter engine still to be seeded."""
+
+    engine: UtilityMeterEngine
+    statistic_id: str
+    meter_types: tuple[str, ...]
+    # Period start timestamp of each cycle in ``meter_types``
+    starts: tuple[float, ...]
+    # Engine value and time when the meters were added; later usage is counted live
+    seed_value: Decimal
+    seed_time: float
+
+
+def _cycle_totals(
+    rows: Sequence[dict[str, Any]], backfill: _Backfill
+) -> list[Decimal] | None:
+    """Return the usage of each cycle of ``backfill`` up to its seed time.
+
+    The usage is the sum of the hourly ``change`` since the cycle started, plus
+    the rise from the last compiled hour to the seed value. Runs in the
+    recorder's executor.
+    """
+    if not rows:
+        return None
+    starts = backfill.starts
+    totals = [0.0] * len(starts)
+    last_state: float | None = None
+    last_end = 0.0
+    for row in rows:
+        if row["end"] > backfill.seed_time:
+            break
+        if (change := row.get("change")) is not None and change > 0:
+            for index, start in enumerate(starts):
+                if row["start"] >= start:
+                    totals[index] += change
+        if row.get("state") is not None:
+            last_state = row["state"]
+            last_end = row["end"]
+
+    tail = 0.0
+    if last_state is not None:
+        tail = max(float(backfill.seed_value) - last_state, 0.0)
+    # Round away float noise to the precision of the source value
+    exponent = Decimal(1).scaleb(min(backfill.seed_value.as_tuple().exponent, 0))
+    return [
+        Decimal(str(total + (tail if last_end >= start else 0.0))).quantize(exponent)
+        for total, start in zip(totals, starts)
+    ]
+
+
+def _read_totals(
+    hass: HomeAssistant,
+    start_time: datetime,
+    units: dict[str, str] | None,
+    backfills: Sequence[_Backfill],
+) -> list[list[Decimal] | None]:
+    """Read the statistics of all ``backfills`` in one query; executor only."""
+    from homeassistant.components.recorder.statistics import (
+        statistics_during_period,
+    )
+
+    statistics = statistics_during_period(
+        hass,
+        start_time,
+        None,
+        {backfill.statistic_id for backfill in backfills},
+        "hour",
+        units,
+        {"change", "state"},
+    )
+    return [
+        _cycle_totals(statistics.get(backfill.statistic_id, ()), backfill)
+        for backfill in backfills
+    ]
+
+
+def _plan(proxy: SensorProxySensor, now: datetime) -> _Backfill | None:
+    statistic_id = proxy.backfill_statistic_id
+    engine = proxy.meter_engine
+    if statistic_id is None or engine is None or engine.last_value is None:
+        return None
+    meter_types = tuple(
+        meter_type
+        for meter_type in engine.unrestored_meter_types()
+        if meter_type not in _SKIPPED_METER_TYPES
+    )
+    if not meter_types:
+        return None
+    return _Backfill(
+        engine,
+        statistic_id,
+        meter_types,
+        tuple(
+            period_start(meter_type, now, engine.offset).timestamp()
+            for meter_type in meter_types
+        ),
+        engine.last_value,
+        now.timestamp(),
+    )
+
+
+async def async_backfill_meters(
+    hass: HomeAssistant, proxies: Iterable[SensorProxySensor]
+) -> dict[str, Any] | None:
+    """Seed the new utility meters of ``proxies`` from recorder statistics.
+
+    Called right after the meters were added: every engine's current value is
+    taken as the seed before the first await, so usage counted live from then
+    on is not also backfilled. Proxies are read ``BACKFILL_BATCH_SIZE`` at a
+    time, each batch with one ``statistics_during_period`` call in the
+    recorder's executor, so the event loop only applies the results. Returns
+    metrics for diagnostics, or None when nothing was backfilled.
+    """
+    if RECORDER_DOMAIN not in hass.config.components:
+        return None
+    now = dt_util.utcnow()
+    by_unit: dict[str | None, list[_Backfill]] = {}
+    for proxy in proxies:
+        if (backfill := _plan(proxy, now)) is not None:
+            by_unit.setdefault(backfill.engine.unit, []).append(backfill)
+    if not by_unit:
+        return None
+
+    # Imported here: the recorder is optional and heavy to import
+    from homeassistant.components.recorder import get_instance
+
+    instance = get_instance(hass)
+    start = time.perf_counter()
+    queries = seeded = meters = 0
+    for unit, backfills in by_unit.items():
+        # Statistics are converted to the unit the meters count in
+        units = (
+            {EnergyConverter.UNIT_CLASS: unit}
+            if unit in EnergyConverter.VALID_UNITS
+            else None
+        )
+        for index in range(0, len(backfills), BACKFILL_BATCH_SIZE):
+            batch = backfills[index : index + BACKFILL_BATCH_SIZE]
+            start_time = dt_util.utc_from_timestamp(
+                min(min(backfill.starts) for backfill in batch)
+            )
+            try:
+                results = await instance.async_add_executor_job(
+                    _read_totals, hass, start_time, units, batch
+                )
+            except Exception:  # A failed backfill must not stop meter creation
+                _LOGGER.exception(
+                    "Backfilling %d utility meter engines failed", len(batch)
+                )
+                continue
+            queries += 1
+            for backfill, totals in zip(batch, results):
+                if totals is None:
+                    continue
+                backfill.engine.async_backfill(dict(zip(backfill.meter_types, totals)))
+                seeded += 1
+                meters += len(totals)
+
+    duration = time.perf_counter() - start
+    _LOGGER.debug(
+        "Backfilled %d utility meter(s) of %d proxies with %d queries in %.1f ms",
+        meters,
+        seeded,
+        queries,
+        duration * 1000,
+    )
+    return {
+        "proxies": seeded,
+        "meters": meters,
+        "queries": queries,
+        "duration_ms": round(duration * 1000, 3),
+    }
@@ -0,0 +1,123 @@
+"""Collapsing of proxy-of-proxy chains onto their root source."""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import DATA_PROXY_CHAINS, DOMAIN
+
+if TYPE_CHECKING:
+    from .proxy_sensor import SensorProxySensor
+
+__all__ = ["ProxyChains", "async_get_proxy_chains"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ProxyChains:
+    """Subscribe proxies of plain-mirror proxies straight to the root source.
+
+    For ``sensor.c -> sensor.b -> sensor.a``, where ``sensor.b`` is a proxy that
+    mirrors ``sensor.a`` unchanged, ``sensor.c`` listens to ``sensor.a``
+    directly. It then sees the same state one event-loop hop earlier, and
+    ``sensor.b`` is not in its path any more. Only plain mirrors (no transform,
+    window, throttle, hold-down or attribute filter) are skipped; any other hop, such as
+    a utility meter or a transforming proxy, ends the chain.
+
+    Proxies register when they are added and unregister when removed. Each
+    change re-resolves only the proxies downstream of it, through the
+    ``source -> proxies`` index, so reloads rewire chains incrementally.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entity_registry = er.async_get(hass)
+        self._proxies: dict[str, SensorProxySensor] = {}
+        # Configured source entity id -> entity ids of the proxies mirroring it
+        self._downstream: dict[str, set[str]] = {}
+
+    @callback
+    def async_register(self, proxy: SensorProxySensor) -> str:
+        """Add ``proxy``; return the entity id it should listen to."""
+        entity_id = proxy.entity_id
+        self._proxies[entity_id] = proxy
+        self._downstream.setdefault(proxy.source_entity_id, set()).add(entity_id)
+        self._async_rewire_downstream(entity_id)
+        return self.resolve(proxy.source_entity_id)
+
+    @callback
+    def async_unregister(self, proxy: SensorProxySensor) -> None:
+        entity_id = proxy.entity_id
+        if self._proxies.get(entity_id) is not proxy:
+            return
+        del self._proxies[entity_id]
+        source = proxy.source_entity_id
+        if (downstream := self._downstream.get(source)) is not None:
+            downstream.discard(entity_id)
+            if not downstream:
+                del self._downstream[source]
+        self._async_rewire_downstream(entity_id)
+
+    def resolve(self, entity_id: str) -> str:
+        """Return the root source reached from ``entity_id`` through plain mirrors."""
+        start = entity_id
+        seen: set[str] = set()
+        while (proxy := self._proxies.get(entity_id)) is not None and (
+            proxy.collapsible
+        ):
+            if entity_id in seen:
+                _LOGGER.warning("Proxy chain through %s is a loop", start)
+                return start
+            seen.add(entity_id)
+            entity_id = proxy.source_entity_id
+        return entity_id
+
+    @callback
+    def _async_rewire_downstream(self, entity_id: str) -> None:
+        """Re-resolve every proxy whose chain passes through ``entity_id``."""
+        pending = deque([entity_id])
+        visited = {entity_id}
+        while pending:
+            for downstream_id in self._downstream.get(pending.popleft(), ()):
+                if downstream_id in visited:
+                    continue
+                visited.add(downstream_id)
+                pending.append(downstream_id)
+                proxy = self._proxies[downstream_id]
+                proxy.async_rewire(self.resolve(proxy.source_entity_id))
+
+    def as_dict(self) -> list[dict[str, Any]]:
+        """Return every proxy whose source belongs to this integration."""
+        chains = []
+        for entity_id, proxy in self._proxies.items():
+            source = proxy.source_entity_id
+            entry = self._entity_registry.async_get(source)
+            if source not in self._proxies and (
+                entry is None or entry.platform != DOMAIN
+            ):
+                continue
+            tracked = proxy.tracked_source_id
+            chain = {"entity_id": entity_id, "source": source, "listens_to": tracked}
+            if tracked == source:
+                middle = self._proxies.get(source)
+                chain["not_collapsed"] = (
+                    "source is not a proxy (e.g. a utility meter)"
+                    if middle is None
+                    else "source proxy changes the value or its timing"
+                )
+            chains.append(chain)
+        return chains
+
+
+@callback
+def async_get_proxy_chains(hass: HomeAssistant) -> ProxyChains:
+    """Return the integration-wide chain resolver, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (chains := domain_data.get(DATA_PROXY_CHAINS)) is None:
+        chains = domain_data[DATA_PROXY_CHAINS] = ProxyChains(hass)
+    return chains
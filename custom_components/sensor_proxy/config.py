@@ -2,17 +2,73 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import Any, Mapping, Sequence
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID
 
 from .const import (
+    CONF_AGGREGATE,
+    CONF_ATTRIBUTES_EXCLUDE,
+    CONF_ATTRIBUTES_INCLUDE,
+    CONF_BACKFILL_UTILITY_METERS,
     CONF_CREATE_UTILITY_METERS,
+    CONF_DEADBAND,
+    CONF_DEBOUNCE,
+    CONF_HOLD_DOWN,
+    CONF_MAX_HOLD_DOWN,
+    CONF_MIN_INTERVAL,
+    CONF_RECORDING,
+    CONF_SOURCES,
+    CONF_TRANSFORM,
     CONF_UTILITY_METER_TYPES,
+    CONF_WINDOW,
+    CONF_WINDOW_DURATION,
+    CONF_WINDOW_FUNCTION,
+    CONF_WINDOW_MAX_SAMPLES,
     DEFAULT_CREATE_UTILITY_METERS,
+    DEFAULT_MAX_HOLD_DOWN_FACTOR,
     DEFAULT_UTILITY_METER_TYPES,
+    DEFAULT_WINDOW_MAX_SAMPLES,
+    SENSORS_ALL,
+)
+from .naming import (
+    DEFAULT_METER_TEMPLATE,
+    FIELD_CYCLE,
+    FIELD_DEVICE,
+    FIELD_SOURCE_OBJECT_ID,
+    FIELD_STAR,
+    FIELD_SUFFIX,
+    compile_base_template,
+    compile_template,
+    duplicates,
+    meter_unique_id_star,
 )
 
 
+class ValuePool:
+    """Equal configuration values shared by the definitions of one block.
+
+    Strings are interned and other hashable values deduplicated, so the
+    proxies expanded from one multi-entity block reference a single copy of
+    their templates, meter types, options and attribute keys.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self) -> None:
+        self._values: dict[Any, Any] = {}
+
+    def share(self, value: Any) -> Any:
+        """Return the pooled value equal to ``value`` (None stays None)."""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return sys.intern(value)
+        return self._values.setdefault(value, value)
+
+
 @dataclass(frozen=True)
 class UtilityOptions:
     """Resolved utility meter configuration for a proxy sensor."""
@@ -54,3 +110,492 @@ def build_utility_options(
         name_template=config.get("utility_name_template"),
         unique_id_template=config.get("utility_unique_id_template"),
     )
+
+
+@dataclass(frozen=True)
+class UpdateOptions:
+    """Resolved write-rate options for a proxy sensor (seconds / deadband)."""
+
+    min_interval: float | None = None
+    debounce: float | None = None
+    deadband: float | None = None
+    deadband_percent: bool = False
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.min_interval is not None
+            or self.debounce is not None
+            or self.deadband is not None
+        )
+
+
+def _seconds(value: Any) -> float | None:
+    if value is None:
+        return None
+    if hasattr(value, "total_seconds"):
+        value = value.total_seconds()
+    return float(value) or None
+
+
+def build_update_options(config: Mapping[str, Any]) -> UpdateOptions:
+    """Return the throttle/debounce/deadband options of a proxy config."""
+
+    deadband = config.get(CONF_DEADBAND)
+    percent = isinstance(deadband, str) and deadband.endswith("%")
+    if percent:
+        deadband = deadband[:-1]
+
+    return UpdateOptions(
+        min_interval=_seconds(config.get(CONF_MIN_INTERVAL)),
+        debounce=_seconds(config.get(CONF_DEBOUNCE)),
+        deadband=None if deadband is None else float(deadband),
+        deadband_percent=percent,
+    )
+
+
+def build_transform_steps(
+    config: Mapping[str, Any],
+) -> tuple[tuple[str, Any], ...] | None:
+    """Return the ordered (step, argument) pairs of a proxy's transform chain."""
+
+    steps = config.get(CONF_TRANSFORM)
+    if not steps:
+        return None
+    return tuple(next(iter(step.items())) for step in steps)
+
+
+@dataclass(frozen=True)
+class WindowOptions:
+    """Windowed statistic of a proxy: ``function`` over the latest samples."""
+
+    function: str
+    max_samples: int = DEFAULT_WINDOW_MAX_SAMPLES
+    duration: float | None = None
+
+
+def build_window_options(config: Mapping[str, Any]) -> WindowOptions | None:
+    """Return the window options of a proxy config, or None without a window."""
+
+    window = config.get(CONF_WINDOW)
+    if window is None:
+        return None
+    return WindowOptions(
+        function=window[CONF_WINDOW_FUNCTION],
+        max_samples=window.get(CONF_WINDOW_MAX_SAMPLES, DEFAULT_WINDOW_MAX_SAMPLES),
+        duration=_seconds(window.get(CONF_WINDOW_DURATION)),
+    )
+
+
+@dataclass(frozen=True)
+class FlapOptions:
+    """Hold-down of a proxy whose source becomes unavailable (seconds)."""
+
+    hold_down: float
+    max_hold_down: float
+
+
+def build_flap_options(config: Mapping[str, Any]) -> FlapOptions | None:
+    """Return the hold-down options of a proxy config, or None without a hold-down."""
+
+    hold_down = _seconds(config.get(CONF_HOLD_DOWN))
+    if hold_down is None:
+        return None
+    max_hold_down = _seconds(config.get(CONF_MAX_HOLD_DOWN))
+    if max_hold_down is None:
+        max_hold_down = hold_down * DEFAULT_MAX_HOLD_DOWN_FACTOR
+    return FlapOptions(hold_down=hold_down, max_hold_down=max_hold_down)
+
+
+@dataclass(frozen=True)
+class AttributeFilter:
+    """Source attribute keys mirrored by a proxy, compiled once at setup."""
+
+    include: tuple[str, ...] | None
+    exclude: frozenset[str]
+
+    def apply(self, attributes: Mapping[str, Any]) -> dict[str, Any]:
+        """Return the mirrored subset of ``attributes``."""
+        if self.include is not None:
+            return {key: attributes[key] for key in self.include if key in attributes}
+        exclude = self.exclude
+        return {key: value for key, value in attributes.items() if key not in exclude}
+
+
+def build_attribute_filter(
+    config: Mapping[str, Any],
+    default: AttributeFilter | None = None,
+    pool: ValuePool | None = None,
+) -> AttributeFilter | None:
+    """Return the attribute filter of a proxy config, or ``default`` if unset.
+
+    ``None`` means no filtering: the proxy then shares the source's immutable
+    attribute mapping instead of copying it. Keys are interned, and equal
+    filters of one block are shared through ``pool``.
+    """
+
+    include = config.get(CONF_ATTRIBUTES_INCLUDE)
+    exclude = config.get(CONF_ATTRIBUTES_EXCLUDE)
+    if include is None and exclude is None:
+        return default
+
+    excluded = frozenset(sys.intern(key) for key in exclude or ())
+    attribute_filter = AttributeFilter(
+        include=(
+            None
+            if include is None
+            else tuple(
+                dict.fromkeys(sys.intern(k) for k in include if k not in excluded)
+            )
+        ),
+        exclude=excluded,
+    )
+    return attribute_filter if pool is None else pool.share(attribute_filter)
+
+
+@dataclass(frozen=True, slots=True)
+class ProxyConfig:
+    """Options a running proxy keeps: its source, device and utility meters.
+
+    One slotted record per proxy instead of an instance attribute per option;
+    the values come from a block's ``ValuePool``, so they are shared.
+    """
+
+    source_entity_id: str | None  # None for aggregates, which have several
+    device_id: str | None = None
+    create_utility_meters: bool | None = None  # None = use the global default
+    utility_meter_types: tuple[str, ...] | None = None
+    backfill_utility_meters: bool | None = None  # None = use the global default
+    utility_name_template: str | None = None
+    utility_unique_id_template: str | None = None
+    suffix: str | None = None  # multi-entity blocks only
+
+
+@dataclass(frozen=True, slots=True)
+class ProxyDefinition:
+    """One proxy expanded from a YAML block; equal definitions mean no change."""
+
+    name: str | None
+    source_entity_id: str
+    unique_id: str | None
+    device_id: str | None = None
+    suffix: str | None = None
+    create_utility_meters: bool | None = None
+    utility_meter_types: tuple[str, ...] | None = None
+    backfill_utility_meters: bool | None = None
+    utility_name_template: str | None = None
+    utility_unique_id_template: str | None = None
+    update_options: UpdateOptions | None = None
+    attribute_filter: AttributeFilter | None = None
+    transform: tuple[tuple[str, Any], ...] | None = None
+    window: WindowOptions | None = None
+    recording: str | None = None
+    flap: FlapOptions | None = None
+
+    @property
+    def key(self) -> str:
+        """Identity used to match running proxies with reloaded config."""
+        if self.unique_id:
+            return self.unique_id
+        return f"{self.source_entity_id}:{self.name}"
+
+
+@dataclass(frozen=True, slots=True)
+class AggregateDefinition:
+    """One aggregate proxy; ``sources`` lists entity ids, or ``pattern`` globs them."""
+
+    name: str | None
+    unique_id: str | None
+    function: str
+    sources: tuple[str, ...] | None = None
+    pattern: str | None = None
+    device_id: str | None = None
+    create_utility_meters: bool | None = None
+    utility_meter_types: tuple[str, ...] | None = None
+    utility_name_template: str | None = None
+    utility_unique_id_template: str | None = None
+    update_options: UpdateOptions | None = None
+    recording: str | None = None
+
+    @property
+    def key(self) -> str:
+        """Identity used to match running proxies with reloaded config."""
+        if self.unique_id:
+            return self.unique_id
+        return f"{self.function}:{self.name}"
+
+
+def build_aggregate_definition(config: Mapping[str, Any]) -> AggregateDefinition:
+    """Return the definition of a validated aggregate block."""
+    sources = config[CONF_SOURCES]
+    meter_types = config.get(CONF_UTILITY_METER_TYPES)
+    return AggregateDefinition(
+        name=config.get(CONF_NAME),
+        unique_id=config.get(CONF_UNIQUE_ID),
+        function=config[CONF_AGGREGATE],
+        sources=None if isinstance(sources, str) else tuple(sources),
+        pattern=sources if isinstance(sources, str) else None,
+        device_id=config.get("device_id"),
+        create_utility_meters=config.get(CONF_CREATE_UTILITY_METERS),
+        utility_meter_types=None if meter_types is None else tuple(meter_types),
+        utility_name_template=config.get("utility_name_template"),
+        utility_unique_id_template=config.get("utility_unique_id_template"),
+        update_options=build_update_options(config),
+        recording=config.get(CONF_RECORDING),
+    )
+
+
+def _definition(
+    config: Mapping[str, Any],
+    name: str | None,
+    source_entity_id: str,
+    unique_id: str | None,
+    device_id: str | None,
+    attribute_filter: AttributeFilter | None,
+    pool: ValuePool,
+    suffix: str | None = None,
+) -> ProxyDefinition:
+    meter_types = config.get(CONF_UTILITY_METER_TYPES)
+    return ProxyDefinition(
+        name=name,
+        source_entity_id=source_entity_id,
+        unique_id=unique_id,
+        device_id=pool.share(device_id),
+        suffix=suffix,
+        # None = use the global default
+        create_utility_meters=config.get(CONF_CREATE_UTILITY_METERS),
+        utility_meter_types=(
+            None
+            if meter_types is None
+            else pool.share(tuple(sys.intern(t) for t in meter_types))
+        ),
+        backfill_utility_meters=config.get(CONF_BACKFILL_UTILITY_METERS),
+        utility_name_template=pool.share(config.get("utility_name_template")),
+        utility_unique_id_template=pool.share(config.get("utility_unique_id_template")),
+        update_options=pool.share(build_update_options(config)),
+        attribute_filter=attribute_filter,
+        transform=build_transform_steps(config),
+        window=pool.share(build_window_options(config)),
+        recording=config.get(CONF_RECORDING),
+        flap=pool.share(build_flap_options(config)),
+    )
+
+
+def source_pattern(config: Mapping[str, Any]) -> str | None:
+    """Return the entity-id glob of a wildcard multi-entity block, if any."""
+    sensors = config.get("sensors")
+    if not isinstance(sensors, str):
+        return None
+    if sensors == SENSORS_ALL:
+        return f"{config['source_base']}_*"
+    return sensors
+
+
+def template_values(
+    source_entity_id: str | None,
+    suffix: str | None,
+    device_id: str | None,
+    device_slug: Callable[[str], str] | None = None,
+) -> dict[str, str]:
+    """Return the placeholder values shared by a proxy's name templates.
+
+    ``{suffix}`` falls back to the source's object id outside multi-entity
+    blocks (empty for aggregates, which have no single source), and ``{device}`` is the slug of the device's name when
+    ``device_slug`` can resolve it, else the device id.
+    """
+    source_object_id = (
+        "" if source_entity_id is None else source_entity_id.split(".", 1)[-1]
+    )
+    device = ""
+    if device_id:
+        device = device_slug(device_id) if device_slug is not None else device_id
+    return {
+        FIELD_SUFFIX: source_object_id if suffix is None else suffix,
+        FIELD_SOURCE_OBJECT_ID: source_object_id,
+        FIELD_DEVICE: device,
+    }
+
+
+def _sensor_item_definition(
+    config: Mapping[str, Any],
+    sensor_config: Mapping[str, Any],
+    block_attribute_filter: AttributeFilter | None,
+    pool: ValuePool,
+    device_slug: Callable[[str], str] | None = None,
+) -> ProxyDefinition:
+    source_base = config["source_base"]
+    name_base = config.get("name_base")
+    unique_id_base = config.get("unique_id_base")
+    suffix = sensor_config["suffix"]
+    device_id = config.get("device_id")
+
+    # Use explicit source_entity_id if provided, otherwise build from base + suffix
+    source_entity_id = sensor_config.get("source_entity_id", f"{source_base}_{suffix}")
+    values = template_values(source_entity_id, suffix, device_id, device_slug)
+
+    # Use per-sensor name if provided, otherwise generate from name_base if available
+    if CONF_NAME in sensor_config:
+        name = sensor_config[CONF_NAME]
+    elif name_base:
+        name = compile_base_template(name_base).render(values)
+    else:
+        name = None
+
+    # Use per-sensor unique_id if provided, otherwise generate from unique_id_base
+    if CONF_UNIQUE_ID in sensor_config:
+        unique_id = sensor_config[CONF_UNIQUE_ID]
+    elif unique_id_base:
+        unique_id = compile_base_template(unique_id_base).render(values)
+    else:
+        unique_id = None
+
+    return _definition(
+        sensor_config,
+        name,
+        source_entity_id,
+        unique_id,
+        device_id,
+        build_attribute_filter(sensor_config, block_attribute_filter, pool),
+        pool,
+        suffix,
+    )
+
+
+def build_discovered_definition(
+    config: Mapping[str, Any],
+    entity_id: str,
+    block_attribute_filter: AttributeFilter | None = None,
+    pool: ValuePool | None = None,
+    device_slug: Callable[[str], str] | None = None,
+) -> ProxyDefinition:
+    """Return the definition for ``entity_id`` matched by a wildcard block.
+
+    The suffix is what follows ``source_base_``; sources outside the base (from
+    a free glob) use their whole object id. Pass the block's ``pool`` to share
+    values with its other proxies.
+    """
+    base = f"{config['source_base']}_"
+    if entity_id.startswith(base):
+        suffix = entity_id[len(base) :]
+    else:
+        suffix = entity_id.split(".", 1)[1]
+    return _sensor_item_definition(
+        config,
+        {"suffix": suffix, "source_entity_id": entity_id},
+        block_attribute_filter,
+        pool or ValuePool(),
+        device_slug,
+    )
+
+
+def build_proxy_definitions(
+    config: Mapping[str, Any],
+    match: Callable[[str], Iterable[str]] | None = None,
+    device_slug: Callable[[str], str] | None = None,
+) -> list[ProxyDefinition | AggregateDefinition]:
+    """Expand a validated platform config into one definition per proxy.
+
+    ``match`` resolves the glob of a wildcard block (``sensors: "*"`` or a
+    pattern) to the entity ids that currently exist, and ``device_slug`` the
+    ``{device}`` placeholder of ``name_base`` / ``unique_id_base``.
+    """
+
+    if CONF_AGGREGATE in config:
+        # Aggregate proxy; pattern sources are resolved by the entity itself
+        return [build_aggregate_definition(config)]
+
+    if "source_entity_id" in config:
+        # Single entity configuration (legacy format)
+        return [
+            _definition(
+                config,
+                config.get(CONF_NAME),
+                config["source_entity_id"],
+                config.get(CONF_UNIQUE_ID),
+                config.get("device_id"),
+                build_attribute_filter(config),
+                ValuePool(),
+            )
+        ]
+
+    if "source_base" not in config:
+        return []
+
+    # Multi-entity configuration (new compact format)
+    # Compiled once and shared by every proxy of the block
+    pool = ValuePool()
+    block_attribute_filter = build_attribute_filter(config, pool=pool)
+
+    if (pattern := source_pattern(config)) is not None:
+        if match is None:
+            return []
+        return [
+            build_discovered_definition(
+                config, entity_id, block_attribute_filter, pool, device_slug
+            )
+            for entity_id in match(pattern)
+        ]
+
+    return [
+        _sensor_item_definition(
+            config, sensor_config, block_attribute_filter, pool, device_slug
+        )
+        for sensor_config in config["sensors"]
+    ]
+
+
+def meter_unique_ids(
+    definition: ProxyDefinition | AggregateDefinition,
+    meter_types: Sequence[str],
+    create_default: bool = False,
+) -> list[str]:
+    """Return the utility meter unique ids ``definition`` is known to render.
+
+    ``*`` is rendered by ``meter_unique_id_star``, as in meter creation.
+    Meters with the default ids are only counted when utility meters are enabled for the
+    proxy, by its own option or ``create_default``; ``meter_types`` are used
+    when it has none of its own.
+    """
+    create = definition.create_utility_meters
+    if create is False:
+        return []
+    template = definition.utility_unique_id_template
+    star = meter_unique_id_star(template, definition.unique_id, definition.name)
+    if template is None:
+        if not ((create or create_default) and definition.unique_id):
+            return []
+        template = DEFAULT_METER_TEMPLATE
+    source_entity_id, suffix = None, None
+    if isinstance(definition, ProxyDefinition):
+        source_entity_id, suffix = definition.source_entity_id, definition.suffix
+    values = template_values(source_entity_id, suffix, definition.device_id)
+    values[FIELD_STAR] = star
+    compiled = compile_template(template)
+    ids = []
+    for meter_type in definition.utility_meter_types or meter_types:
+        values[FIELD_CYCLE] = meter_type
+        ids.append(compiled.render(values))
+    return ids
+
+
+def find_id_collisions(
+    definitions: Iterable[ProxyDefinition | AggregateDefinition],
+) -> list[str]:
+    """Return the unique ids that ``definitions`` would generate more than once.
+
+    Only what config validation can see: the proxies' unique ids, and the
+    meter ids each proxy renders for its own ``utility_meter_types`` (e.g. a
+    template without ``{cycle}``). Meter ids of different proxies depend on
+    device names and the global meter types, so the ``IdIndex`` checks them
+    at setup; equal names only make Home Assistant append ``_2``.
+    """
+    definitions = list(definitions)
+    collisions = duplicates(
+        definition.unique_id for definition in definitions if definition.unique_id
+    )
+    for definition in definitions:
+        if definition.utility_meter_types:
+            collisions.extend(
+                duplicates(meter_unique_ids(definition, definition.utility_meter_types))
+            )
+    return collisions
@@ -1,16 +1,51 @@
+from typing import Any
+
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID
+from homeassistant.helpers import config_validation as cv
+
+from .config import build_proxy_definitions
+from .const import CONF_CREATE_UTILITY_METERS, DOMAIN
+from .id_index import async_get_id_index
+from .naming import async_device_slug_resolver
+from .schema import PLATFORM_SCHEMA, base_template
+from .source_index import async_get_source_index
 
-from .const import DOMAIN
+CONF_SOURCE_BASE = "source_base"
+CONF_NAME_BASE = "name_base"
+CONF_UNIQUE_ID_BASE = "unique_id_base"
+CONF_SENSORS = "sensors"
 
 
 class SensorProxyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg]
-    """Handle a config flow for Sensor Proxy."""
+    """Handle a config flow for Sensor Proxy.
+
+    Creates one proxy per entry, or one entry for a whole multi-entity block
+    stored in the YAML ``source_base`` format, whose proxies are all set up by
+    one platform call.
+    """
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._block: dict[str, Any] = {}
+        self._suffixes: list[str] = []
+
     async def async_step_user(self, user_input: dict | None = None):
+        if user_input is not None:
+            # A single proxy, as submitted before the menu was added
+            return await self.async_step_single(user_input)
+
+        return self.async_show_menu(
+            step_id="user",
+            menu_options={
+                "single": "One proxy",
+                "multi": "All sensors sharing a prefix (multi-entity block)",
+            },
+        )
+
+    async def async_step_single(self, user_input: dict | None = None):
         if user_input is not None:
             unique_id = user_input.get(CONF_UNIQUE_ID)
             if unique_id:
@@ -28,4 +63,99 @@ class SensorProxyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type:
             }
         )
 
-        return self.async_show_form(step_id="user", data_schema=data_schema)
+        return self.async_show_form(step_id="single", data_schema=data_schema)
+
+    async def async_step_multi(self, user_input: dict | None = None):
+        """Ask for the block's ``source_base`` and name templates."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            block = {key: value for key, value in user_input.items() if value != ""}
+            for key in (CONF_NAME_BASE, CONF_UNIQUE_ID_BASE):
+                if key in block:
+                    try:
+                        base_template(block[key])
+                    except vol.Invalid:
+                        errors[key] = "invalid_template"
+            if not block.get(CONF_UNIQUE_ID_BASE):
+                # Without unique ids the proxies get no registry entries or device
+                errors[CONF_UNIQUE_ID_BASE] = "unique_id_base_required"
+            if not errors:
+                await self.async_set_unique_id(block[CONF_UNIQUE_ID_BASE])
+                self._abort_if_unique_id_configured()
+                prefix = f"{block[CONF_SOURCE_BASE]}_"
+                # Sensors of this integration (proxies and meters) are never listed
+                self._suffixes = sorted(
+                    entity_id[len(prefix) :]
+                    for entity_id in async_get_source_index(self.hass).async_match(
+                        f"{prefix}*"
+                    )
+                )
+                if not self._suffixes:
+                    errors[CONF_SOURCE_BASE] = "no_sources"
+                else:
+                    self._block = block
+                    return await self.async_step_sensors()
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_SOURCE_BASE, default="sensor."): str,
+                vol.Optional(CONF_NAME_BASE): str,
+                vol.Required(CONF_UNIQUE_ID_BASE): str,
+                vol.Optional("device_id"): str,
+                vol.Optional(CONF_CREATE_UTILITY_METERS, default=False): bool,
+            }
+        )
+        return self.async_show_form(
+            step_id="multi", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_sensors(self, user_input: dict | None = None):
+        """Pick the discovered suffixes that get a proxy."""
+        errors: dict[str, str] = {}
+        block = self._block
+        if user_input is not None:
+            selected = set(user_input[CONF_SENSORS])
+            if not selected:
+                errors[CONF_SENSORS] = "no_sensors"
+            else:
+                entry_data = self._entry_data(
+                    [suffix for suffix in self._suffixes if suffix in selected]
+                )
+                try:
+                    config = PLATFORM_SCHEMA(dict(entry_data))
+                except vol.Invalid:
+                    errors["base"] = "invalid_config"
+                else:
+                    # Checked against YAML, service-created and other entries' ids
+                    definitions = build_proxy_definitions(
+                        config, device_slug=async_device_slug_resolver(self.hass)
+                    )
+                    if async_get_id_index(self.hass).async_find_collisions(definitions):
+                        errors["base"] = "ids_in_use"
+                if not errors:
+                    return self.async_create_entry(
+                        title=block.get(CONF_NAME_BASE) or block[CONF_SOURCE_BASE],
+                        data=entry_data,
+                    )
+
+        prefix = f"{block[CONF_SOURCE_BASE]}_"
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_SENSORS, default=self._suffixes): cv.multi_select(
+                    {suffix: f"{prefix}{suffix}" for suffix in self._suffixes}
+                ),
+            }
+        )
+        return self.async_show_form(
+            step_id="sensors", data_schema=data_schema, errors=errors
+        )
+
+    def _entry_data(self, suffixes: list[str]) -> dict[str, Any]:
+        """Return the block in the YAML multi-entity format."""
+        data = dict(self._block)
+        item: dict[str, Any] = {}
+        if data.pop(CONF_CREATE_UTILITY_METERS, False):
+            # Meter options are per sensor item in the YAML format
+            item[CONF_CREATE_UTILITY_METERS] = True
+        data[CONF_SENSORS] = [{"suffix": suffix, **item} for suffix in suffixes]
+        return data
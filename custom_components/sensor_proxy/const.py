@@ -3,7 +3,77 @@ DOMAIN = "sensor_proxy"
 # Configuration keys
 CONF_CREATE_UTILITY_METERS = "create_utility_meters"
 CONF_UTILITY_METER_TYPES = "utility_meter_types"
+CONF_BACKFILL_UTILITY_METERS = "backfill_utility_meters"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_DEBOUNCE = "debounce"
+CONF_DEADBAND = "deadband"
+CONF_ATTRIBUTES_INCLUDE = "attributes_include"
+CONF_ATTRIBUTES_EXCLUDE = "attributes_exclude"
+CONF_DIAGNOSTICS = "diagnostics"
+CONF_MANAGED = "managed"
+CONF_PROXIES = "proxies"
+CONF_AGGREGATE = "aggregate"
+CONF_SOURCES = "sources"
+CONF_RECORDING = "recording"
+CONF_TRANSFORM = "transform"
+CONF_WINDOW = "window"
+CONF_WINDOW_FUNCTION = "function"
+CONF_WINDOW_DURATION = "duration"
+CONF_WINDOW_MAX_SAMPLES = "max_samples"
+CONF_HOLD_DOWN = "hold_down"
+CONF_MAX_HOLD_DOWN = "max_hold_down"
+
+# `sensors: "*"` proxies every entity starting with `source_base_`
+SENSORS_ALL = "*"
+
+# Recorder policies: state and attributes, or the state without source attributes
+RECORDING_ALL = "all"
+RECORDING_STATE = "state"
+RECORDING_POLICIES = (RECORDING_ALL, RECORDING_STATE)
 
 # Defaults
 DEFAULT_CREATE_UTILITY_METERS = False
 DEFAULT_UTILITY_METER_TYPES = ["daily", "weekly", "monthly", "yearly"]
+DEFAULT_BACKFILL_UTILITY_METERS = False
+DEFAULT_WINDOW_MAX_SAMPLES = 100
+DEFAULT_RECORDING = RECORDING_ALL
+
+# Upper bound of a window's ring buffer (16 bytes per slot)
+MAX_WINDOW_SAMPLES = 10_000
+
+# Services
+SERVICE_RELOAD = "reload"
+SERVICE_CREATE_PROXIES = "create_proxies"
+SERVICE_REMOVE_PROXIES = "remove_proxies"
+SERVICE_DUMP_DIAGNOSTICS = "dump_diagnostics"
+
+# Set on proxies that show a restored snapshot instead of live source data
+ATTR_RESTORED = "restored"
+
+# Restored snapshots are dropped if the source reports no state within this many seconds
+RESTORE_GRACE_PERIOD = 300
+
+# Values held back by a deadband are still written after this many seconds
+DEADBAND_MAX_AGE = 300
+
+# Flap damping: the penalty halves after this many seconds, and without
+# `max_hold_down` the hold-down grows to at most this multiple of `hold_down`
+FLAP_HALF_LIFE = 900
+DEFAULT_MAX_HOLD_DOWN_FACTOR = 16
+
+# Keys used in hass.data[DOMAIN]
+DATA_DISPATCHER = "dispatcher"
+DATA_WRITE_STATS = "write_stats"
+DATA_TIMER_WHEEL = "timer_wheel"
+DATA_RESET_SCHEDULER = "reset_scheduler"
+DATA_METER_QUEUE = "meter_queue"
+DATA_STATE_STORE = "state_store"
+DATA_YAML_PROXIES = "yaml_proxies"
+DATA_SOURCE_INDEX = "source_index"
+DATA_PATTERN_WATCHES = "pattern_watches"
+DATA_STATS = "stats"
+DATA_PROXY_CHAINS = "proxy_chains"
+DATA_WORK_QUEUE = "work_queue"
+DATA_REGISTRY_BATCH = "registry_batch"
+DATA_MANAGED_PROXIES = "managed_proxies"
+DATA_ID_INDEX = "id_index"
@@ -0,0 +1,48 @@
+"""Diagnostics download for the Sensor Proxy integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .chains import async_get_proxy_chains
+from .dispatcher import async_get_dispatcher
+from .id_index import async_get_id_index
+from .meter_queue import async_get_meter_queue
+from .reset_scheduler import async_get_reset_scheduler
+from .stats import async_get_stats
+from .work_queue import async_get_work_queue
+
+
+@callback
+def async_get_diagnostics(hass: HomeAssistant) -> dict[str, Any]:
+    """Return integration-wide performance data (covers YAML proxies too)."""
+    dispatcher = async_get_dispatcher(hass)
+    reset_scheduler = async_get_reset_scheduler(hass)
+    return {
+        "stats": async_get_stats(hass).as_dict(),
+        "dispatcher": {
+            "sources": dispatcher.source_count,
+            "listeners": dispatcher.listener_count,
+        },
+        "reset_scheduler": {
+            "timers": reset_scheduler.timer_count,
+            "last_batch": reset_scheduler.last_batch,
+        },
+        "proxy_chains": async_get_proxy_chains(hass).as_dict(),
+        "meter_queue": {
+            "pending": len(async_get_meter_queue(hass)),
+            "last_flush": async_get_meter_queue(hass).last_flush,
+        },
+        "work_queue": async_get_work_queue(hass).as_dict(),
+        "id_index": async_get_id_index(hass).as_dict(),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the integration-wide data with the entry's configuration."""
+    return {"entry": dict(entry.data), **async_get_diagnostics(hass)}
@@ -0,0 +1,117 @@
+"""Shared state-change dispatcher for the Sensor Proxy integration."""
+
+from __future__ import annotations
+
+import logging
+from functools import partial
+from typing import Callable
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+
+from .const import DATA_DISPATCHER, DOMAIN
+
+__all__ = ["SourceDispatcher", "SourceListener", "async_get_dispatcher"]
+
+_LOGGER = logging.getLogger(__name__)
+
+SourceListener = Callable[[Event[EventStateChangedData]], None]
+
+
+class SourceDispatcher:
+    """Route source state changes to every proxy that mirrors the source.
+
+    All proxies share a single ``state_changed`` bus listener. Its event filter is
+    a dict lookup on the ``source_entity_id -> listeners`` index, so events of
+    unrelated entities are dropped before any job is scheduled (the same approach
+    Home Assistant uses internally for ``async_track_state_change_event``).
+    Listeners are kept in insertion-ordered dicts, which makes registering and
+    unregistering a proxy O(1) and lets any number of proxies share one source.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._index: dict[str, dict[SourceListener, None]] = {}
+        self._unsub_bus: CALLBACK_TYPE | None = None
+
+    @property
+    def source_count(self) -> int:
+        """Return the number of distinct source entities being tracked."""
+        return len(self._index)
+
+    @property
+    def listener_count(self) -> int:
+        """Return the total number of registered listeners."""
+        return sum(len(listeners) for listeners in self._index.values())
+
+    @callback
+    def async_register(
+        self, source_entity_id: str, listener: SourceListener
+    ) -> CALLBACK_TYPE:
+        """Register a listener for a source entity; return a callable to undo it."""
+        listeners = self._index.get(source_entity_id)
+        if listeners is None:
+            listeners = self._index[source_entity_id] = {}
+        listeners[listener] = None
+
+        if self._unsub_bus is None:
+            self._unsub_bus = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_dispatch,
+                event_filter=self._async_filter,
+            )
+
+        return partial(self._async_unregister, source_entity_id, listener)
+
+    @callback
+    def _async_unregister(
+        self, source_entity_id: str, listener: SourceListener
+    ) -> None:
+        listeners = self._index.get(source_entity_id)
+        if listeners is None:
+            return
+        listeners.pop(listener, None)
+        if listeners:
+            return
+
+        del self._index[source_entity_id]
+        # Drop the bus listener once the last proxy is gone
+        if not self._index and self._unsub_bus is not None:
+            self._unsub_bus()
+            self._unsub_bus = None
+
+    @callback
+    def _async_filter(self, event_data: EventStateChangedData) -> bool:
+        return event_data["entity_id"] in self._index
+
+    @callback
+    def _async_dispatch(self, event: Event[EventStateChangedData]) -> None:
+        entity_id = event.data["entity_id"]
+        listeners = self._index.get(entity_id)
+        if not listeners:
+            return
+
+        # Copy so listeners may unregister themselves while being dispatched
+        for listener in list(listeners):
+            try:
+                listener(event)
+            except Exception:
+                _LOGGER.exception(
+                    "Error dispatching state change of %s to %s", entity_id, listener
+                )
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> SourceDispatcher:
+    """Return the integration-wide dispatcher, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    dispatcher = domain_data.get(DATA_DISPATCHER)
+    if dispatcher is None:
+        dispatcher = domain_data[DATA_DISPATCHER] = SourceDispatcher(hass)
+    return dispatcher
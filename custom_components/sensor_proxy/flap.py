@@ -0,0 +1,101 @@
+"""Hold-down and flap damping of source availability for proxy sensors."""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from homeassistant.core import callback
+
+from .config import FlapOptions
+from .const import FLAP_HALF_LIFE
+from .timer_wheel import TimerWheel
+
+__all__ = ["FlapDamper"]
+
+
+class FlapDamper:
+    """Delay reporting a source as unavailable, longer for flapping sources.
+
+    When the source of an available proxy becomes unavailable or unknown, the
+    proxy keeps its last good value for the hold-down time; if the source
+    comes back first, nothing was written for the outage. Each outage adds 1
+    to a penalty that halves every ``FLAP_HALF_LIFE`` seconds, and the
+    hold-down doubles with every point above 1, up to ``max_hold_down``:
+    a source that drops out once in a while is held for ``hold_down``, one
+    that flaps repeatedly for up to ``max_hold_down``.
+
+    The hold-down deadline runs on the shared ``TimerWheel``; the damper
+    itself is its key, so a proxy never holds more than one pending deadline.
+    """
+
+    __slots__ = (
+        "_wheel",
+        "_expire",
+        "_hold_down",
+        "_max_hold_down",
+        "_penalty",
+        "_penalty_at",
+        "_holding",
+        "last_hold_down",
+    )
+
+    def __init__(
+        self,
+        wheel: TimerWheel,
+        options: FlapOptions,
+        expire: Callable[[], None],
+    ) -> None:
+        self._wheel = wheel
+        self._expire = expire
+        self._hold_down = options.hold_down
+        self._max_hold_down = options.max_hold_down
+        self._penalty = 0.0
+        self._penalty_at = 0.0
+        self._holding = False
+        self.last_hold_down: float | None = None
+
+    @property
+    def holding(self) -> bool:
+        """Return True while the last good value is held for an outage."""
+        return self._holding
+
+    @property
+    def penalty(self) -> float:
+        """Return the current (decayed) flap penalty."""
+        return self._decayed(self._wheel.time())
+
+    def _decayed(self, now: float) -> float:
+        return self._penalty * 0.5 ** ((now - self._penalty_at) / FLAP_HALF_LIFE)
+
+    @callback
+    def async_hold(self) -> float:
+        """Start holding for a new outage; return the hold-down in seconds."""
+        now = self._wheel.time()
+        self._penalty = self._decayed(now) + 1
+        self._penalty_at = now
+        hold_down = min(
+            self._hold_down * 2 ** max(self._penalty - 1, 0), self._max_hold_down
+        )
+        self.last_hold_down = hold_down
+        self._holding = True
+        self._wheel.async_schedule_at(self, now + hold_down, self._async_fire)
+        return hold_down
+
+    @callback
+    def async_release(self) -> bool:
+        """End an outage: the source is back; return True if it was held."""
+        if not self._holding:
+            return False
+        self.async_cancel()
+        return True
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the pending hold-down deadline (e.g. when the proxy is removed)."""
+        self._holding = False
+        self._wheel.async_cancel(self)
+
+    @callback
+    def _async_fire(self) -> None:
+        self._holding = False
+        self._expire()
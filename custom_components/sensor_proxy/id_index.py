@@ -0,0 +1,204 @@
+"""Session-wide index of the ids claimed by proxies and utility meters."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Iterable, Sequence
+
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .config import AggregateDefinition, ProxyDefinition, meter_unique_ids
+from .const import (
+    CONF_CREATE_UTILITY_METERS,
+    CONF_UTILITY_METER_TYPES,
+    DATA_ID_INDEX,
+    DEFAULT_UTILITY_METER_TYPES,
+    DOMAIN,
+)
+
+__all__ = ["IdIndex", "async_get_id_index"]
+
+_LOGGER = logging.getLogger(__name__)
+
+Definition = ProxyDefinition | AggregateDefinition
+
+
+class IdIndex:
+    """Every proxy and utility meter id in use, with its owner.
+
+    Each setup path (YAML blocks, reloads, service calls and config entries)
+    claims the ids of its expanded definitions in one pass: the definition's
+    key (its unique id where set) and the meter unique ids its templates
+    render. A definition whose key was claimed before, from any block or
+    path, is rejected; one whose meter ids were is kept without those meters.
+    All collisions of a pass are logged together. Claims are dropped when
+    their proxies are removed.
+
+    Meter entity ids are picked here too: the id registered for the meter's
+    unique id if any, else ``sensor.<object id>``, with ``_2``, ``_3``... when
+    taken by the registry, the state machine or a meter picked earlier, as
+    the registry itself would. Every check is a dict or set lookup, using the
+    entity registry's own indices instead of a scan.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entity_registry = er.async_get(hass)
+        # Claimed id -> key of the definition owning it
+        self._owners: dict[str, str] = {}
+        # Definition key -> the ids it claimed
+        self._claims: dict[str, list[str]] = {}
+        # Meter entity ids picked but possibly not registered yet
+        self._reserved: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._owners
+
+    def _definition_ids(self, definition: Definition) -> list[str]:
+        domain_data = self._hass.data.get(DOMAIN, {})
+        ids = meter_unique_ids(
+            definition,
+            domain_data.get(CONF_UTILITY_METER_TYPES, DEFAULT_UTILITY_METER_TYPES),
+            domain_data.get(CONF_CREATE_UTILITY_METERS, False),
+        )
+        ids.insert(0, definition.key)
+        return ids
+
+    @callback
+    def async_find_collisions(
+        self, definitions: Iterable[Definition]
+    ) -> dict[str, list[str]]:
+        """Return definition key -> its ids claimed before or earlier in ``definitions``."""
+        collisions: dict[str, list[str]] = {}
+        seen: set[str] = set()
+        for definition in definitions:
+            ids = self._definition_ids(definition)
+            if taken := [
+                value for value in ids if value in self._owners or value in seen
+            ]:
+                collisions[definition.key] = taken
+            seen.update(ids)
+        return collisions
+
+    @callback
+    def async_claim(
+        self, definitions: Sequence[Definition], origin: str
+    ) -> list[Definition]:
+        """Claim the ids of ``definitions`` in one pass; return those accepted.
+
+        Definitions whose key was claimed before, or by an earlier definition
+        of the same pass, are left out; meter ids claimed before are skipped
+        (``async_claim_meter`` then refuses them). Logged once per pass.
+        """
+        accepted: list[Definition] = []
+        rejected: list[str] = []
+        skipped: list[str] = []
+        for definition in definitions:
+            key = definition.key
+            if key in self._owners:
+                rejected.append(f"{key} (used by {self._owners[key]})")
+                continue
+            claims = self._claims.setdefault(key, [])
+            for value in self._definition_ids(definition):
+                if (owner := self._owners.setdefault(value, key)) != key:
+                    skipped.append(f"{value} of {key} (used by {owner})")
+                else:
+                    claims.append(value)
+            accepted.append(definition)
+        if rejected:
+            _LOGGER.error(
+                "Ignoring %d sensor_proxy definition(s) from %s whose unique "
+                "ids are already in use: %s",
+                len(rejected),
+                origin,
+                ", ".join(rejected),
+            )
+        if skipped:
+            _LOGGER.error(
+                "Skipping %d utility meter(s) of sensor_proxy definitions from "
+                "%s whose unique ids are already in use: %s",
+                len(skipped),
+                origin,
+                ", ".join(skipped),
+            )
+        return accepted
+
+    @callback
+    def async_owner(self, value: str) -> str | None:
+        """Return the key of the definition that claimed ``value``, if any."""
+        return self._owners.get(value)
+
+    @callback
+    def async_claim_meter(self, key: str, unique_id: str) -> bool:
+        """Claim a meter unique id rendered at runtime for the proxy ``key``.
+
+        Return False if another definition owns it.
+        """
+        owner = self._owners.setdefault(unique_id, key)
+        if owner != key:
+            return False
+        claims = self._claims.setdefault(key, [])
+        if unique_id not in claims:
+            claims.append(unique_id)
+        return True
+
+    @callback
+    def async_release(self, keys: Iterable[str]) -> None:
+        """Drop the claims of the definitions ``keys``, e.g. once removed."""
+        for key in keys:
+            for value in self._claims.pop(key, ()):
+                if self._owners.get(value) == key:
+                    del self._owners[value]
+
+    @callback
+    def async_registered_entity_id(self, unique_id: str) -> str | None:
+        """Return the entity id registered for one of our sensors' ``unique_id``."""
+        return self._entity_registry.async_get_entity_id(
+            SENSOR_DOMAIN, DOMAIN, unique_id
+        )
+
+    @callback
+    def async_meter_entity_id(self, unique_id: str | None, object_id: str) -> str:
+        """Return the entity id a new meter gets, and reserve it."""
+        if unique_id and (entity_id := self.async_registered_entity_id(unique_id)):
+            self._reserved.add(entity_id)
+            return entity_id
+        preferred = f"{SENSOR_DOMAIN}.{object_id}"
+        entity_id = preferred
+        tries = 1
+        while (
+            entity_id in self._reserved
+            or self._entity_registry.async_is_registered(entity_id)
+            or self._hass.states.get(entity_id) is not None
+        ):
+            tries += 1
+            entity_id = f"{preferred}_{tries}"
+        self._reserved.add(entity_id)
+        return entity_id
+
+    @callback
+    def async_release_entity_ids(self, entity_ids: Iterable[str]) -> None:
+        """Forget the reservations of removed meters."""
+        self._reserved.difference_update(entity_ids)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the index size."""
+        return {
+            "definitions": len(self._claims),
+            "ids": len(self._owners),
+            "reserved_entity_ids": len(self._reserved),
+        }
+
+
+@callback
+def async_get_id_index(hass: HomeAssistant) -> IdIndex:
+    """Return the integration-wide id index, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (index := domain_data.get(DATA_ID_INDEX)) is None:
+        index = domain_data[DATA_ID_INDEX] = IdIndex(hass)
+    return index
@@ -0,0 +1,289 @@
+"""Proxies created and removed in bulk through services."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Iterable, Mapping
+
+import voluptuous as vol
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import EntityPlatform
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+
+from .config import build_proxy_definitions, source_pattern
+from .const import CONF_MANAGED, DATA_MANAGED_PROXIES, DOMAIN
+from .id_index import async_get_id_index
+from .naming import async_device_slug_resolver
+from .proxy_sensor import SensorProxySensor
+from .registry_batch import async_get_registry_batch
+from .reload import create_proxy_entity
+from .schema import PLATFORM_SCHEMA
+
+__all__ = ["ManagedProxies", "async_get_managed_proxies"]
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.proxies"
+# Definitions changed by several service calls in a row are written once (seconds)
+SAVE_DELAY = 10
+# How long service calls wait for the sensor platform of created proxies (seconds)
+PLATFORM_TIMEOUT = 60
+
+STATUS_CREATED = "created"
+STATUS_REMOVED = "removed"
+STATUS_INVALID = "invalid"
+STATUS_EXISTS = "exists"
+STATUS_NOT_FOUND = "not_found"
+
+
+def _validate(item: Mapping[str, Any]) -> dict[str, Any]:
+    """Validate one service item like a YAML block; wildcard blocks stay YAML-only."""
+    config = PLATFORM_SCHEMA(dict(item))
+    if source_pattern(config) is not None:
+        raise vol.Invalid("wildcard 'sensors' blocks are only supported in YAML")
+    return config
+
+
+class ManagedProxies:
+    """Proxies added by ``sensor_proxy.create_proxies`` and persisted in storage.
+
+    Service items use the YAML formats and are validated with the same schemas.
+    All proxies of one call are added with a single ``async_add_entities``
+    call, and their device associations are applied in one registry pass
+    (see ``RegistryBatch``). Removal drops the registry entries of all proxies
+    and their utility meters in one pass and removes the entities together.
+    The stored items are set up again on the next start.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._config: ConfigType = {}
+        self._platform: EntityPlatform | None = None
+        self._platform_loaded = asyncio.Event()
+        self._platform_loading = False
+        # Stored service items with the definition keys still created from them
+        self._items: list[dict[str, Any]] = []
+        self._proxies: dict[str, SensorProxySensor] = {}
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    async def async_load(self, config: ConfigType) -> None:
+        """Load the stored items; their platform is only set up if there are any."""
+        self._config = config
+        data = await self._store.async_load()
+        if isinstance(data, dict) and data.get("items"):
+            self._items = data["items"]
+            self._async_load_platform()
+
+    @callback
+    def _async_load_platform(self) -> None:
+        if self._platform_loading:
+            return
+        self._platform_loading = True
+        self._hass.async_create_task(
+            async_load_platform(
+                self._hass,
+                Platform.SENSOR,
+                DOMAIN,
+                {CONF_MANAGED: True},
+                self._config,
+            )
+        )
+
+    async def _async_get_platform(self) -> EntityPlatform:
+        self._async_load_platform()
+        try:
+            async with asyncio.timeout(PLATFORM_TIMEOUT):
+                await self._platform_loaded.wait()
+        except TimeoutError:
+            # Set up again on the next call, e.g. after a failed platform setup
+            self._platform_loading = False
+            raise HomeAssistantError(
+                "The sensor_proxy sensor platform could not be set up; "
+                "see the log for errors"
+            ) from None
+        assert self._platform is not None
+        return self._platform
+
+    async def async_setup_platform(self, platform: EntityPlatform) -> None:
+        """Create the stored proxies on ``platform``, which later calls also use."""
+        self._platform = platform
+        self._platform_loaded.set()
+        device_slug = async_device_slug_resolver(self._hass)
+        id_index = async_get_id_index(self._hass)
+        items, self._items = self._items, []
+        proxies: list[SensorProxySensor] = []
+        for item in items:
+            keys = set(item["keys"])
+            try:
+                config = _validate(item["config"])
+            except vol.Invalid as err:
+                _LOGGER.error("Skipping stored sensor_proxy definition: %s", err)
+                continue
+            definitions = [
+                definition
+                for definition in build_proxy_definitions(
+                    config, device_slug=device_slug
+                )
+                if definition.key in keys
+            ]
+            for definition in id_index.async_claim(definitions, "stored services"):
+                proxy = create_proxy_entity(self._hass, definition)
+                self._proxies[definition.key] = proxy
+                proxies.append(proxy)
+            self._items.append(item)
+        if proxies:
+            await platform.async_add_entities(proxies)
+        _LOGGER.debug("Set up %d proxies created by service", len(proxies))
+
+    async def async_create(self, items: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+        """Validate and add the proxies of ``items``; report the outcome per item."""
+        start = time.perf_counter()
+        platform = await self._async_get_platform()
+        id_index = async_get_id_index(self._hass)
+        device_slug = async_device_slug_resolver(self._hass)
+        results: list[dict[str, Any]] = []
+        created: list[tuple[dict[str, Any], list[SensorProxySensor]]] = []
+        for index, item in enumerate(items):
+            try:
+                config = _validate(item)
+            except vol.Invalid as err:
+                results.append(
+                    {"index": index, "status": STATUS_INVALID, "error": str(err)}
+                )
+                continue
+            definitions = build_proxy_definitions(config, device_slug=device_slug)
+            keys = [definition.key for definition in definitions]
+            # Checked against every proxy and meter id in use, and each other
+            if collisions := id_index.async_find_collisions(definitions):
+                results.append(
+                    {
+                        "index": index,
+                        "status": STATUS_EXISTS,
+                        "keys": list(collisions),
+                        "ids": sorted(
+                            {value for ids in collisions.values() for value in ids}
+                        ),
+                    }
+                )
+                continue
+            id_index.async_claim(definitions, "create_proxies")
+            proxies = []
+            for definition in definitions:
+                proxy = create_proxy_entity(self._hass, definition)
+                self._proxies[definition.key] = proxy
+                proxies.append(proxy)
+            self._items.append({"config": dict(item), "keys": keys})
+            result = {"index": index, "status": STATUS_CREATED, "keys": keys}
+            results.append(result)
+            created.append((result, proxies))
+
+        all_proxies = [proxy for _, proxies in created for proxy in proxies]
+        if all_proxies:
+            await platform.async_add_entities(all_proxies)
+            self._async_schedule_save()
+        for result, proxies in created:
+            result["entity_ids"] = [proxy.entity_id for proxy in proxies]
+        return {
+            "results": results,
+            "created": len(all_proxies),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    async def async_remove(
+        self, items: Iterable[str | Mapping[str, Any]]
+    ) -> dict[str, Any]:
+        """Remove the proxies of ``items`` (definitions or unique IDs) and their meters."""
+        start = time.perf_counter()
+        results: list[dict[str, Any]] = []
+        removed: dict[str, SensorProxySensor] = {}
+        device_slug = async_device_slug_resolver(self._hass)
+        for index, item in enumerate(items):
+            if isinstance(item, str):
+                keys = [item]
+            else:
+                try:
+                    config = _validate(item)
+                except vol.Invalid as err:
+                    results.append(
+                        {"index": index, "status": STATUS_INVALID, "error": str(err)}
+                    )
+                    continue
+                keys = [
+                    definition.key
+                    for definition in build_proxy_definitions(
+                        config, device_slug=device_slug
+                    )
+                ]
+            found = [key for key in keys if key in self._proxies]
+            if not found:
+                results.append(
+                    {"index": index, "status": STATUS_NOT_FOUND, "keys": keys}
+                )
+                continue
+            entity_ids = []
+            for key in found:
+                proxy = removed[key] = self._proxies.pop(key)
+                entity_ids.append(proxy.entity_id)
+            results.append(
+                {
+                    "index": index,
+                    "status": STATUS_REMOVED,
+                    "keys": found,
+                    "entity_ids": entity_ids,
+                }
+            )
+
+        if removed:
+            async_get_id_index(self._hass).async_release(removed)
+            await self._async_remove_entities(removed.values())
+            for item in self._items:
+                item["keys"] = [key for key in item["keys"] if key not in removed]
+            self._items = [item for item in self._items if item["keys"]]
+            self._async_schedule_save()
+        return {
+            "results": results,
+            "removed": len(removed),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    async def _async_remove_entities(
+        self, proxies: Iterable[SensorProxySensor]
+    ) -> None:
+        proxies = [proxy for proxy in proxies if proxy.hass is not None]
+        entities: list[Entity] = list(proxies)
+        entity_ids = [proxy.entity_id for proxy in proxies]
+        for proxy in proxies:
+            platform = proxy.platform
+            for entity_id in proxy.async_release_utility_meters():
+                entity_ids.append(entity_id)
+                if (meter := platform.entities.get(entity_id)) is not None:
+                    entities.append(meter)
+        # One registry pass, then all entities are removed together
+        async_get_registry_batch(self._hass).async_remove(entity_ids)
+        await asyncio.gather(
+            *(entity.async_remove(force_remove=True) for entity in entities)
+        )
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(lambda: {"items": self._items}, SAVE_DELAY)
+
+
+@callback
+def async_get_managed_proxies(hass: HomeAssistant) -> ManagedProxies:
+    """Return the integration-wide service-managed proxies, creating them on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (managed := domain_data.get(DATA_MANAGED_PROXIES)) is None:
+        managed = domain_data[DATA_MANAGED_PROXIES] = ManagedProxies(hass)
+    return managed
@@ -0,0 +1,152 @@
+"""Batched utility meter creation for the Sensor Proxy integration."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Iterable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import EntityPlatform
+from homeassistant.helpers.start import async_at_started
+
+from .backfill import async_backfill_meters
+from .const import DATA_METER_QUEUE, DOMAIN
+from .timer_wheel import async_get_timer_wheel
+from .work_queue import async_get_work_queue
+
+if TYPE_CHECKING:
+    from .proxy_sensor import SensorProxySensor
+    from .virtual_meter import VirtualUtilityMeter
+
+__all__ = ["MeterCreationQueue", "async_get_meter_queue"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Proxies becoming available shortly after each other are created together
+FLUSH_DELAY = 0.5
+# Upper bound of meters handed to a single async_add_entities call
+METER_BATCH_SIZE = 250
+
+
+class MeterCreationQueue:
+    """Collect proxies that need utility meters and create them in batches.
+
+    Nothing is created before Home Assistant has started. Each flush adds the
+    meters of all queued proxies to their platform in a few large
+    ``async_add_entities`` calls instead of one small call per proxy; which
+    meters already exist is looked up in the ``IdIndex``.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._pending: dict[SensorProxySensor, None] = {}
+        self._waiting_for_start = False
+        self._flushing = False
+        self.last_flush: dict[str, Any] | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @callback
+    def async_enqueue(self, proxy: SensorProxySensor) -> None:
+        """Queue ``proxy`` for utility meter creation."""
+        self._pending[proxy] = None
+        self._async_schedule_flush()
+
+    @callback
+    def async_discard(self, proxy: SensorProxySensor) -> None:
+        """Forget ``proxy`` (e.g. when it is removed before its meters exist)."""
+        self._pending.pop(proxy, None)
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        if self._waiting_for_start or self._flushing:
+            return
+        if not self._hass.is_running:
+            self._waiting_for_start = True
+            async_at_started(self._hass, self._async_started)
+            return
+        async_get_timer_wheel(self._hass).async_schedule_later(
+            self, FLUSH_DELAY, self._async_start_flush
+        )
+
+    @callback
+    def _async_started(self, _hass: HomeAssistant) -> None:
+        self._waiting_for_start = False
+        self._async_start_flush()
+
+    @callback
+    def _async_start_flush(self) -> None:
+        if self._pending and not self._flushing:
+            self._flushing = True
+            async_get_work_queue(self._hass).async_submit(self, self._async_flush)
+
+    async def _async_flush(self) -> None:
+        try:
+            pending = list(self._pending)
+            self._pending.clear()
+            await self.async_create_meters(pending)
+        finally:
+            self._flushing = False
+        if self._pending:
+            self._async_schedule_flush()
+
+    async def async_create_meters(self, proxies: Iterable[SensorProxySensor]) -> None:
+        """Create the utility meters of ``proxies`` in as few platform calls as possible."""
+        start = time.perf_counter()
+        work_queue = async_get_work_queue(self._hass)
+
+        by_platform: dict[EntityPlatform, list[VirtualUtilityMeter]] = {}
+        created: list[SensorProxySensor] = []
+        for proxy in proxies:
+            platform = proxy.platform
+            if platform is None or proxy.hass is None:
+                continue
+            meters = proxy.async_build_utility_meters()
+            if meters:
+                by_platform.setdefault(platform, []).extend(meters)
+                created.append(proxy)
+            await work_queue.async_checkpoint()
+
+        batches = 0
+        meter_count = 0
+        for platform, meters in by_platform.items():
+            meter_count += len(meters)
+            for index in range(0, len(meters), METER_BATCH_SIZE):
+                await platform.async_add_entities(
+                    meters[index : index + METER_BATCH_SIZE]
+                )
+                batches += 1
+
+        for proxy in created:
+            proxy.async_utility_meters_added()
+        # Opt-in; reads recorder statistics in its executor, batch by batch
+        backfill = await async_backfill_meters(self._hass, created)
+
+        duration = time.perf_counter() - start
+        self.last_flush = {
+            "proxies": len(created),
+            "meters": meter_count,
+            "batches": batches,
+            "duration_ms": round(duration * 1000, 3),
+            "backfill": backfill,
+        }
+        if meter_count:
+            _LOGGER.debug(
+                "Created %d utility meter(s) for %d proxies in %d batch(es) in %.1f ms",
+                meter_count,
+                len(created),
+                batches,
+                duration * 1000,
+            )
+
+
+@callback
+def async_get_meter_queue(hass: HomeAssistant) -> MeterCreationQueue:
+    """Return the integration-wide meter creation queue, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    queue = domain_data.get(DATA_METER_QUEUE)
+    if queue is None:
+        queue = domain_data[DATA_METER_QUEUE] = MeterCreationQueue(hass)
+    return queue
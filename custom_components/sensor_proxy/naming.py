@@ -0,0 +1,154 @@
+"""Name and unique ID templates of proxies and utility meters."""
+
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, Mapping
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import slugify
+
+__all__ = [
+    "DEFAULT_METER_TEMPLATE",
+    "FIELD_CYCLE",
+    "FIELD_DEVICE",
+    "FIELD_SOURCE_OBJECT_ID",
+    "FIELD_STAR",
+    "FIELD_SUFFIX",
+    "METER_FIELDS",
+    "PROXY_FIELDS",
+    "NameTemplate",
+    "async_device_slug_resolver",
+    "compile_base_template",
+    "compile_template",
+    "duplicates",
+    "meter_unique_id_star",
+]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Placeholders; `*` is the proxy's object id in utility meter templates
+FIELD_STAR = "*"
+FIELD_CYCLE = "cycle"
+FIELD_SUFFIX = "suffix"
+FIELD_SOURCE_OBJECT_ID = "source_object_id"
+FIELD_DEVICE = "device"
+
+# Placeholders of `name_base` / `unique_id_base`
+PROXY_FIELDS = frozenset((FIELD_SUFFIX, FIELD_SOURCE_OBJECT_ID, FIELD_DEVICE))
+# Placeholders of `utility_name_template` / `utility_unique_id_template`
+METER_FIELDS = PROXY_FIELDS | {FIELD_STAR, FIELD_CYCLE}
+
+# Meter names and unique ids without a template: `<object id>_<cycle>`
+DEFAULT_METER_TEMPLATE = f"{FIELD_STAR}_{{{FIELD_CYCLE}}}"
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}|\*")
+
+
+class NameTemplate:
+    """A template compiled once into literal and placeholder segments.
+
+    ``render`` builds the result in one pass over the segments, instead of one
+    ``str.replace`` per placeholder and call. Templates are cached by their
+    source text, so every proxy using the same template shares one instance.
+    """
+
+    __slots__ = ("source", "fields", "_segments")
+
+    def __init__(self, source: str, allowed: frozenset[str]) -> None:
+        self.source = source
+        # (text, is_field) pairs in order
+        segments: list[tuple[str, bool]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            field = match.group(1) or FIELD_STAR
+            if field not in allowed:
+                raise ValueError(
+                    f"unknown placeholder {match.group(0)!r} in {source!r} "
+                    f"(supported: {', '.join(sorted(allowed))})"
+                )
+            if match.start() > position:
+                segments.append((source[position : match.start()], False))
+            segments.append((field, True))
+            position = match.end()
+        if position < len(source):
+            segments.append((source[position:], False))
+        self._segments = tuple(segments)
+        self.fields = frozenset(text for text, is_field in segments if is_field)
+
+    def __repr__(self) -> str:
+        return f"NameTemplate({self.source!r})"
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Return the template with every placeholder replaced from ``values``."""
+        return "".join(
+            [values[text] if is_field else text for text, is_field in self._segments]
+        )
+
+
+@lru_cache(maxsize=512)
+def compile_template(
+    source: str, allowed: frozenset[str] = METER_FIELDS
+) -> NameTemplate:
+    """Return the compiled template of ``source``; raise ValueError if invalid."""
+    return NameTemplate(source, allowed)
+
+
+def compile_base_template(base: str) -> NameTemplate:
+    """Return the compiled template of a ``name_base`` or ``unique_id_base``.
+
+    A base without placeholders gets ``_{suffix}`` appended, as before
+    templates were supported.
+    """
+    template = compile_template(base, PROXY_FIELDS)
+    if template.fields:
+        return template
+    return compile_template(f"{base}_{{{FIELD_SUFFIX}}}", PROXY_FIELDS)
+
+
+def duplicates(ids: Iterable[str]) -> list[str]:
+    """Return the ids that occur more than once, in order of first repeat."""
+    seen: set[str] = set()
+    repeated: dict[str, None] = {}
+    for value in ids:
+        if value in seen:
+            repeated[value] = None
+        seen.add(value)
+    return list(repeated)
+
+
+def meter_unique_id_star(
+    template: str | None, unique_id: str | None, name: str | None
+) -> str:
+    """Return what ``*`` stands for in a proxy's utility meter unique ids.
+
+    The default ids follow the proxy's unique id; templates get the object id
+    its name (or unique id) slugifies to. Config validation and meter creation
+    both use this, so the index checks the ids the meters actually get, and
+    renaming the proxy's entity does not change them.
+    """
+    if template is None and unique_id:
+        return unique_id
+    return slugify(name or unique_id or "")
+
+
+@callback
+def async_device_slug_resolver(hass: HomeAssistant) -> Callable[[str], str]:
+    """Return a function mapping a device id to the slug of its name.
+
+    Used for the ``{device}`` placeholder; unknown or unnamed devices keep
+    their id.
+    """
+    registry = dr.async_get(hass)
+
+    def _device_slug(device_id: str) -> str:
+        device = registry.async_get(device_id)
+        if device is None or not (name := device.name_by_user or device.name):
+            _LOGGER.debug("No device name for {device} placeholder: %s", device_id)
+            return device_id
+        return slugify(name)
+
+    return _device_slug
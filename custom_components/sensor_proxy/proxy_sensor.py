@@ -2,96 +2,292 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
-import threading
-from typing import Callable, Iterable, Optional
+import math
+import time
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import MATCH_ALL
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers.start import async_at_started
 from homeassistant.util import slugify
 
+from .chains import async_get_proxy_chains
+from .config import (
+    AttributeFilter,
+    FlapOptions,
+    ProxyConfig,
+    ProxyDefinition,
+    UpdateOptions,
+    WindowOptions,
+    template_values,
+)
 from .const import (
+    ATTR_RESTORED,
+    CONF_BACKFILL_UTILITY_METERS,
     CONF_UTILITY_METER_TYPES,
+    DEFAULT_BACKFILL_UTILITY_METERS,
     DEFAULT_UTILITY_METER_TYPES,
 )
 from .const import DOMAIN as DOMAIN_CONST
-from .virtual_meter import build_virtual_meter_entity
+from .const import RESTORE_GRACE_PERIOD
+from .dispatcher import async_get_dispatcher
+from .flap import FlapDamper
+from .id_index import async_get_id_index
+from .meter_queue import async_get_meter_queue
+from .naming import (
+    DEFAULT_METER_TEMPLATE,
+    FIELD_CYCLE,
+    FIELD_STAR,
+    async_device_slug_resolver,
+    compile_template,
+    meter_unique_id_star,
+)
+from .registry_batch import async_get_registry_batch
+from .state_store import async_get_state_store
+from .stats import ProxyStats, async_get_stats
+from .throttle import UpdateThrottle
+from .timer_wheel import async_get_timer_wheel
+from .transform import TransformChain
+from .virtual_meter import (
+    SUPPORTED_METER_TYPES,
+    UtilityMeterEngine,
+    VirtualUtilityMeter,
+    build_virtual_meter_entity,
+)
+from .window import WINDOW_MEAN, WINDOW_RATE, SampleWindow
+from .work_queue import async_get_work_queue
 
 _LOGGER = logging.getLogger(__name__)
 
+_TOTAL_STATE_CLASSES = (SensorStateClass.TOTAL, SensorStateClass.TOTAL_INCREASING)
+
+# Source attributes a window replaces; mirrored extras would override its own
+_WINDOW_REPLACED_ATTRIBUTES = frozenset(
+    ("unit_of_measurement", "device_class", "state_class")
+)
+
+
+def _source_pending(source_state: State | None) -> bool:
+    """Return True while a source is not loaded: no state, or a restored placeholder.
+
+    Home Assistant shows registered entities whose integration has not set
+    them up yet as unavailable with ``restored: true``.
+    """
+    return source_state is None or bool(source_state.attributes.get(ATTR_RESTORED))
+
 
 class SensorProxySensor(SensorEntity):
-    """Sensor entity that mirrors another sensor's state and attributes."""
+    """Sensor entity that mirrors another sensor's state and attributes.
+
+    A plain mirror (no attribute filter, transform or window) keeps a
+    reference to the source's ``State`` and reads its value, unit, classes,
+    icon and attributes from it, instead of copying them into ``_attr_*``
+    fields and the per-instance property caches.
+    """
+
+    # The proxy's own fields; the instance dict only holds Home Assistant's
+    # entity attributes and property caches
+    __slots__ = (
+        "_hass",
+        "_config",
+        "_tracked_source_id",
+        "_source_listener",
+        "_source_unsub",
+        "_unsub",
+        "_created_meter_entities",
+        "_meter_engine",
+        "_utility_meters_created",
+        "_keep_meter_entries",
+        "_attribute_filter",
+        "_source_fingerprint",
+        "_mirrored",
+        "_stats",
+        "_totals",
+        "_throttle",
+        "_flap_damper",
+        "_transform",
+        "_window",
+        "_window_decimals",
+        "_window_expiry",
+        "_restored",
+    )
+
+    # Class-wide defaults, so instances only store the fields they set
+    _attr_native_unit_of_measurement = None
+    _attr_device_class = None
+    _attr_state_class = None
+    _attr_icon = None
+    _attr_extra_state_attributes: Mapping[str, Any] = {}
 
     def __init__(
         self,
         hass: HomeAssistant,
         name: Optional[str],
-        source_entity_id: str,
+        source_entity_id: Optional[str],
         unique_id: Optional[str],
         device_id: Optional[str] = None,
         create_utility_meters: Optional[bool] = None,
         utility_meter_types: Optional[Iterable[str]] = None,
         utility_name_template: Optional[str] = None,
         utility_unique_id_template: Optional[str] = None,
+        update_options: Optional[UpdateOptions] = None,
+        attribute_filter: Optional[AttributeFilter] = None,
+        transform: Optional[Sequence[tuple[str, Any]]] = None,
+        window_options: Optional[WindowOptions] = None,
+        backfill_utility_meters: Optional[bool] = None,
+        suffix: Optional[str] = None,
+        flap_options: Optional[FlapOptions] = None,
     ) -> None:
         self._hass = hass
         self._attr_name = name
         self._attr_unique_id = unique_id
-        self._source_entity_id = source_entity_id
-        self._device_id = device_id
+        self._config = ProxyConfig(
+            source_entity_id,
+            device_id,
+            create_utility_meters,
+            None if utility_meter_types is None else tuple(utility_meter_types),
+            backfill_utility_meters,
+            utility_name_template,
+            utility_unique_id_template,
+            suffix,
+        )
+        # The entity actually listened to; the root source when chained, see chains.py.
+        # None for subclasses tracking several sources (aggregates)
+        self._tracked_source_id = source_entity_id
+        self._source_listener: Callable[[Event[EventStateChangedData]], None] | None = (
+            None
+        )
+        self._source_unsub: CALLBACK_TYPE | None = None
         self._unsub: Optional[Callable[[], None]] = None
-        self._create_utility_meters = create_utility_meters  # None = use global default
-        self._utility_meter_types = utility_meter_types
-        self._utility_name_template = utility_name_template
-        self._utility_unique_id_template = utility_unique_id_template
-        self._created_meter_entities: list[tuple[str, str | None]] = []
+        # (entity_id, unique_id) of the utility meters, once built
+        self._created_meter_entities: list[tuple[str, str | None]] | None = None
+        self._meter_engine: Optional[UtilityMeterEngine] = None
         self._utility_meters_created = False
+        # Set while removed for a reconfigured replacement, see async_replace
+        self._keep_meter_entries = False
+        self._attribute_filter = attribute_filter
+
+        # Change detection: skip state writes when the mirrored fields are unchanged
+        self._source_fingerprint: tuple | None = None
+        # The source state a plain mirror shows, see the mirrored properties below
+        self._mirrored: State | None = None
+
+        # Per-proxy and integration-wide counters, see stats.py
+        self._stats = ProxyStats()
+        self._totals = async_get_stats(hass).totals
+
+        # Optional throttle/debounce/deadband, flushed through the shared timer wheel
+        self._throttle: Optional[UpdateThrottle] = None
+        if update_options is not None and update_options.enabled:
+            self._throttle = UpdateThrottle(
+                async_get_timer_wheel(hass),
+                update_options,
+                self._async_write_mirrored_state,
+            )
+
+        # Optional hold-down of source outages, also on the timer wheel, see flap.py
+        self._flap_damper: Optional[FlapDamper] = None
+        if flap_options is not None:
+            self._flap_damper = FlapDamper(
+                async_get_timer_wheel(hass),
+                flap_options,
+                self._async_hold_down_expired,
+            )
+
+        # Optional numeric transform chain, compiled per source unit, see transform.py
+        self._transform: Optional[TransformChain] = None
+        if transform:
+            self._transform = TransformChain(transform)
+
+        # Optional windowed statistic over the numeric source values, see window.py
+        self._window: Optional[SampleWindow] = None
+        # Decimals of the sampled values; None when a transform without rounding made them floats
+        self._window_decimals: int | None = (
+            0 if self._transform is None else self._transform.decimals
+        )
+        self._window_expiry: float | None = None
+        if window_options is not None:
+            self._window = SampleWindow(
+                window_options.function,
+                window_options.max_samples,
+                window_options.duration,
+            )
 
-        # Default HA entity attributes; ensure they exist even if the source
-        # entity is missing at initialization to avoid AttributeError on access.
-        self._attr_native_value = None
-        self._attr_extra_state_attributes = {}
-        self._attr_native_unit_of_measurement = None
-        self._attr_device_class = None
-        self._attr_state_class = None
-        self._attr_icon = None
         self._attr_available = False
+        # True while showing the snapshot saved by the previous run
+        self._restored = False
 
-        source_state = hass.states.get(self._source_entity_id)
-        if source_state:
+        if source_entity_id is not None and (
+            source_state := hass.states.get(source_entity_id)
+        ):
             self._copy_source_attributes(source_state)
 
+    @classmethod
+    def from_definition(
+        cls, hass: HomeAssistant, definition: ProxyDefinition
+    ) -> SensorProxySensor:
+        """Create the proxy described by an expanded YAML definition."""
+        return cls(
+            hass,
+            definition.name,
+            definition.source_entity_id,
+            definition.unique_id,
+            definition.device_id,
+            create_utility_meters=definition.create_utility_meters,
+            utility_meter_types=definition.utility_meter_types,
+            utility_name_template=definition.utility_name_template,
+            utility_unique_id_template=definition.utility_unique_id_template,
+            update_options=definition.update_options,
+            attribute_filter=definition.attribute_filter,
+            transform=definition.transform,
+            window_options=definition.window,
+            backfill_utility_meters=definition.backfill_utility_meters,
+            suffix=definition.suffix,
+            flap_options=definition.flap,
+        )
+
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
+        # The rest of the setup is staggered with all other proxies, see work_queue.py
+        async_get_work_queue(self.hass).async_submit(self, self._async_start)
 
-        if self._device_id:
+    @callback
+    def _async_start(self) -> None:
+        """Associate the device, start listening and show the initial state."""
+        if device_id := self._config.device_id:
             if not self.unique_id:
                 _LOGGER.warning(
                     "Device ID provided for %s but no unique_id specified. Device association requires a unique_id. "
                     "Please add a unique_id to your configuration.",
-                    self.name or self._source_entity_id,
+                    self.name or self.source_entity_id,
                 )
             else:
-                entity_registry = er.async_get(self.hass)
-                # Associate with device; registry does not accept 'suggested_area_id'
-                entity_registry.async_get_or_create(
-                    "sensor",
-                    "sensor_proxy",
-                    self.unique_id,
-                    device_id=self._device_id,
+                # Associated together with all other proxies, see registry_batch.py
+                async_get_registry_batch(self.hass).async_link_device(
+                    self.unique_id, device_id
                 )
 
-        self._unsub = async_track_state_change_event(
-            self.hass, self._source_entity_id, self._async_source_changed_event
+        # All proxies share one state_changed listener owned by the integration;
+        # the timed handler is only used when diagnostics timing is enabled
+        collector = async_get_stats(self.hass)
+        collector.async_register(self.entity_id, self._stats)
+        self._unsub = self._async_track_sources(
+            self._async_source_changed_event_timed
+            if collector.timing
+            else self._async_source_changed_event
         )
 
         # Attempt to initialize from the current source state (helps restored proxies)
@@ -102,154 +298,582 @@ class SensorProxySensor(SensorEntity):
                 "Failed to initialize proxy %s from source on add", self.name
             )
 
+        # While the source is not loaded yet, show the last known state until it reports
+        if not self._attr_available and self._sources_pending():
+            self._restore_snapshot()
+
         # Informative debug: the proxy entity is now present in hass and listening
         _LOGGER.debug(
             "Proxy sensor created: name=%s unique_id=%s source=%s device_id=%s available=%s",
             self.name,
             self.unique_id,
-            self._source_entity_id,
-            self._device_id,
+            self.source_entity_id,
+            self._config.device_id,
             self.available,
         )
 
-        # Don't create utility meters here - wait until source is available
-        # Utility meters will be created on first successful state copy
+        self.async_write_ha_state()
+
+        # Utility meters are only created once the source is available
+        if self._attr_available and not self._restored:
+            self._async_record_snapshot()
+            self._async_schedule_utility_meters()
+
+    async def async_replace(self) -> None:
+        """Remove the proxy for a reconfigured replacement with the same unique id.
+
+        The registry entries of the proxy and its utility meters are kept, so
+        the replacement's meters come back under their registered entity ids
+        with the user's names, entity id overrides and disabled flags.
+        """
+        self._keep_meter_entries = True
+        await self.async_remove(force_remove=True)
 
     async def async_will_remove_from_hass(self) -> None:
         # Debug: proxy is being removed from hass
         _LOGGER.debug(
-            "Removing proxy sensor: name=%s unique_id=%s entity_id=%s source=%s",
+            "Removing proxy sensor: name=%s unique_id=%s entity_id=%s source=%s "
+            "events=%d writes=%d suppressed=%d",
             self.name,
             self.unique_id,
             self.entity_id,
-            self._source_entity_id,
+            self.source_entity_id,
+            self._stats.events,
+            self._stats.written,
+            self._stats.suppressed,
         )
 
+        async_get_work_queue(self.hass).async_cancel(self)
         if self._unsub:
             self._unsub()
             self._unsub = None
+        async_get_stats(self.hass).async_unregister(self.entity_id)
+        if self._throttle is not None:
+            self._throttle.async_cancel()
+        if self._flap_damper is not None:
+            self._flap_damper.async_cancel()
+        if self._window is not None:
+            async_get_timer_wheel(self.hass).async_cancel(self._window)
+        if self._restored:
+            async_get_timer_wheel(self.hass).async_cancel(self)
+        async_get_meter_queue(self.hass).async_discard(self)
         await self._async_cleanup_created_meters()
 
-    def _copy_source_attributes(self, source_state) -> None:
-        prev_available = self._attr_available
+    @property
+    def source_entity_id(self) -> str | None:
+        """Return the configured source entity id (None for aggregates)."""
+        return self._config.source_entity_id
+
+    @property
+    def native_value(self) -> Any:
+        if (state := self._mirrored) is not None:
+            return state.state
+        return self._attr_native_value
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        if (state := self._mirrored) is not None:
+            return state.attributes.get("unit_of_measurement")
+        return self._attr_native_unit_of_measurement
+
+    @property
+    def device_class(self) -> Any:
+        if (state := self._mirrored) is not None:
+            return state.attributes.get("device_class")
+        return self._attr_device_class
+
+    @property
+    def state_class(self) -> Any:
+        if (state := self._mirrored) is not None:
+            return state.attributes.get("state_class")
+        return self._attr_state_class
+
+    @property
+    def icon(self) -> str | None:
+        if (state := self._mirrored) is not None:
+            return state.attributes.get("icon")
+        return self._attr_icon
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        if (state := self._mirrored) is not None:
+            # The source's immutable ReadOnlyDict, shared rather than copied
+            return state.attributes
+        return self._attr_extra_state_attributes
 
+    @property
+    def definition_key(self) -> str:
+        """Return the key of the definition, as ``ProxyDefinition.key``."""
+        if self._attr_unique_id:
+            return self._attr_unique_id
+        return f"{self.source_entity_id}:{self._attr_name}"
+
+    @property
+    def tracked_source_id(self) -> str | None:
+        """Return the entity id listened to (the chain root for chained proxies)."""
+        return self._tracked_source_id
+
+    @property
+    def collapsible(self) -> bool:
+        """Return True if the state equals the source state, so chains may skip it."""
+        return (
+            self._transform is None
+            and self._window is None
+            and self._throttle is None
+            and self._flap_damper is None
+            and self._attribute_filter is None
+        )
+
+    @callback
+    def _async_track_sources(
+        self, listener: Callable[[Event[EventStateChangedData]], None]
+    ) -> CALLBACK_TYPE:
+        """Route state changes of the source(s) to ``listener``; return the unsub."""
+        self._source_listener = listener
+        self._tracked_source_id = async_get_proxy_chains(self.hass).async_register(self)
+        if self._tracked_source_id != self.source_entity_id:
+            _LOGGER.debug(
+                "Proxy %s listens to %s instead of proxy %s",
+                self.entity_id,
+                self._tracked_source_id,
+                self.source_entity_id,
+            )
+        self._source_unsub = async_get_dispatcher(self.hass).async_register(
+            self._tracked_source_id, listener
+        )
+        return self._async_untrack_sources
+
+    @callback
+    def _async_untrack_sources(self) -> None:
+        async_get_proxy_chains(self.hass).async_unregister(self)
+        if self._source_unsub is not None:
+            self._source_unsub()
+            self._source_unsub = None
+
+    @callback
+    def async_rewire(self, entity_id: str) -> None:
+        """Listen to ``entity_id`` instead, after a chain through this proxy changed."""
+        if entity_id == self._tracked_source_id or self._source_unsub is None:
+            return
+        _LOGGER.debug(
+            "Proxy %s now listens to %s (was %s)",
+            self.entity_id,
+            entity_id,
+            self._tracked_source_id,
+        )
+        self._source_unsub()
+        self._tracked_source_id = entity_id
+        self._source_unsub = async_get_dispatcher(self.hass).async_register(
+            entity_id, self._source_listener
+        )
+        # Catch up in case the new source's state differs from what was mirrored
+        self._async_source_changed(entity_id, None, self.hass.states.get(entity_id))
+
+    def _sources_pending(self) -> bool:
+        """Return True while the source is not loaded yet, see ``_source_pending``."""
+        return _source_pending(self._hass.states.get(self._tracked_source_id))
+
+    def _apply_source_state(self, entity_id: str, source_state) -> bool:
+        """Apply a new state of source ``entity_id``; return False if nothing changed."""
+        return self._copy_source_attributes(source_state)
+
+    def _meter_source_attributes(self) -> Mapping[str, Any] | None:
+        """Return the attributes deciding whether utility meters apply."""
+        if self._window is not None:
+            # A windowed statistic is never an energy total
+            return {
+                "state_class": self._attr_state_class,
+                "device_class": self._attr_device_class,
+            }
+        source_state = self._hass.states.get(self._tracked_source_id)
+        return None if source_state is None else source_state.attributes
+
+    def _copy_source_attributes(self, source_state) -> bool:
+        """Mirror the source state; return False when nothing mirrored changed.
+
+        The fingerprint is the source's state string plus its attribute mapping.
+        Home Assistant reuses the same ``ReadOnlyDict`` when attributes are
+        unchanged, so the comparison is usually an identity check.
+        """
         if source_state is None or source_state.state in ("unavailable", "unknown"):
-            # Mark as unavailable only if it changed to reduce log spam
-            self._attr_native_value = None
-            self._attr_extra_state_attributes = {}
-            self._attr_native_unit_of_measurement = None
-            self._attr_device_class = None
-            self._attr_state_class = None
-            self._attr_icon = None
-            self._attr_available = False
-            if prev_available:
-                _LOGGER.info(
-                    "Proxy %s marked unavailable (source=%s)",
-                    self.name,
-                    self._source_entity_id,
+            fingerprint = None
+        else:
+            fingerprint = (source_state.state, source_state.attributes)
+        if fingerprint is None and self._restored:
+            if _source_pending(source_state):
+                # Keep the restored snapshot until the source is loaded
+                return False
+            # The loaded source reports an outage: the snapshot is stale
+            self._source_fingerprint = None
+            self._drop_snapshot()
+            return True
+        if fingerprint == self._source_fingerprint:
+            return False
+        self._source_fingerprint = fingerprint
+
+        prev_available = self._attr_available and not self._restored
+        if fingerprint is None and prev_available:
+            self._stats.flaps += 1
+            self._totals["flaps"] += 1
+            if self._flap_damper is not None:
+                # Keep the last good value until the hold-down ends
+                hold_down = self._flap_damper.async_hold()
+                _LOGGER.debug(
+                    "Proxy %s holds its state for %.1fs while %s is unavailable",
+                    self.entity_id,
+                    hold_down,
+                    self.source_entity_id,
                 )
-            return
+                return False
+        elif self._flap_damper is not None and self._flap_damper.async_release():
+            self._stats.flaps_absorbed += 1
+            self._totals["flaps_absorbed"] += 1
+        if self._restored:
+            self._end_restore()
+        self._mirrored = None
 
-        # Copy attributes from source and log initialization only when availability changes
-        self._attr_available = True
-        self._attr_native_value = source_state.state
-        self._attr_extra_state_attributes = source_state.attributes.copy()
+        if fingerprint is None:
+            self._mark_unavailable(prev_available)
+            return True
 
         attrs = source_state.attributes
-        self._attr_native_unit_of_measurement = attrs.get("unit_of_measurement")
-        self._attr_device_class = attrs.get("device_class")
-        self._attr_state_class = attrs.get("state_class")
-        self._attr_icon = attrs.get("icon")
+        if self._attribute_filter is None:
+            if self._transform is None and self._window is None:
+                # Plain mirror: reference the source state instead of copying it
+                self._mirrored = source_state
+                self._attr_available = True
+                if not prev_available:
+                    self._log_initialized()
+                return True
+            # Share the source's immutable ReadOnlyDict instead of copying it
+            extra_attributes = attrs
+        else:
+            extra_attributes = self._attribute_filter.apply(attrs)
+        value = source_state.state
+        unit = attrs.get("unit_of_measurement")
+        device_class = attrs.get("device_class")
+        state_class = attrs.get("state_class")
+        if self._transform is not None:
+            value, unit = self._transform.apply(value, unit)
+        if self._window is not None:
+            value, unit, device_class, state_class = self._windowed(
+                value, unit, device_class, state_class
+            )
+            extra_attributes = {
+                key: attribute
+                for key, attribute in extra_attributes.items()
+                if key not in _WINDOW_REPLACED_ATTRIBUTES
+            }
+        mirrored = (
+            value,
+            extra_attributes,
+            unit,
+            device_class,
+            state_class,
+            attrs.get("icon"),
+        )
+        if (
+            prev_available
+            and (self._attribute_filter is not None or self._window is not None)
+            and mirrored
+            == (
+                self._attr_native_value,
+                self._attr_extra_state_attributes,
+                self._attr_native_unit_of_measurement,
+                self._attr_device_class,
+                self._attr_state_class,
+                self._attr_icon,
+            )
+        ):
+            # Only filtered-out attributes changed, or the windowed value did not
+            return False
+
+        # Copy attributes from source and log initialization only when availability changes
+        self._attr_available = True
+        (
+            self._attr_native_value,
+            self._attr_extra_state_attributes,
+            self._attr_native_unit_of_measurement,
+            self._attr_device_class,
+            self._attr_state_class,
+            self._attr_icon,
+        ) = mirrored
 
         if not prev_available:
+            self._log_initialized()
+        return True
+
+    def _mark_unavailable(self, was_available: bool) -> None:
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+        self._attr_native_unit_of_measurement = None
+        self._attr_device_class = None
+        self._attr_state_class = None
+        self._attr_icon = None
+        self._attr_available = False
+        # Log only if it changed to reduce log spam
+        if was_available:
             _LOGGER.info(
-                "Proxy %s initialized from source %s: state=%s",
+                "Proxy %s marked unavailable (source=%s)",
                 self.name,
-                self._source_entity_id,
-                self._attr_native_value,
+                self.source_entity_id,
             )
-            # Write state to ensure unit is available before creating utility meters
-            self.async_write_ha_state()
-            # Create utility meters once when first initialized
-            # Check if we should create utility meters
-            should_create = self._create_utility_meters or (
-                self._create_utility_meters is None
-                and self._hass.data.get(DOMAIN_CONST, {}).get(
-                    "create_utility_meters", False
-                )
+
+    @callback
+    def _async_hold_down_expired(self) -> None:
+        """Report the source outage once it outlasted the hold-down."""
+        if self._source_fingerprint is not None or not self._attr_available:
+            return
+        self._mirrored = None
+        self._mark_unavailable(True)
+        self._async_state_changed()
+
+    def _log_initialized(self) -> None:
+        _LOGGER.info(
+            "Proxy %s initialized from source %s: state=%s",
+            self.name,
+            self.source_entity_id,
+            self.native_value,
+        )
+
+    def _windowed(self, value: Any, unit, device_class, state_class) -> tuple:
+        """Add ``value`` to the window; return its (value, unit, device/state class).
+
+        Non-numeric values are not sampled and leave the windowed value unchanged.
+        """
+        window = self._window
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            number = math.nan
+        if math.isfinite(number):
+            if isinstance(value, str) and self._window_decimals is not None:
+                _, _, fraction = value.partition(".")
+                if len(fraction) > self._window_decimals and fraction.isdigit():
+                    self._window_decimals = len(fraction)
+            window.push(async_get_timer_wheel(self._hass).time(), number)
+            self._async_schedule_window_expiry()
+
+        if window.function == WINDOW_RATE:
+            unit = f"{unit}/s" if unit else None
+            device_class = None
+            state_class = SensorStateClass.MEASUREMENT
+        elif state_class in _TOTAL_STATE_CLASSES:
+            # A mean or extreme of a total is not itself a total
+            state_class = None
+        return self._window_value(), unit, device_class, state_class
+
+    def _window_value(self) -> float | int | None:
+        result = self._window.result()
+        if result is None:
+            return None
+        function = self._window.function
+        if function == WINDOW_RATE:
+            # Rates are often tiny; keep significant digits rather than decimals
+            return float(f"{result:.6g}")
+        if self._window_decimals is None:
+            # Unrounded transform output: only trim float noise from the mean
+            return round(result, 6) if function == WINDOW_MEAN else result
+        decimals = self._window_decimals + (2 if function == WINDOW_MEAN else 0)
+        return round(result, decimals) if decimals else int(round(result))
+
+    @callback
+    def _async_schedule_window_expiry(self) -> None:
+        """Arm the timer for the oldest sample aging out of the window."""
+        expiry = self._window.next_expiry()
+        if expiry is None or expiry == self._window_expiry:
+            return
+        self._window_expiry = expiry
+        async_get_timer_wheel(self._hass).async_schedule_at(
+            self._window, expiry, self._async_window_expired
+        )
+
+    @callback
+    def _async_window_expired(self) -> None:
+        """Drop samples that aged out and write the new windowed value."""
+        self._window_expiry = None
+        self._window.expire(async_get_timer_wheel(self._hass).time())
+        self._async_schedule_window_expiry()
+        if not self._attr_available or self._restored:
+            return
+        value = self._window_value()
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        self._async_state_changed()
+
+    def _restore_snapshot(self) -> None:
+        """Show the snapshot saved by the previous run, flagged as restored."""
+        if not self.entity_id:
+            return
+        snapshot = async_get_state_store(self._hass).async_restore(self.entity_id)
+        if snapshot is None:
+            return
+        self._mirrored = None
+        (
+            self._attr_native_value,
+            self._attr_native_unit_of_measurement,
+            self._attr_device_class,
+            self._attr_state_class,
+            self._attr_icon,
+        ) = snapshot
+        self._attr_extra_state_attributes = {ATTR_RESTORED: True}
+        self._attr_available = True
+        self._restored = True
+        async_get_timer_wheel(self._hass).async_schedule_later(
+            self, RESTORE_GRACE_PERIOD, self._async_restore_expired
+        )
+        _LOGGER.debug(
+            "Proxy %s restored last known state %s while waiting for %s",
+            self.name,
+            self._attr_native_value,
+            self.source_entity_id,
+        )
+
+    def _end_restore(self) -> None:
+        """Stop showing the restored snapshot and cancel its grace period."""
+        self._restored = False
+        async_get_timer_wheel(self._hass).async_cancel(self)
+
+    def _drop_snapshot(self) -> None:
+        """Stop showing the restored snapshot; the proxy is unavailable."""
+        self._end_restore()
+        self._mark_unavailable(False)
+        _LOGGER.debug(
+            "Proxy %s dropped its restored state, %s has no valid state",
+            self.name,
+            self.source_entity_id,
+        )
+
+    @callback
+    def _async_restore_expired(self) -> None:
+        """Go unavailable if the source never reported within the grace period."""
+        if not self._restored:
+            return
+        self._drop_snapshot()
+        self._async_state_changed()
+
+    @callback
+    def _async_record_snapshot(self) -> None:
+        async_get_state_store(self._hass).async_record(
+            self.entity_id,
+            (
+                self.native_value,
+                self.native_unit_of_measurement,
+                self.device_class,
+                self.state_class,
+                self.icon,
+            ),
+        )
+
+    @callback
+    def _async_schedule_utility_meters(self) -> None:
+        """Create utility meters once, after the proxy first became available."""
+        if self._utility_meters_created:
+            return
+        # Check if we should create utility meters
+        create_utility_meters = self._config.create_utility_meters
+        should_create = create_utility_meters or (
+            create_utility_meters is None
+            and self._hass.data.get(DOMAIN_CONST, {}).get(
+                "create_utility_meters", False
             )
-            if should_create and not self._utility_meters_created:
-                self._utility_meters_created = True
-
-                # Use async_at_started to wait for Home Assistant to be fully ready
-                # This ensures the state machine is initialized and source entity state is available
-                # This is the official pattern used by utility_meter and other core components
-                @callback
-                def _create_meters_when_ready(_hass: HomeAssistant) -> None:
-                    """Create utility meters when Home Assistant is fully started."""
-                    self._hass.async_create_task(self._async_create_utility_meters())
-
-                self.async_on_remove(
-                    async_at_started(self._hass, _create_meters_when_ready)
-                )
+        )
+        if not should_create:
+            return
+        self._utility_meters_created = True
+
+        # Meters of all proxies are created together once Home Assistant has started
+        async_get_meter_queue(self._hass).async_enqueue(self)
 
     @callback
     def _async_source_changed(self, entity_id, old_state, new_state) -> None:
-        if new_state is None:
-            self._attr_native_value = None
-            self._attr_extra_state_attributes = {}
-        else:
-            self._copy_source_attributes(new_state)
+        if not self._apply_source_state(entity_id, new_state):
+            # Only last_reported or non-mirrored data changed; skip the state write
+            self._stats.suppressed += 1
+            self._totals["suppressed"] += 1
+            return
+        self._async_state_changed()
 
+    @callback
+    def _async_state_changed(self) -> None:
+        """Write the changed proxy state, unless the throttle defers it."""
+        if self._throttle is not None and not self._throttle.async_should_write(
+            self.native_value, self._attr_available
+        ):
+            # Deferred; the throttle flushes the latest mirrored state later
+            self._stats.throttled += 1
+            self._totals["throttled"] += 1
+            return
+
+        self._async_write_mirrored_state()
+
+    @callback
+    def _async_write_mirrored_state(self) -> None:
         self.async_write_ha_state()
+        value = self.native_value
+        self._stats.written += 1
+        self._totals["written"] += 1
+        if self._throttle is not None:
+            self._throttle.async_record_write(value, self._attr_available)
+        if self._meter_engine is not None:
+            self._meter_engine.async_update(value, self.native_unit_of_measurement)
+
+        if self._attr_available:
+            self._async_record_snapshot()
+            # Write state first so the unit is available before creating utility meters
+            self._async_schedule_utility_meters()
 
     @callback
     def _async_source_changed_event(self, event) -> None:
+        self._stats.events += 1
+        self._totals["events"] += 1
         data = event.data
         entity_id = data.get("entity_id")
         old_state = data.get("old_state")
         new_state = data.get("new_state")
         self._async_source_changed(entity_id, old_state, new_state)
 
+    @callback
+    def _async_source_changed_event_timed(self, event) -> None:
+        """Like ``_async_source_changed_event``, also recording lag and callback time."""
+        start = time.perf_counter()
+        self._stats.last_event_lag_ms = (
+            time.time() - event.time_fired_timestamp
+        ) * 1000
+        self._async_source_changed_event(event)
+        self._stats.record_callback((time.perf_counter() - start) * 1_000_000)
+
     def update(self) -> None:
-        source_state = self._hass.states.get(self._source_entity_id)
+        source_state = self._hass.states.get(self._tracked_source_id)
         if source_state:
             self._copy_source_attributes(source_state)
 
-    async def _async_create_utility_meters(self) -> None:
-        # Log thread/task info for debugging duplicate logs
-        thread_id = threading.current_thread().ident
-        task = asyncio.current_task()
-        task_name = task.get_name() if task else "no-task"
+    @callback
+    def async_build_utility_meters(self) -> list[VirtualUtilityMeter]:
+        """Build (but do not add) this proxy's utility meters.
 
+        Meters that are already registered and have a state are skipped, and
+        so are meters whose unique id another definition claimed (see
+        ``IdIndex``). Called by the ``MeterCreationQueue``, which adds the
+        returned entities in batches.
+        """
         # Extra defensive guard: prevent duplicate execution
         if self._created_meter_entities:
             _LOGGER.debug(
-                "Utility meters already created for %s, skipping duplicate call (thread=%s, task=%s)",
+                "Utility meters already created for %s, skipping duplicate call",
                 self.entity_id,
-                thread_id,
-                task_name,
             )
-            return
+            return []
 
-        platform = self.platform
-        if not platform:
-            _LOGGER.warning(
-                "Platform unavailable for %s; skipping utility meter creation",
-                self.entity_id,
-            )
-            return
-
-        meter_types = self._utility_meter_types or self._hass.data.get(
+        meter_types = self._config.utility_meter_types or self._hass.data.get(
             DOMAIN_CONST, {}
         ).get(CONF_UTILITY_METER_TYPES, DEFAULT_UTILITY_METER_TYPES)
 
         _LOGGER.info(
-            "Attempting to create utility meters for %s with types: %s (thread=%s, task=%s)",
+            "Attempting to create utility meters for %s with types: %s",
             self.entity_id,
             meter_types,
-            thread_id,
-            task_name,
         )
 
         # Verify that our proxy state is actually in the state machine
@@ -264,51 +888,45 @@ class SensorProxySensor(SensorEntity):
                     else "no state"
                 ),
             )
-            return
+            return []
 
         # Defer default name generation until we have the proxy object id to avoid
         # duplicating prefixes for glob-created proxies
         # (e.g. avoid 'sensor.copy_energy_meter_copy_energy_meter_daily' when the desired
         # name is 'sensor.copy_energy_meter_daily')
-        source_state = self._hass.states.get(self._source_entity_id)
-        if not source_state:
+        source_attributes = self._meter_source_attributes()
+        if source_attributes is None:
             _LOGGER.warning(
                 "Source entity %s not found when creating utility meters for %s",
-                self._source_entity_id,
+                self.source_entity_id,
                 self.entity_id,
             )
-            return
+            return []
 
-        entity_registry = er.async_get(self._hass)
         hass_data = self._hass.data.setdefault(DOMAIN_CONST, {})
         hass_data.setdefault("created_utility_meters", {})
 
-        # Register this parent meter in utility meter component's data structure
-        # This is required for the utility meter sensors to find their parent
-        from homeassistant.components.utility_meter.const import (
-            DATA_TARIFF_SENSORS,
-            DATA_UTILITY,
-        )
-
-        self._hass.data.setdefault(DATA_UTILITY, {})
-        if self.entity_id not in self._hass.data[DATA_UTILITY]:
-            self._hass.data[DATA_UTILITY][self.entity_id] = {}
-        self._hass.data[DATA_UTILITY][self.entity_id][DATA_TARIFF_SENSORS] = []
         base_object_id = (
             self.entity_id.split(".", 1)[1]
             if self.entity_id
             else slugify(self._attr_unique_id or self._attr_name or "sensor_proxy")
         )
 
-        # Choose defaults based on the resolved object id to avoid duplicated prefixes
-        name_template = self._utility_name_template or f"{base_object_id}_{{cycle}}"
-        unique_id_template = self._utility_unique_id_template or (
-            f"{self._attr_unique_id}_{{cycle}}"
-            if self._attr_unique_id
-            else f"{base_object_id}_{{cycle}}"
+        # Defaults use the resolved object id to avoid duplicated prefixes;
+        # templates are compiled once and shared, see naming.py
+        config = self._config
+        name_template = compile_template(
+            config.utility_name_template or DEFAULT_METER_TEMPLATE
+        )
+        unique_id_template = compile_template(
+            config.utility_unique_id_template or DEFAULT_METER_TEMPLATE
+        )
+        # Rendered as in the id index, not from the live entity id
+        unique_id_star = meter_unique_id_star(
+            config.utility_unique_id_template, self._attr_unique_id, self._attr_name
         )
 
-        attrs = source_state.attributes
+        attrs = source_attributes
         # Only create utility meters for energy accumulators reporting a
         # total_increasing state_class and device_class == energy.
         state_class = attrs.get("state_class")
@@ -320,73 +938,141 @@ class SensorProxySensor(SensorEntity):
             not in (SensorStateClass.TOTAL, SensorStateClass.TOTAL_INCREASING)
         ) or (device_class != SensorDeviceClass.ENERGY):
             # Only log if utility meters were explicitly enabled for this entity
-            if self._create_utility_meters is not None:
+            if self._config.create_utility_meters is not None:
                 _LOGGER.info(
                     "Skipping utility meter creation for %s: source %s has state_class=%s, device_class=%s "
                     "(requires state_class=total/total_increasing and device_class=energy)",
                     self.entity_id,
-                    self._source_entity_id,
+                    self.source_entity_id,
                     state_class,
                     device_class,
                 )
-            return
+            return []
 
-        meters_to_add = []
+        values = template_values(
+            config.source_entity_id,
+            config.suffix,
+            config.device_id,
+            async_device_slug_resolver(self._hass),
+        )
+        id_index = async_get_id_index(self._hass)
+        states = self._hass.states
+        planned: list[tuple[str, str, str]] = []
         for meter_type in meter_types:
-            meter_name = name_template.replace("*", base_object_id).replace(
-                "{cycle}", meter_type
-            )
-            meter_unique_id = unique_id_template.replace("*", base_object_id).replace(
-                "{cycle}", meter_type
-            )
-            if meter_unique_id:
-                existing = entity_registry.async_get_entity_id(
-                    domain="sensor",
-                    platform="utility_meter",
-                    unique_id=meter_unique_id,
+            if meter_type not in SUPPORTED_METER_TYPES:
+                _LOGGER.warning(
+                    "Unsupported utility meter type %s for %s (supported: %s)",
+                    meter_type,
+                    self.entity_id,
+                    ", ".join(SUPPORTED_METER_TYPES),
                 )
-                if existing and self._hass.states.get(existing):
+                continue
+            values[FIELD_CYCLE] = meter_type
+            values[FIELD_STAR] = base_object_id
+            meter_name = name_template.render(values)
+            values[FIELD_STAR] = unique_id_star
+            meter_unique_id = unique_id_template.render(values)
+            if meter_unique_id:
+                entity_id = id_index.async_registered_entity_id(meter_unique_id)
+                if entity_id is not None and states.get(entity_id) is not None:
                     _LOGGER.debug("Utility meter exists, skipping: %s", meter_unique_id)
                     continue
+                if not id_index.async_claim_meter(self.definition_key, meter_unique_id):
+                    _LOGGER.warning(
+                        "Skipping utility meter %s of %s: unique id used by %s",
+                        meter_unique_id,
+                        self.entity_id,
+                        id_index.async_owner(meter_unique_id),
+                    )
+                    continue
+            planned.append((meter_type, meter_name, meter_unique_id))
 
+        if not planned:
+            return []
+
+        # One engine accumulates every cycle from this proxy's updates
+        engine = UtilityMeterEngine(
+            self._hass, self.entity_id, [meter_type for meter_type, _, _ in planned]
+        )
+        meters_to_add = []
+        created_meter_entities = self._created_meter_entities = []
+        for meter_type, meter_name, meter_unique_id in planned:
             utility_meter, meter_entity_id = build_virtual_meter_entity(
-                hass=self._hass,
-                source_entity_id=self._source_entity_id,
-                parent_entity_id=self.entity_id,
-                base_object_id=base_object_id,
+                engine=engine,
+                meter_entity_id=id_index.async_meter_entity_id(
+                    meter_unique_id, f"{base_object_id}_{meter_type}"
+                ),
                 meter_type=meter_type,
                 meter_name=meter_name,
                 meter_unique_id=meter_unique_id,
             )
             meters_to_add.append(utility_meter)
-            # Register the meter in the parent meter's sensor list
-            self._hass.data[DATA_UTILITY][self.entity_id][DATA_TARIFF_SENSORS].append(
-                utility_meter
-            )
-            self._created_meter_entities.append((meter_entity_id, meter_unique_id))
+            created_meter_entities.append((meter_entity_id, meter_unique_id))
             if meter_unique_id:
                 hass_data["created_utility_meters"][meter_unique_id] = meter_entity_id
 
-        if meters_to_add:
-            await platform.async_add_entities(meters_to_add)
-
-            # Debug: list created meters with key details
+        self._meter_engine = engine
+        self._stats.meters_created += len(meters_to_add)
+        self._totals["meters_created"] += len(meters_to_add)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug(
-                "Created %d utility meter(s) for %s: %s (thread=%s, task=%s)",
+                "Built %d utility meter(s) for %s: %s",
                 len(meters_to_add),
                 self.entity_id,
-                [
-                    {
-                        "entity_id": m.entity_id,
-                        "unique_id": getattr(m, "unique_id", None),
-                        "meter_type": getattr(m, "meter_type", None),
-                    }
-                    for m in meters_to_add
-                ],
-                thread_id,
-                task_name,
+                [entity_id for entity_id, _ in created_meter_entities],
+            )
+        return meters_to_add
+
+    @property
+    def meter_engine(self) -> Optional[UtilityMeterEngine]:
+        return self._meter_engine
+
+    @property
+    def backfill_statistic_id(self) -> str | None:
+        """Return the statistic new utility meters are backfilled from, if any.
+
+        The source's statistics only describe this proxy when it mirrors the
+        value unchanged, so transformed and windowed proxies are not backfilled.
+        """
+        backfill = self._config.backfill_utility_meters
+        if backfill is None:
+            backfill = self._hass.data.get(DOMAIN_CONST, {}).get(
+                CONF_BACKFILL_UTILITY_METERS, DEFAULT_BACKFILL_UTILITY_METERS
+            )
+        if not backfill or self._transform is not None or self._window is not None:
+            return None
+        return self.source_entity_id
+
+    @callback
+    def async_utility_meters_added(self) -> None:
+        """Seed the meter engine once its entities were added (and restored)."""
+        if self._meter_engine is not None:
+            # Counts usage since the last restored value
+            self._meter_engine.async_update(
+                self.native_value, self.native_unit_of_measurement
             )
 
+    @callback
+    def async_release_utility_meters(self) -> list[str]:
+        """Hand this proxy's meters to a bulk removal; return their entity ids.
+
+        The proxy's own cleanup then has nothing left to remove.
+        """
+        created = self._hass.data.get(DOMAIN_CONST, {}).get(
+            "created_utility_meters", {}
+        )
+        if self._meter_engine is not None:
+            self._meter_engine.async_shutdown()
+            self._meter_engine = None
+        entity_ids = []
+        for entity_id, unique_id in self._created_meter_entities or ():
+            entity_ids.append(entity_id)
+            if unique_id:
+                created.pop(unique_id, None)
+        self._created_meter_entities = None
+        async_get_id_index(self._hass).async_release_entity_ids(entity_ids)
+        return entity_ids
+
     async def _async_cleanup_created_meters(self) -> None:
         if not self._created_meter_entities:
             return
@@ -396,16 +1082,17 @@ class SensorProxySensor(SensorEntity):
         created = hass_data.get("created_utility_meters", {})
         platform = self.platform
 
-        # Clean up utility meter component registration
-        from homeassistant.components.utility_meter.const import DATA_UTILITY
-
-        if (
-            DATA_UTILITY in self.hass.data
-            and self.entity_id in self.hass.data[DATA_UTILITY]
-        ):
-            self.hass.data[DATA_UTILITY].pop(self.entity_id, None)
+        if self._meter_engine is not None:
+            self._meter_engine.async_shutdown()
+            self._meter_engine = None
 
+        id_index = async_get_id_index(self.hass)
         for entity_id, unique_id in list(self._created_meter_entities):
+            if unique_id and (
+                registered := id_index.async_registered_entity_id(unique_id)
+            ):
+                # The user may have renamed the meter's entity id since
+                entity_id = registered
             _LOGGER.debug(
                 "Cleaning up created utility meter: entity_id=%s unique_id=%s parent=%s",
                 entity_id,
@@ -421,9 +1108,25 @@ class SensorProxySensor(SensorEntity):
                         "Platform reported ValueError removing utility meter (may already be gone): %s",
                         entity_id,
                     )
-            if entity_registry.async_get(entity_id):
+            if not self._keep_meter_entries and entity_registry.async_get(entity_id):
                 entity_registry.async_remove(entity_id)
                 _LOGGER.debug("Entity registry removed utility meter: %s", entity_id)
             if unique_id and unique_id in created:
                 created.pop(unique_id)
-        self._created_meter_entities.clear()
+        id_index.async_release_entity_ids(
+            entity_id for entity_id, _ in self._created_meter_entities
+        )
+        self._created_meter_entities = None
+
+
+class SensorProxyStateOnly(SensorProxySensor):
+    """A proxy whose source attributes are not recorded (``recording: state``).
+
+    The live state keeps every mirrored attribute. Only the recorder leaves
+    them out, keeping the unit, device class, state class and friendly name
+    that history and long-term statistics need.
+    """
+
+    __slots__ = ()
+
+    _unrecorded_attributes = frozenset({MATCH_ALL})
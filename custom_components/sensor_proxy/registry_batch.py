@@ -0,0 +1,78 @@
+"""Batched entity registry operations for the Sensor Proxy integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable
+
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import DATA_REGISTRY_BATCH, DOMAIN
+from .work_queue import async_get_work_queue
+
+__all__ = ["RegistryBatch", "async_get_registry_batch"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RegistryBatch:
+    """Apply the entity registry changes of many proxies in one pass.
+
+    Adding an entity to its platform resets the device of its registry entry,
+    so every proxy with a ``device_id`` has to associate it again once added.
+    Proxies queue the association here instead of each calling
+    ``async_get_or_create``: one work queue job, queued after the setup of
+    every proxy added so far, updates only the entries whose device differs.
+    Bulk removal drops the entries of proxies and their meters in one pass.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entity_registry = er.async_get(hass)
+        # unique_id -> device_id still to be applied
+        self._links: dict[str, str] = {}
+
+    @callback
+    def async_link_device(self, unique_id: str, device_id: str) -> None:
+        """Associate the proxy registered under ``unique_id`` with ``device_id``."""
+        self._links[unique_id] = device_id
+        async_get_work_queue(self._hass).async_submit(self, self._async_flush_links)
+
+    @callback
+    def _async_flush_links(self) -> None:
+        links, self._links = self._links, {}
+        registry = self._entity_registry
+        updated = 0
+        for unique_id, device_id in links.items():
+            entity_id = registry.async_get_entity_id(SENSOR_DOMAIN, DOMAIN, unique_id)
+            if entity_id is None:
+                continue
+            entry = registry.async_get(entity_id)
+            if entry is not None and entry.device_id != device_id:
+                registry.async_update_entity(entity_id, device_id=device_id)
+                updated += 1
+        _LOGGER.debug(
+            "Associated %d of %d proxies with their device", updated, len(links)
+        )
+
+    @callback
+    def async_remove(self, entity_ids: Iterable[str]) -> int:
+        """Remove the registry entries of ``entity_ids``; return how many existed."""
+        registry = self._entity_registry
+        removed = 0
+        for entity_id in entity_ids:
+            if registry.async_get(entity_id) is not None:
+                registry.async_remove(entity_id)
+                removed += 1
+        return removed
+
+
+@callback
+def async_get_registry_batch(hass: HomeAssistant) -> RegistryBatch:
+    """Return the integration-wide registry batch, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (batch := domain_data.get(DATA_REGISTRY_BATCH)) is None:
+        batch = domain_data[DATA_REGISTRY_BATCH] = RegistryBatch(hass)
+    return batch
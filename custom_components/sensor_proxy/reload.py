@@ -0,0 +1,249 @@
+"""Incremental reload of YAML proxies for the Sensor Proxy integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Iterable, Mapping
+
+import voluptuous as vol
+from homeassistant import config as conf_util
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.reload import async_get_platform_without_config_entry
+
+from .aggregate_sensor import SensorProxyAggregate, SensorProxyAggregateStateOnly
+from .config import (
+    AggregateDefinition,
+    ProxyDefinition,
+    ValuePool,
+    build_attribute_filter,
+    build_discovered_definition,
+    build_proxy_definitions,
+    source_pattern,
+)
+from .const import (
+    CONF_RECORDING,
+    DATA_PATTERN_WATCHES,
+    DATA_YAML_PROXIES,
+    DEFAULT_RECORDING,
+    DOMAIN,
+    RECORDING_STATE,
+)
+from .id_index import async_get_id_index
+from .naming import async_device_slug_resolver
+from .proxy_sensor import SensorProxySensor, SensorProxyStateOnly
+from .schema import PLATFORM_SCHEMA
+from .source_index import async_get_source_index
+
+__all__ = [
+    "async_reload_yaml_proxies",
+    "create_proxy_entity",
+    "async_track_yaml_proxies",
+    "async_watch_pattern_block",
+]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+Definition = ProxyDefinition | AggregateDefinition
+
+
+def create_proxy_entity(
+    hass: HomeAssistant, definition: Definition
+) -> SensorProxySensor:
+    """Create the proxy (or aggregate proxy) entity for ``definition``.
+
+    ``recording: state`` picks the subclass whose attributes are not recorded,
+    since the recorder reads them from the entity class.
+    """
+    recording = definition.recording or hass.data.get(DOMAIN, {}).get(
+        CONF_RECORDING, DEFAULT_RECORDING
+    )
+    state_only = recording == RECORDING_STATE
+    if isinstance(definition, AggregateDefinition):
+        if state_only:
+            return SensorProxyAggregateStateOnly.from_definition(hass, definition)
+        return SensorProxyAggregate.from_definition(hass, definition)
+    if state_only:
+        return SensorProxyStateOnly.from_definition(hass, definition)
+    return SensorProxySensor.from_definition(hass, definition)
+
+
+def _tracked(
+    hass: HomeAssistant,
+) -> dict[str, tuple[Definition, SensorProxySensor]]:
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_YAML_PROXIES, {})
+
+
+@callback
+def async_track_yaml_proxies(
+    hass: HomeAssistant,
+    proxies: Iterable[tuple[Definition, SensorProxySensor]],
+) -> None:
+    """Remember the definition each running YAML proxy was created from."""
+    tracked = _tracked(hass)
+    for definition, proxy in proxies:
+        if definition.key in tracked:
+            _LOGGER.warning(
+                "Duplicate sensor_proxy definition %s; reload only tracks the last one",
+                definition.key,
+            )
+        tracked[definition.key] = (definition, proxy)
+
+
+@callback
+def async_watch_pattern_block(
+    hass: HomeAssistant,
+    config: Mapping[str, Any],
+    async_add_entities: Callable[[list], None],
+) -> None:
+    """Add proxies for sources matching a wildcard block as they appear."""
+    pattern = source_pattern(config)
+    if pattern is None:
+        return
+    # Shared by every proxy added for this block
+    pool = ValuePool()
+    block_attribute_filter = build_attribute_filter(config, pool=pool)
+    device_slug = async_device_slug_resolver(hass)
+
+    @callback
+    def _async_source_added(entity_id: str) -> None:
+        definition = build_discovered_definition(
+            config, entity_id, block_attribute_filter, pool, device_slug
+        )
+        if definition.key in _tracked(hass) or not async_get_id_index(hass).async_claim(
+            [definition], "YAML"
+        ):
+            return
+        proxy = create_proxy_entity(hass, definition)
+        async_track_yaml_proxies(hass, [(definition, proxy)])
+        _LOGGER.info("Adding proxy for new source %s (%s)", entity_id, pattern)
+        async_add_entities([proxy])
+
+    watches = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PATTERN_WATCHES, [])
+    watches.append(
+        async_get_source_index(hass).async_watch(pattern, _async_source_added)
+    )
+
+
+async def _async_load_blocks(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Re-read configuration.yaml and validate every sensor_proxy block."""
+    config = await conf_util.async_hass_config_yaml(hass)
+    blocks: list[dict[str, Any]] = []
+    for platform, block in conf_util.config_per_platform(config, SENSOR_DOMAIN):
+        if platform != DOMAIN:
+            continue
+        try:
+            validated = PLATFORM_SCHEMA(block)
+        except vol.Invalid as err:
+            # Keep every running proxy rather than applying a partial config
+            raise HomeAssistantError(
+                f"Invalid sensor_proxy configuration: {err}"
+            ) from err
+        blocks.append(validated)
+    return blocks
+
+
+async def async_reload_yaml_proxies(hass: HomeAssistant) -> dict[str, int]:
+    """Apply changed YAML proxy definitions without touching unchanged proxies.
+
+    Definitions are matched by ``ProxyDefinition.key`` (the unique_id where
+    set). Proxies whose definition is gone are removed, new ones are added and
+    changed ones are replaced; their utility meters follow them. The ids of
+    the new and changed ones are claimed in one pass over all blocks, and
+    those colliding with ids in use are left out (see ``IdIndex``).
+    """
+    blocks = await _async_load_blocks(hass)
+    match = async_get_source_index(hass).async_match
+    device_slug = async_device_slug_resolver(hass)
+    definitions: dict[str, Definition] = {}
+    duplicates: list[str] = []
+    for block in blocks:
+        for definition in build_proxy_definitions(block, match, device_slug):
+            if definition.key in definitions:
+                duplicates.append(definition.key)
+            else:
+                definitions[definition.key] = definition
+    if duplicates:
+        _LOGGER.error(
+            "Ignoring duplicate sensor_proxy definitions: %s", ", ".join(duplicates)
+        )
+    tracked = _tracked(hass)
+
+    removed = [key for key in tracked if key not in definitions]
+    changed = [
+        key
+        for key, definition in definitions.items()
+        if key in tracked and tracked[key][0] != definition
+    ]
+    added = [key for key in definitions if key not in tracked]
+
+    to_create = changed + added
+    platform = async_get_platform_without_config_entry(hass, DOMAIN, SENSOR_DOMAIN)
+    if to_create and platform is None:
+        raise HomeAssistantError(
+            "No sensor_proxy YAML platform is loaded; restart Home Assistant to add proxies"
+        )
+
+    id_index = async_get_id_index(hass)
+    id_index.async_release(removed + changed)
+    accepted = {
+        definition.key
+        for definition in id_index.async_claim(
+            [definitions[key] for key in to_create], "YAML reload"
+        )
+    }
+    rejected = len(to_create) - len(accepted)
+    to_create = [key for key in to_create if key in accepted]
+
+    entity_registry = er.async_get(hass)
+    for key in removed:
+        _, proxy = tracked.pop(key)
+        if proxy.hass is None:
+            continue
+        if proxy.registry_entry is not None:
+            # Gone from the config: do not leave an orphaned "restored" entity behind
+            entity_registry.async_remove(proxy.entity_id)
+        else:
+            await proxy.async_remove(force_remove=True)
+    for key in changed:
+        _, proxy = tracked.pop(key)
+        if proxy.hass is not None:
+            # Keeps the registry entries, so the replacement and its utility
+            # meters keep their entity ids and user settings
+            await proxy.async_replace()
+
+    # Wildcard blocks may have changed too: watch the new ones only
+    for unwatch in hass.data[DOMAIN].pop(DATA_PATTERN_WATCHES, []):
+        unwatch()
+    if platform is not None:
+
+        @callback
+        def _async_add_entities(entities: list) -> None:
+            hass.async_create_task(platform.async_add_entities(entities))
+
+        for block in blocks:
+            async_watch_pattern_block(hass, block, _async_add_entities)
+
+    if to_create:
+        proxies = [
+            (
+                definitions[key],
+                create_proxy_entity(hass, definitions[key]),
+            )
+            for key in to_create
+        ]
+        async_track_yaml_proxies(hass, proxies)
+        await platform.async_add_entities([proxy for _, proxy in proxies])
+
+    result = {
+        "added": len(added),
+        "removed": len(removed),
+        "reconfigured": len(changed),
+        "unchanged": len(definitions) - len(to_create) - rejected,
+        "rejected": rejected,
+    }
+    _LOGGER.info("Reloaded sensor_proxy YAML: %s", result)
+    return result
@@ -0,0 +1,230 @@
+"""Shared period-reset scheduling for the Sensor Proxy utility meters."""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.utility_meter import DEFAULT_OFFSET
+from homeassistant.components.utility_meter.const import (
+    BIMONTHLY,
+    DAILY,
+    HOURLY,
+    MONTHLY,
+    QUARTER_HOURLY,
+    QUARTERLY,
+    WEEKLY,
+    YEARLY,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_RESET_SCHEDULER, DOMAIN
+
+if TYPE_CHECKING:
+    from .virtual_meter import UtilityMeterEngine
+
+__all__ = [
+    "MeterResetScheduler",
+    "SUPPORTED_METER_TYPES",
+    "async_get_reset_scheduler",
+    "next_period_start",
+    "period_start",
+]
+
+_LOGGER = logging.getLogger(__name__)
+
+SUPPORTED_METER_TYPES = (
+    QUARTER_HOURLY,
+    HOURLY,
+    DAILY,
+    WEEKLY,
+    MONTHLY,
+    BIMONTHLY,
+    QUARTERLY,
+    YEARLY,
+)
+
+# Calendar-based cycles start at local midnight on the first day of a block of months
+_MONTHS_PER_PERIOD = {MONTHLY: 1, BIMONTHLY: 2, QUARTERLY: 3, YEARLY: 12}
+
+
+def period_start(
+    meter_type: str, now: datetime, offset: timedelta = DEFAULT_OFFSET
+) -> datetime:
+    """Return the start of the ``meter_type`` period containing ``now``."""
+    local = dt_util.as_local(now) - offset
+
+    if meter_type == QUARTER_HOURLY:
+        start = local.replace(
+            minute=local.minute - local.minute % 15, second=0, microsecond=0
+        )
+    elif meter_type == HOURLY:
+        start = local.replace(minute=0, second=0, microsecond=0)
+    elif meter_type == DAILY:
+        start = dt_util.start_of_local_day(local)
+    elif meter_type == WEEKLY:
+        start = dt_util.start_of_local_day(
+            local.date() - timedelta(days=local.weekday())
+        )
+    elif meter_type in _MONTHS_PER_PERIOD:
+        months = _MONTHS_PER_PERIOD[meter_type]
+        month = local.month - (local.month - 1) % months
+        start = dt_util.start_of_local_day(local.date().replace(month=month, day=1))
+    else:
+        raise ValueError(f"Unsupported meter type: {meter_type}")
+
+    return start + offset
+
+
+def next_period_start(
+    meter_type: str, now: datetime, offset: timedelta = DEFAULT_OFFSET
+) -> datetime:
+    """Return when the ``meter_type`` period containing ``now`` ends."""
+    start = period_start(meter_type, now, offset) - offset
+
+    if meter_type == QUARTER_HOURLY:
+        # Fixed-length periods are added in UTC so DST changes do not skew them
+        end = dt_util.as_local(dt_util.as_utc(start) + timedelta(minutes=15))
+    elif meter_type == HOURLY:
+        end = dt_util.as_local(dt_util.as_utc(start) + timedelta(hours=1))
+    elif meter_type == DAILY:
+        end = dt_util.start_of_local_day(start.date() + timedelta(days=1))
+    elif meter_type == WEEKLY:
+        end = dt_util.start_of_local_day(start.date() + timedelta(days=7))
+    else:
+        month_index = start.month - 1 + _MONTHS_PER_PERIOD[meter_type]
+        end = dt_util.start_of_local_day(
+            start.date().replace(
+                year=start.year + month_index // 12, month=month_index % 12 + 1
+            )
+        )
+
+    return end + offset
+
+
+GroupKey = tuple[str, timedelta]
+
+
+class MeterResetScheduler:
+    """Reset the utility meters of all proxies in per-boundary batches.
+
+    Engines are grouped by ``(meter_type, offset)``. Each group is scheduled for
+    its next period boundary and groups sharing a boundary (e.g. daily, monthly
+    and yearly at midnight on January 1st) share one timer. When a timer fires,
+    every cycle of every group is reset first and the affected engines are
+    written afterwards in a single pass.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._groups: dict[GroupKey, dict[UtilityMeterEngine, None]] = {}
+        self._group_boundary: dict[GroupKey, datetime] = {}
+        self._boundaries: dict[datetime, dict[GroupKey, None]] = {}
+        self._timers: dict[datetime, CALLBACK_TYPE] = {}
+        self.last_batch: dict[str, Any] | None = None
+
+    @property
+    def timer_count(self) -> int:
+        """Return the number of armed boundary timers."""
+        return len(self._timers)
+
+    @callback
+    def async_register(self, engine: UtilityMeterEngine) -> None:
+        """Reset every cycle of ``engine`` at its period boundaries."""
+        for meter_type in engine.meter_types:
+            key = (meter_type, engine.offset)
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = {}
+                self._async_schedule_group(key, dt_util.now())
+            group[engine] = None
+
+    @callback
+    def async_unregister(self, engine: UtilityMeterEngine) -> None:
+        """Stop resetting ``engine``; drop timers nobody needs anymore."""
+        for meter_type in engine.meter_types:
+            key = (meter_type, engine.offset)
+            group = self._groups.get(key)
+            if group is None:
+                continue
+            group.pop(engine, None)
+            if not group:
+                del self._groups[key]
+                self._async_unschedule_group(key)
+
+    @callback
+    def _async_schedule_group(self, key: GroupKey, now: datetime) -> None:
+        meter_type, offset = key
+        boundary = next_period_start(meter_type, now, offset)
+        self._group_boundary[key] = boundary
+        groups = self._boundaries.get(boundary)
+        if groups is None:
+            groups = self._boundaries[boundary] = {}
+            self._timers[boundary] = async_track_point_in_time(
+                self._hass, partial(self._async_reset_boundary, boundary), boundary
+            )
+        groups[key] = None
+
+    @callback
+    def _async_unschedule_group(self, key: GroupKey) -> None:
+        boundary = self._group_boundary.pop(key, None)
+        if boundary is None:
+            return
+        groups = self._boundaries[boundary]
+        groups.pop(key, None)
+        if not groups:
+            del self._boundaries[boundary]
+            self._timers.pop(boundary)()
+
+    @callback
+    def _async_reset_boundary(self, boundary: datetime, _now: datetime) -> None:
+        start = time.perf_counter()
+        self._timers.pop(boundary, None)
+
+        touched: dict[UtilityMeterEngine, None] = {}
+        groups = self._boundaries.pop(boundary, {})
+        cycles_reset = 0
+        for key in groups:
+            del self._group_boundary[key]
+            meter_type, offset = key
+            period = period_start(meter_type, boundary, offset)
+            for engine in self._groups[key]:
+                if engine.async_reset_cycle(meter_type, period):
+                    cycles_reset += 1
+                touched[engine] = None
+            self._async_schedule_group(key, boundary)
+
+        # One coalesced write pass after all cycles were reset
+        for engine in touched:
+            engine.async_write_entities()
+
+        duration = time.perf_counter() - start
+        self.last_batch = {
+            "boundary": boundary.isoformat(),
+            "groups": len(groups),
+            "engines": len(touched),
+            "cycles": cycles_reset,
+            "duration_ms": round(duration * 1000, 3),
+        }
+        _LOGGER.debug(
+            "Reset %d utility meter cycle(s) of %d proxies in %d group(s) in %.1f ms",
+            cycles_reset,
+            len(touched),
+            len(groups),
+            duration * 1000,
+        )
+
+
+@callback
+def async_get_reset_scheduler(hass: HomeAssistant) -> MeterResetScheduler:
+    """Return the integration-wide reset scheduler, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler = domain_data.get(DATA_RESET_SCHEDULER)
+    if scheduler is None:
+        scheduler = domain_data[DATA_RESET_SCHEDULER] = MeterResetScheduler(hass)
+    return scheduler
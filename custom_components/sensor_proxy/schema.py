@@ -6,14 +6,193 @@ import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID
 
+from .aggregate import AGGREGATE_FUNCTIONS
+from .config import build_proxy_definitions, find_id_collisions
 from .const import (
+    CONF_AGGREGATE,
+    CONF_ATTRIBUTES_EXCLUDE,
+    CONF_ATTRIBUTES_INCLUDE,
+    CONF_BACKFILL_UTILITY_METERS,
     CONF_CREATE_UTILITY_METERS,
+    CONF_DEADBAND,
+    CONF_DEBOUNCE,
+    CONF_HOLD_DOWN,
+    CONF_MAX_HOLD_DOWN,
+    CONF_MIN_INTERVAL,
+    CONF_RECORDING,
+    CONF_SOURCES,
+    CONF_TRANSFORM,
     CONF_UTILITY_METER_TYPES,
+    CONF_WINDOW,
+    CONF_WINDOW_DURATION,
+    CONF_WINDOW_FUNCTION,
+    CONF_WINDOW_MAX_SAMPLES,
+    DEFAULT_WINDOW_MAX_SAMPLES,
+    MAX_WINDOW_SAMPLES,
+    RECORDING_POLICIES,
+    SENSORS_ALL,
 )
+from .naming import (
+    FIELD_CYCLE,
+    FIELD_DEVICE,
+    FIELD_SOURCE_OBJECT_ID,
+    FIELD_STAR,
+    FIELD_SUFFIX,
+    METER_FIELDS,
+    compile_base_template,
+    compile_template,
+)
+from .transform import (
+    CONVERTIBLE_UNITS,
+    TRANSFORM_CONVERT,
+    TRANSFORM_OFFSET,
+    TRANSFORM_ROUND,
+    TRANSFORM_SCALE,
+    TRANSFORM_STEPS,
+)
+from .window import WINDOW_FUNCTIONS
 
 __all__ = ["PLATFORM_SCHEMA"]
 
 
+def deadband(value):
+    """Validate a deadband given as an absolute number or a percentage like '5%'."""
+    raw = value.strip() if isinstance(value, str) else value
+    percent = isinstance(raw, str) and raw.endswith("%")
+    number = vol.Coerce(float)(raw[:-1] if percent else raw)
+    if number < 0:
+        raise vol.Invalid("deadband must not be negative")
+    return f"{number}%" if percent else number
+
+
+def entity_id_pattern(value):
+    """Validate an entity-id glob such as "sensor.meter_*_energy"."""
+    value = cv.string(value)
+    if "." not in value or not any(char in value for char in "*?["):
+        raise vol.Invalid('expected an entity id pattern like "sensor.meter_*_energy"')
+    return value
+
+
+def name_template(allowed: frozenset[str]):
+    """Return a validator for a name template using only ``allowed`` placeholders."""
+
+    def _validate(value):
+        value = cv.string(value)
+        try:
+            compile_template(value, allowed)
+        except ValueError as err:
+            raise vol.Invalid(str(err)) from err
+        return value
+
+    return _validate
+
+
+def base_template(value):
+    """Validate a `name_base` / `unique_id_base`, with or without placeholders."""
+    value = cv.string(value)
+    try:
+        template = compile_base_template(value)
+    except ValueError as err:
+        raise vol.Invalid(str(err)) from err
+    if not template.fields & {FIELD_SUFFIX, FIELD_SOURCE_OBJECT_ID}:
+        raise vol.Invalid(
+            f"{value!r} must contain {{{FIELD_SUFFIX}}} or "
+            f"{{{FIELD_SOURCE_OBJECT_ID}}} to tell the proxies apart"
+        )
+    return value
+
+
+# Utility meter templates; aggregates have no suffix or single source
+meter_template = name_template(METER_FIELDS)
+aggregate_meter_template = name_template(
+    frozenset((FIELD_STAR, FIELD_CYCLE, FIELD_DEVICE))
+)
+
+
+def recording_policy(value):
+    """Validate a recorder policy; excluding a proxy is up to the recorder itself."""
+    value = cv.string(value)
+    if value == "none":
+        raise vol.Invalid(
+            "recording: none is not supported, add the proxy to the recorder's "
+            "`exclude` option instead"
+        )
+    return vol.In(RECORDING_POLICIES)(value)
+
+
+def sensors_pattern(value):
+    """Validate a wildcard `sensors` value: "*" or an entity-id glob."""
+    if value == SENSORS_ALL:
+        return value
+    return entity_id_pattern(value)
+
+
+# Options limiting how often a proxy writes its state
+UPDATE_RATE_SCHEMA = {
+    vol.Optional(CONF_MIN_INTERVAL): cv.positive_time_period,
+    vol.Optional(CONF_DEBOUNCE): cv.positive_time_period,
+    vol.Optional(CONF_DEADBAND): deadband,
+}
+
+# Options delaying and damping unavailability of a flapping source
+HOLD_DOWN_SCHEMA = {
+    vol.Optional(CONF_HOLD_DOWN): cv.positive_time_period,
+    vol.Optional(CONF_MAX_HOLD_DOWN): cv.positive_time_period,
+}
+
+# Recorder policy of a proxy; also accepted globally under `sensor_proxy:`
+RECORDING_SCHEMA = {
+    vol.Optional(CONF_RECORDING): recording_policy,
+}
+
+# Options selecting which source attributes a proxy mirrors
+ATTRIBUTE_FILTER_SCHEMA = {
+    vol.Optional(CONF_ATTRIBUTES_INCLUDE): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(CONF_ATTRIBUTES_EXCLUDE): vol.All(cv.ensure_list, [cv.string]),
+}
+
+
+TRANSFORM_STEP_SCHEMA = vol.Schema(
+    {
+        vol.Optional(TRANSFORM_SCALE): vol.Coerce(float),
+        vol.Optional(TRANSFORM_OFFSET): vol.Coerce(float),
+        vol.Optional(TRANSFORM_CONVERT): vol.In(sorted(CONVERTIBLE_UNITS)),
+        vol.Optional(TRANSFORM_ROUND): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=10)
+        ),
+    }
+)
+
+
+def transform_step(value):
+    """Validate one transform step, a single-key mapping like {scale: 0.001}."""
+    if not isinstance(value, dict) or len(value) != 1:
+        raise vol.Invalid(
+            f"each transform step must be one of {', '.join(TRANSFORM_STEPS)}"
+        )
+    return TRANSFORM_STEP_SCHEMA(value)
+
+
+# Optional numeric transform chain applied to the mirrored value
+TRANSFORM_SCHEMA = {
+    vol.Optional(CONF_TRANSFORM): vol.All(
+        cv.ensure_list, [transform_step], vol.Length(min=1)
+    ),
+}
+
+# Optional windowed statistic replacing the mirrored value
+WINDOW_SCHEMA = {
+    vol.Optional(CONF_WINDOW): vol.Schema(
+        {
+            vol.Required(CONF_WINDOW_FUNCTION): vol.In(WINDOW_FUNCTIONS),
+            vol.Optional(CONF_WINDOW_DURATION): cv.positive_time_period,
+            vol.Optional(
+                CONF_WINDOW_MAX_SAMPLES, default=DEFAULT_WINDOW_MAX_SAMPLES
+            ): vol.All(vol.Coerce(int), vol.Range(min=2, max=MAX_WINDOW_SAMPLES)),
+        }
+    ),
+}
+
 # Schema for individual sensors in multi-entity configuration
 SENSOR_ITEM_SCHEMA = vol.Schema(
     {
@@ -23,8 +202,15 @@ SENSOR_ITEM_SCHEMA = vol.Schema(
         vol.Optional(CONF_UNIQUE_ID): cv.string,
         vol.Optional(CONF_CREATE_UTILITY_METERS): cv.boolean,
         vol.Optional(CONF_UTILITY_METER_TYPES): vol.All(cv.ensure_list, [cv.string]),
-        vol.Optional("utility_name_template"): cv.string,
-        vol.Optional("utility_unique_id_template"): cv.string,
+        vol.Optional(CONF_BACKFILL_UTILITY_METERS): cv.boolean,
+        vol.Optional("utility_name_template"): meter_template,
+        vol.Optional("utility_unique_id_template"): meter_template,
+        **UPDATE_RATE_SCHEMA,
+        **HOLD_DOWN_SCHEMA,
+        **RECORDING_SCHEMA,
+        **ATTRIBUTE_FILTER_SCHEMA,
+        **TRANSFORM_SCHEMA,
+        **WINDOW_SCHEMA,
     }
 )
 
@@ -36,32 +222,75 @@ SINGLE_ENTITY_SCHEMA = {
     vol.Optional("device_id"): cv.string,
     vol.Optional(CONF_CREATE_UTILITY_METERS): cv.boolean,
     vol.Optional(CONF_UTILITY_METER_TYPES): vol.All(cv.ensure_list, [cv.string]),
-    vol.Optional("utility_name_template"): cv.string,
-    vol.Optional("utility_unique_id_template"): cv.string,
+    vol.Optional(CONF_BACKFILL_UTILITY_METERS): cv.boolean,
+    vol.Optional("utility_name_template"): meter_template,
+    vol.Optional("utility_unique_id_template"): meter_template,
+    **UPDATE_RATE_SCHEMA,
+    **HOLD_DOWN_SCHEMA,
+    **RECORDING_SCHEMA,
+    **ATTRIBUTE_FILTER_SCHEMA,
+    **TRANSFORM_SCHEMA,
+    **WINDOW_SCHEMA,
 }
 
 # Multi-entity schema (new compact format)
 MULTI_ENTITY_SCHEMA = {
     vol.Required("source_base"): cv.string,
-    vol.Optional("name_base"): cv.string,
-    vol.Optional("unique_id_base"): cv.string,
+    vol.Optional("name_base"): base_template,
+    vol.Optional("unique_id_base"): base_template,
     vol.Optional("device_id"): cv.string,
-    vol.Required("sensors"): vol.All(cv.ensure_list, [SENSOR_ITEM_SCHEMA]),
+    vol.Required("sensors"): vol.Any(
+        sensors_pattern, vol.All(cv.ensure_list, [SENSOR_ITEM_SCHEMA])
+    ),
+    **ATTRIBUTE_FILTER_SCHEMA,
+}
+
+
+# Aggregate schema: one proxy combining many sources
+AGGREGATE_SCHEMA = {
+    vol.Required(CONF_AGGREGATE): vol.In(AGGREGATE_FUNCTIONS),
+    vol.Required(CONF_SOURCES): vol.Any(
+        entity_id_pattern, vol.All(cv.ensure_list, [cv.entity_id], vol.Length(min=1))
+    ),
+    vol.Optional(CONF_UNIQUE_ID): cv.string,
+    vol.Optional(CONF_NAME): cv.string,
+    vol.Optional("device_id"): cv.string,
+    vol.Optional(CONF_CREATE_UTILITY_METERS): cv.boolean,
+    vol.Optional(CONF_UTILITY_METER_TYPES): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("utility_name_template"): aggregate_meter_template,
+    vol.Optional("utility_unique_id_template"): aggregate_meter_template,
+    **UPDATE_RATE_SCHEMA,
+    **RECORDING_SCHEMA,
 }
 
 
 def validate_platform_schema(config):
-    """Validate that exactly one of the two formats is used."""
+    """Validate that exactly one of the three formats is used."""
     has_single = "source_entity_id" in config
     has_multi = "source_base" in config
 
+    if CONF_AGGREGATE in config:
+        if has_single or has_multi:
+            raise vol.Invalid(
+                "'aggregate' uses 'sources' instead of 'source_entity_id' or 'source_base'"
+            )
+        validated_config = vol.Schema(AGGREGATE_SCHEMA, extra=vol.ALLOW_EXTRA)(config)
+        if not validated_config.get(CONF_NAME) and not validated_config.get(
+            CONF_UNIQUE_ID
+        ):
+            raise vol.Invalid(
+                "Must provide at least 'name' or 'unique_id' (preferably both) for aggregate configuration"
+            )
+        return validated_config
+
     if has_single and has_multi:
         raise vol.Invalid(
             "Cannot use both 'source_entity_id' and 'source_base' in the same config"
         )
     if not has_single and not has_multi:
         raise vol.Invalid(
-            "Must provide either 'source_entity_id' (single entity) or 'source_base' (multi-entity)"
+            "Must provide either 'source_entity_id' (single entity), 'source_base' "
+            "(multi-entity) or 'aggregate' with 'sources'"
         )
 
     if has_single:
@@ -90,4 +319,55 @@ def validate_platform_schema(config):
         return validated_config
 
 
-PLATFORM_SCHEMA = vol.Schema(validate_platform_schema)
+def _items(config) -> list:
+    """Return a validated block and its `sensors` items."""
+    items = config.get("sensors")
+    return [config, *items] if isinstance(items, list) else [config]
+
+
+def _templates(config) -> list[str]:
+    """Return the name templates of a validated block."""
+    return [
+        template
+        for item in _items(config)
+        for key in ("utility_name_template", "utility_unique_id_template")
+        if (template := item.get(key)) is not None
+    ]
+
+
+def validate_hold_down(config):
+    """Reject a `max_hold_down` without, or shorter than, its `hold_down`."""
+    for item in _items(config):
+        if (max_hold_down := item.get(CONF_MAX_HOLD_DOWN)) is None:
+            continue
+        hold_down = item.get(CONF_HOLD_DOWN)
+        if hold_down is None:
+            raise vol.Invalid(f"'{CONF_MAX_HOLD_DOWN}' requires '{CONF_HOLD_DOWN}'")
+        if max_hold_down < hold_down:
+            raise vol.Invalid(
+                f"'{CONF_MAX_HOLD_DOWN}' must not be shorter than '{CONF_HOLD_DOWN}'"
+            )
+    return config
+
+
+def validate_generated_ids(config):
+    """Reject a block whose generated names or unique ids collide."""
+    if not config.get("device_id"):
+        bases = [config.get("name_base"), config.get("unique_id_base")]
+        if any(
+            FIELD_DEVICE in compile_template(template).fields
+            for template in _templates(config)
+        ) or any(
+            base and FIELD_DEVICE in compile_base_template(base).fields
+            for base in bases
+        ):
+            raise vol.Invalid(f"{{{FIELD_DEVICE}}} requires 'device_id'")
+    # Wildcard blocks expand to nothing here; their ids differ by source
+    if collisions := find_id_collisions(build_proxy_definitions(config)):
+        raise vol.Invalid(f"generated ids collide: {', '.join(collisions)}")
+    return config
+
+
+PLATFORM_SCHEMA = vol.All(
+    validate_platform_schema, validate_hold_down, validate_generated_ids
+)
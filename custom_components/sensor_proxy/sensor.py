@@ -1,12 +1,25 @@
 import logging
 from typing import Any, Callable
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID
+from homeassistant.const import CONF_UNIQUE_ID
 from homeassistant.core import HomeAssistant
-
-from .proxy_sensor import SensorProxySensor
-from .schema import PLATFORM_SCHEMA  # noqa: F401 - re-exported for HA
+from homeassistant.helpers.entity_platform import async_get_current_platform
+
+from .config import ProxyDefinition, build_proxy_definitions
+from .const import CONF_DIAGNOSTICS, CONF_MANAGED
+from .id_index import async_get_id_index
+from .managed import async_get_managed_proxies
+from .naming import async_device_slug_resolver
+from .reload import (
+    async_track_yaml_proxies,
+    async_watch_pattern_block,
+    create_proxy_entity,
+)
+from .schema import PLATFORM_SCHEMA
+from .source_index import async_get_source_index
+from .stats_sensor import ProxyStatsSensor
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,85 +31,35 @@ async def async_setup_platform(
     discovery_info: Any = None,
 ) -> None:
     """Set up proxy sensors."""
-    device_id = config.get("device_id")
-
-    entities = []
-
-    # Check which configuration format is being used
-    if "source_entity_id" in config:
-        # Single entity configuration (legacy format)
-        source_entity_id = config["source_entity_id"]
-        new_unique_id = config.get(CONF_UNIQUE_ID)
-        name = config.get(CONF_NAME)
-        # Pass explicit value if set, otherwise None to use global default
-        create_utility_meters = config.get("create_utility_meters")
-        utility_meter_types = config.get("utility_meter_types")
-        entities.append(
-            SensorProxySensor(
-                hass,
-                name,
-                source_entity_id,
-                new_unique_id,
-                device_id,
-                create_utility_meters=create_utility_meters,
-                utility_meter_types=utility_meter_types,
-                utility_name_template=config.get("utility_name_template"),
-                utility_unique_id_template=config.get("utility_unique_id_template"),
-            )
-        )
-    elif "source_base" in config:
-        # Multi-entity configuration (new compact format)
-        source_base = config["source_base"]
-        name_base = config.get("name_base")
-        unique_id_base = config.get("unique_id_base")
-        sensors_list = config["sensors"]
-
-        for sensor_config in sensors_list:
-            suffix = sensor_config["suffix"]
-
-            # Use explicit source_entity_id if provided, otherwise build from base + suffix
-            source_entity_id = sensor_config.get(
-                "source_entity_id", f"{source_base}_{suffix}"
-            )
-
-            # Use per-sensor name if provided, otherwise generate from name_base if available
-            if CONF_NAME in sensor_config:
-                name = sensor_config[CONF_NAME]
-            elif name_base:
-                name = f"{name_base}_{suffix}"
-            else:
-                name = None
-
-            # Use per-sensor unique_id if provided, otherwise generate from unique_id_base
-            if CONF_UNIQUE_ID in sensor_config:
-                new_unique_id = sensor_config[CONF_UNIQUE_ID]
-            elif unique_id_base:
-                new_unique_id = f"{unique_id_base}_{suffix}"
-            else:
-                new_unique_id = None
-
-            # Pass explicit value if set in sensor config, otherwise None
-            create_utility_meters = sensor_config.get("create_utility_meters")
-            utility_meter_types = sensor_config.get("utility_meter_types")
-
-            entities.append(
-                SensorProxySensor(
-                    hass,
-                    name,
-                    source_entity_id,
-                    new_unique_id,
-                    device_id,
-                    create_utility_meters=create_utility_meters,
-                    utility_meter_types=utility_meter_types,
-                    utility_name_template=sensor_config.get("utility_name_template"),
-                    utility_unique_id_template=sensor_config.get(
-                        "utility_unique_id_template"
-                    ),
-                )
+    if discovery_info is not None:
+        # Loaded by async_setup when `sensor_proxy: diagnostics: true` is set
+        if discovery_info.get(CONF_DIAGNOSTICS):
+            async_add_entities([ProxyStatsSensor(hass)])
+        # Loaded by async_setup for proxies created by service
+        if discovery_info.get(CONF_MANAGED):
+            await async_get_managed_proxies(hass).async_setup_platform(
+                async_get_current_platform()
             )
-
-    if entities:
-        async_add_entities(entities)
+        return
+
+    definitions = build_proxy_definitions(
+        config,
+        async_get_source_index(hass).async_match,
+        async_device_slug_resolver(hass),
+    )
+    # Ids already used by other blocks, services or config entries are rejected
+    proxies = [
+        (definition, create_proxy_entity(hass, definition))
+        for definition in async_get_id_index(hass).async_claim(definitions, "YAML")
+    ]
+    # Wildcard blocks also get proxies for matching sources added later
+    async_watch_pattern_block(hass, config, async_add_entities)
+    if not proxies:
+        return
+
+    # Remember YAML proxies so `sensor_proxy.reload` can diff against them
+    async_track_yaml_proxies(hass, proxies)
+    async_add_entities([proxy for _, proxy in proxies])
 
 
 async def async_setup_entry(
@@ -104,15 +67,37 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: Callable[[list], None],
 ) -> None:
-    """Set up a sensor proxy from a config entry (UI).
+    """Set up a sensor proxy, or a whole multi-entity block, from a config entry (UI).
 
-    This keeps YAML and UI setup working side-by-side.
+    This keeps YAML and UI setup working side-by-side. Block entries are
+    stored in the YAML ``source_base`` format; all their proxies are added in
+    one ``async_add_entities`` call.
     """
     data = entry.data
-    source_entity_id = data["source_entity_id"]
-    name = data["name"]
-    unique_id = data.get(CONF_UNIQUE_ID, entry.entry_id)
-    device_id = data.get("device_id")
-
-    entities = [SensorProxySensor(hass, name, source_entity_id, unique_id, device_id)]
-    async_add_entities(entities)
+    if "source_base" in data:
+        try:
+            config = PLATFORM_SCHEMA(dict(data))
+        except vol.Invalid as err:
+            _LOGGER.error("Invalid sensor_proxy config entry %s: %s", entry.title, err)
+            return
+        definitions = build_proxy_definitions(
+            config, device_slug=async_device_slug_resolver(hass)
+        )
+    else:
+        definitions = [
+            ProxyDefinition(
+                name=data["name"],
+                source_entity_id=data["source_entity_id"],
+                unique_id=data.get(CONF_UNIQUE_ID, entry.entry_id),
+                device_id=data.get("device_id"),
+            )
+        ]
+    id_index = async_get_id_index(hass)
+    definitions = id_index.async_claim(definitions, f"config entry {entry.title}")
+    if not definitions:
+        return
+    keys = [definition.key for definition in definitions]
+    entry.async_on_unload(lambda: id_index.async_release(keys))
+    async_add_entities(
+        [create_proxy_entity(hass, definition) for definition in definitions]
+    )
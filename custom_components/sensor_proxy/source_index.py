@@ -0,0 +1,182 @@
+"""Indexed entity-id pattern matching for wildcard multi-entity blocks."""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import re
+from bisect import bisect_left, insort
+from functools import partial
+from typing import Callable
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import entity_sources
+
+from .const import DATA_SOURCE_INDEX, DOMAIN
+
+__all__ = ["SourceIndex", "async_get_source_index", "literal_prefix"]
+
+_LOGGER = logging.getLogger(__name__)
+
+PatternListener = Callable[[str], None]
+
+_WILDCARDS = re.compile(r"[*?\[]")
+
+
+def literal_prefix(pattern: str) -> str:
+    """Return the part of a glob pattern before its first wildcard."""
+    match = _WILDCARDS.search(pattern)
+    return pattern if match is None else pattern[: match.start()]
+
+
+class _Pattern:
+    """A compiled glob pattern and its literal prefix."""
+
+    __slots__ = ("pattern", "prefix", "match")
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.prefix = literal_prefix(pattern)
+        self.match = re.compile(fnmatch.translate(pattern)).match
+
+
+class SourceIndex:
+    """Sorted entity-id index answering glob patterns by prefix range.
+
+    Entity ids from the state machine and the entity registry are kept in one
+    sorted list, built once on first use. A pattern such as
+    ``sensor.refoss_*_energy`` is answered by bisecting to its literal prefix
+    (``sensor.refoss_``) and only testing the ids in that range. Entities that
+    appear later (registry ``create`` or first state) are inserted in place and
+    reported to the watchers whose pattern they match. Entities of this
+    integration (proxies and their meters) are never matched.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entity_registry = er.async_get(hass)
+        self._entity_sources = entity_sources(hass)
+        self._known: set[str] = set(hass.states.async_entity_ids())
+        self._known.update(
+            entry.entity_id
+            for entry in self._entity_registry.entities.values()
+            if entry.disabled_by is None
+        )
+        self._entity_ids = sorted(self._known)
+        self._watchers: dict[_Pattern, PatternListener] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    def __len__(self) -> int:
+        return len(self._entity_ids)
+
+    @callback
+    def async_match(self, pattern: str) -> list[str]:
+        """Return the indexed entity ids matching ``pattern``, sorted."""
+        return self._async_match(_Pattern(pattern))
+
+    def _async_match(self, compiled: _Pattern) -> list[str]:
+        entity_ids = self._entity_ids
+        prefix = compiled.prefix
+        matches = []
+        for position in range(bisect_left(entity_ids, prefix), len(entity_ids)):
+            entity_id = entity_ids[position]
+            if not entity_id.startswith(prefix):
+                break
+            if compiled.match(entity_id) and not self._is_own(entity_id):
+                matches.append(entity_id)
+        return matches
+
+    @callback
+    def async_watch(self, pattern: str, listener: PatternListener) -> CALLBACK_TYPE:
+        """Call ``listener`` with every new entity id matching ``pattern``."""
+        compiled = _Pattern(pattern)
+        self._watchers[compiled] = listener
+        if not self._unsubs:
+            self._async_subscribe()
+        return partial(self._watchers.pop, compiled, None)
+
+    def _is_own(self, entity_id: str) -> bool:
+        if (info := self._entity_sources.get(entity_id)) is not None:
+            return info["domain"] == DOMAIN
+        entry = self._entity_registry.async_get(entity_id)
+        return entry is not None and entry.platform == DOMAIN
+
+    @callback
+    def _async_subscribe(self) -> None:
+        bus = self._hass.bus
+        self._unsubs = [
+            bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+                self._async_registry_updated,
+            ),
+            bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_state_added,
+                event_filter=self._async_filter_new_state,
+            ),
+        ]
+
+    @callback
+    def _async_filter_new_state(self, event_data: EventStateChangedData) -> bool:
+        return event_data["old_state"] is None and (
+            event_data["entity_id"] not in self._known
+        )
+
+    @callback
+    def _async_state_added(self, event: Event[EventStateChangedData]) -> None:
+        self._async_add(event.data["entity_id"])
+
+    @callback
+    def _async_registry_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        data = event.data
+        if data["action"] == "create":
+            self._async_add(data["entity_id"])
+        elif data["action"] == "remove":
+            self._async_remove(data["entity_id"])
+        elif "old_entity_id" in data:
+            self._async_remove(data["old_entity_id"])
+            self._async_add(data["entity_id"])
+
+    @callback
+    def _async_add(self, entity_id: str) -> None:
+        if entity_id in self._known:
+            return
+        self._known.add(entity_id)
+        insort(self._entity_ids, entity_id)
+        if not self._watchers or self._is_own(entity_id):
+            return
+        for compiled, listener in list(self._watchers.items()):
+            if entity_id.startswith(compiled.prefix) and compiled.match(entity_id):
+                _LOGGER.debug(
+                    "New source %s matches pattern %s", entity_id, compiled.pattern
+                )
+                listener(entity_id)
+
+    @callback
+    def _async_remove(self, entity_id: str) -> None:
+        if entity_id not in self._known:
+            return
+        self._known.discard(entity_id)
+        entity_ids = self._entity_ids
+        position = bisect_left(entity_ids, entity_id)
+        if position < len(entity_ids) and entity_ids[position] == entity_id:
+            del entity_ids[position]
+
+
+@callback
+def async_get_source_index(hass: HomeAssistant) -> SourceIndex:
+    """Return the integration-wide source index, building it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (index := domain_data.get(DATA_SOURCE_INDEX)) is None:
+        index = domain_data[DATA_SOURCE_INDEX] = SourceIndex(hass)
+    return index
@@ -0,0 +1,91 @@
+"""Persisted last-known proxy states for the Sensor Proxy integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_STATE_STORE, DOMAIN
+
+__all__ = ["ProxyStateStore", "ProxySnapshot", "async_get_state_store"]
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.states"
+# Snapshots of all proxies are written together at most this often (seconds)
+SAVE_DELAY = 30
+
+# value, unit_of_measurement, device_class, state_class, icon
+ProxySnapshot = tuple[Any, str | None, str | None, str | None, str | None]
+
+
+class ProxyStateStore:
+    """Keep the last mirrored state of every proxy in one storage file.
+
+    Proxies record a compact snapshot on every state write; the store only
+    marks itself dirty and schedules a single delayed save for all of them.
+    ``Store.async_delay_save`` also writes pending data on shutdown.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store: Store[dict[str, list[Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._snapshots: dict[str, list[Any]] = {}
+        # Entity ids restored or written since startup; only these are saved
+        self._active: set[str] = set()
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    async def async_load(self) -> None:
+        """Load the snapshots saved by the previous run."""
+        data = await self._store.async_load()
+        if isinstance(data, dict):
+            self._snapshots = data
+        _LOGGER.debug("Loaded %d proxy state snapshot(s)", len(self._snapshots))
+
+    @callback
+    def async_restore(self, entity_id: str) -> ProxySnapshot | None:
+        """Return the saved snapshot of ``entity_id``, if any."""
+        self._active.add(entity_id)
+        snapshot = self._snapshots.get(entity_id)
+        if snapshot is None or len(snapshot) != 5:
+            return None
+        return tuple(snapshot)
+
+    @callback
+    def async_record(self, entity_id: str, snapshot: ProxySnapshot) -> None:
+        """Remember ``snapshot`` as the last state of ``entity_id``."""
+        self._snapshots[entity_id] = list(snapshot)
+        self._active.add(entity_id)
+        if not self._dirty:
+            self._dirty = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, list[Any]]:
+        self._dirty = False
+        if self._hass.is_running:
+            # Drop snapshots of proxies that no longer exist
+            self._snapshots = {
+                entity_id: snapshot
+                for entity_id, snapshot in self._snapshots.items()
+                if entity_id in self._active
+            }
+        return self._snapshots
+
+
+@callback
+def async_get_state_store(hass: HomeAssistant) -> ProxyStateStore:
+    """Return the integration-wide state store (loaded in ``async_setup``)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (store := domain_data.get(DATA_STATE_STORE)) is None:
+        store = domain_data[DATA_STATE_STORE] = ProxyStateStore(hass)
+    return store
@@ -0,0 +1,151 @@
+"""Performance counters for the Sensor Proxy integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_STATS, DATA_WRITE_STATS, DOMAIN
+
+__all__ = [
+    "HISTOGRAM_BOUNDS_US",
+    "ProxyStats",
+    "StatsCollector",
+    "async_get_stats",
+]
+
+# Upper bounds (microseconds) of the callback-time buckets; one overflow bucket follows
+HISTOGRAM_BOUNDS_US = (10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+
+# Integration-wide totals; kept in hass.data[DOMAIN]["write_stats"] as well
+TOTAL_KEYS = (
+    "events",
+    "written",
+    "suppressed",
+    "throttled",
+    "meters_created",
+    "flaps",
+    "flaps_absorbed",
+)
+
+
+class ProxyStats:
+    """Counters of one proxy; plain attribute increments on the hot path."""
+
+    __slots__ = (
+        "events",
+        "written",
+        "suppressed",
+        "throttled",
+        "meters_created",
+        "flaps",
+        "flaps_absorbed",
+        "last_event_lag_ms",
+        "callback_histogram",
+    )
+
+    def __init__(self) -> None:
+        self.events = 0
+        self.written = 0
+        self.suppressed = 0
+        self.throttled = 0
+        self.meters_created = 0
+        # Source outages while available, and those ended within the hold-down
+        self.flaps = 0
+        self.flaps_absorbed = 0
+        # Only filled while timing is enabled
+        self.last_event_lag_ms: float | None = None
+        self.callback_histogram = [0] * (len(HISTOGRAM_BOUNDS_US) + 1)
+
+    def record_callback(self, duration_us: float) -> None:
+        """Count one source callback that took ``duration_us``."""
+        self.callback_histogram[bisect_left(HISTOGRAM_BOUNDS_US, duration_us)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "events": self.events,
+            "written": self.written,
+            "suppressed": self.suppressed,
+            "throttled": self.throttled,
+            "meters_created": self.meters_created,
+            "flaps": self.flaps,
+            "flaps_absorbed": self.flaps_absorbed,
+            "last_event_lag_ms": self.last_event_lag_ms,
+            "callback_histogram_us": _histogram_dict(self.callback_histogram),
+        }
+
+
+def _histogram_dict(buckets: list[int]) -> dict[str, int]:
+    labels = [f"<={bound}" for bound in HISTOGRAM_BOUNDS_US]
+    labels.append(f">{HISTOGRAM_BOUNDS_US[-1]}")
+    return dict(zip(labels, buckets))
+
+
+class StatsCollector:
+    """Integration-wide counters plus the per-proxy ``ProxyStats``.
+
+    Counting events and writes is always on and costs a few integer
+    increments. Callback timing and event lag need clock reads, so proxies
+    only measure them when ``timing`` is enabled (global ``diagnostics: true``).
+    """
+
+    def __init__(self, timing: bool = False) -> None:
+        self.timing = timing
+        self.totals: dict[str, int] = dict.fromkeys(TOTAL_KEYS, 0)
+        self._proxies: dict[str, ProxyStats] = {}
+
+    @property
+    def proxy_count(self) -> int:
+        return len(self._proxies)
+
+    @callback
+    def async_register(self, entity_id: str, stats: ProxyStats) -> None:
+        self._proxies[entity_id] = stats
+
+    @callback
+    def async_unregister(self, entity_id: str) -> None:
+        self._proxies.pop(entity_id, None)
+
+    def callback_histogram(self) -> dict[str, int]:
+        """Return the callback-time histogram summed over all proxies."""
+        buckets = [0] * (len(HISTOGRAM_BOUNDS_US) + 1)
+        for stats in self._proxies.values():
+            for index, count in enumerate(stats.callback_histogram):
+                buckets[index] += count
+        return _histogram_dict(buckets)
+
+    def as_dict(self, top: int = 20) -> dict[str, Any]:
+        """Return totals and the ``top`` proxies by events received and by flaps."""
+        busiest = sorted(
+            self._proxies.items(), key=lambda item: item[1].events, reverse=True
+        )[:top]
+        flapping = sorted(
+            (item for item in self._proxies.items() if item[1].flaps),
+            key=lambda item: item[1].flaps,
+            reverse=True,
+        )[:top]
+        return {
+            "timing_enabled": self.timing,
+            "proxies": len(self._proxies),
+            "totals": dict(self.totals),
+            "callback_histogram_us": self.callback_histogram(),
+            "busiest_proxies": {
+                entity_id: stats.as_dict() for entity_id, stats in busiest
+            },
+            "flapping_proxies": {
+                entity_id: {"flaps": stats.flaps, "absorbed": stats.flaps_absorbed}
+                for entity_id, stats in flapping
+            },
+        }
+
+
+@callback
+def async_get_stats(hass: HomeAssistant) -> StatsCollector:
+    """Return the integration-wide stats collector."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (collector := domain_data.get(DATA_STATS)) is None:
+        collector = domain_data[DATA_STATS] = StatsCollector()
+        domain_data[DATA_WRITE_STATS] = collector.totals
+    return collector
@@ -0,0 +1,58 @@
+"""Aggregate diagnostic sensor for the Sensor Proxy integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .stats import async_get_stats
+
+__all__ = ["ProxyStatsSensor"]
+
+# The sensor summarises counters; it does not need to follow every event
+UPDATE_INTERVAL = timedelta(seconds=60)
+
+
+class ProxyStatsSensor(SensorEntity):
+    """Events received by all proxies, with the other totals as attributes."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = "events"
+    _attr_icon = "mdi:chart-bar"
+    _attr_name = "Sensor Proxy statistics"
+    _attr_unique_id = "sensor_proxy_statistics"
+    _unrecorded_attributes = frozenset({"callback_histogram_us"})
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._collector = async_get_stats(hass)
+
+    @property
+    def native_value(self) -> int:
+        return self._collector.totals["events"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        collector = self._collector
+        return {
+            **{
+                key: value for key, value in collector.totals.items() if key != "events"
+            },
+            "proxies": collector.proxy_count,
+            "callback_histogram_us": collector.callback_histogram(),
+        }
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_track_time_interval(self.hass, self._async_refresh, UPDATE_INTERVAL)
+        )
+
+    @callback
+    def _async_refresh(self, _now) -> None:
+        self.async_write_ha_state()
@@ -0,0 +1,134 @@
+"""Write-rate limiting (throttle, debounce, deadband) for proxy sensors."""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from homeassistant.core import callback
+
+from .config import UpdateOptions
+from .const import DEADBAND_MAX_AGE
+from .timer_wheel import TimerWheel
+
+__all__ = ["UpdateThrottle"]
+
+
+def _as_float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class UpdateThrottle:
+    """Decide whether a proxy update is written now or flushed later.
+
+    * ``min_interval``: leading-and-trailing throttle; the first update is written
+      immediately, later ones within the interval are coalesced into one trailing
+      write at the end of the interval.
+    * ``debounce``: the write happens once the source was quiet for the delay.
+    * ``deadband``: numeric changes smaller than the band (absolute, or percent of
+      the last written value) are held back. They are still flushed after
+      ``DEADBAND_MAX_AGE`` seconds so the latest value is always written eventually.
+
+    Deferred writes run on the shared ``TimerWheel``; the throttle itself is its
+    key, so a proxy never holds more than one pending deadline.
+    """
+
+    __slots__ = (
+        "_wheel",
+        "_flush",
+        "_min_interval",
+        "_debounce",
+        "_deadband",
+        "_deadband_percent",
+        "_last_write",
+        "_last_number",
+        "_flush_at",
+    )
+
+    def __init__(
+        self,
+        wheel: TimerWheel,
+        options: UpdateOptions,
+        flush: Callable[[], None],
+    ) -> None:
+        self._wheel = wheel
+        self._flush = flush
+        self._min_interval = options.min_interval
+        self._debounce = options.debounce
+        self._deadband = options.deadband
+        self._deadband_percent = options.deadband_percent
+        self._last_write: float | None = None
+        self._last_number: float | None = None
+        self._flush_at: float | None = None
+
+    @property
+    def pending(self) -> bool:
+        """Return True while a deferred write is scheduled."""
+        return self._flush_at is not None
+
+    @callback
+    def async_should_write(self, value, available: bool) -> bool:
+        """Return True to write now; otherwise a trailing flush is scheduled."""
+        now = self._wheel.time()
+
+        if (
+            self._deadband is not None
+            and available
+            and self._last_number is not None
+            and (number := _as_float(value)) is not None
+        ):
+            band = self._deadband
+            if self._deadband_percent:
+                band = abs(self._last_number) * band / 100
+            if abs(number - self._last_number) < band:
+                self._async_flush_no_later_than(
+                    (self._last_write or now) + DEADBAND_MAX_AGE
+                )
+                return False
+
+        if self._debounce is not None:
+            self._async_flush_at(now + self._debounce)
+            return False
+
+        if self._min_interval is not None and self._last_write is not None:
+            due = self._last_write + self._min_interval
+            if self._flush_at is not None or now < due:
+                self._async_flush_no_later_than(due)
+                return False
+
+        return True
+
+    @callback
+    def async_record_write(self, value, available: bool) -> None:
+        """Remember what was written; any deferred write is now obsolete."""
+        self._last_write = self._wheel.time()
+        self._last_number = _as_float(value) if available else None
+        if self._flush_at is not None:
+            self.async_cancel()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop any deferred write (e.g. when the proxy is removed)."""
+        self._flush_at = None
+        self._wheel.async_cancel(self)
+
+    def _async_flush_at(self, when: float) -> None:
+        self._flush_at = when
+        self._wheel.async_schedule_at(self, when, self._async_fire)
+
+    def _async_flush_no_later_than(self, when: float) -> None:
+        if self._flush_at is None or when < self._flush_at:
+            self._async_flush_at(when)
+
+    @callback
+    def _async_fire(self) -> None:
+        self._flush_at = None
+        if self._min_interval is not None and self._last_write is not None:
+            # A debounced write still respects the minimum interval
+            due = self._last_write + self._min_interval
+            if due - self._wheel.time() > self._wheel.resolution:
+                self._async_flush_at(due)
+                return
+        self._flush()
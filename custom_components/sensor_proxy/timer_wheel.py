@@ -0,0 +1,165 @@
+"""Shared coarse-grained timer for per-proxy deadlines."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+from typing import Callable, Hashable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_TIMER_WHEEL, DOMAIN
+
+__all__ = ["TimerWheel", "async_get_timer_wheel"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Deadlines are rounded up to this many seconds so that bursts of proxies
+# scheduling at nearly the same time share one bucket and one wake-up.
+DEFAULT_RESOLUTION = 0.1
+
+
+class TimerWheel:
+    """Run many keyed deadlines from a single event loop timer.
+
+    Deadlines are grouped into buckets of ``resolution`` seconds. Only the
+    earliest bucket is armed on the loop, so thousands of proxies cost one
+    ``TimerHandle`` instead of one ``async_call_later`` handle each. Scheduling a
+    key again replaces its previous deadline; cancelling is O(1).
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, resolution: float = DEFAULT_RESOLUTION
+    ) -> None:
+        self._loop = hass.loop
+        self._resolution = resolution
+        self._buckets: dict[int, dict[Hashable, Callable[[], None]]] = {}
+        self._ticks: list[int] = []
+        self._scheduled: dict[Hashable, int] = {}
+        # Bucket whose actions are running, already taken out of `_buckets`
+        self._firing: dict[Hashable, Callable[[], None]] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._armed_tick: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    @property
+    def resolution(self) -> float:
+        """Return the bucket size in seconds."""
+        return self._resolution
+
+    def time(self) -> float:
+        """Return the monotonic clock used for deadlines."""
+        return self._loop.time()
+
+    @callback
+    def async_schedule_at(
+        self, key: Hashable, when: float, action: Callable[[], None]
+    ) -> None:
+        """Run ``action`` once at loop time ``when``, replacing any earlier schedule for ``key``."""
+        tick = math.ceil(when / self._resolution)
+        previous = self._scheduled.get(key)
+        if previous is not None and (previous != tick or tick not in self._buckets):
+            # Also when the key still waits in the bucket being fired
+            self._discard(key, previous)
+
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            bucket = self._buckets[tick] = {}
+            heapq.heappush(self._ticks, tick)
+        bucket[key] = action
+        self._scheduled[key] = tick
+        self._arm()
+
+    @callback
+    def async_schedule_later(
+        self, key: Hashable, delay: float, action: Callable[[], None]
+    ) -> None:
+        """Run ``action`` once after ``delay`` seconds."""
+        self.async_schedule_at(key, self._loop.time() + delay, action)
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Cancel the pending deadline for ``key``, if any."""
+        tick = self._scheduled.get(key)
+        if tick is not None:
+            self._discard(key, tick)
+            self._arm()
+
+    def scheduled_at(self, key: Hashable) -> float | None:
+        """Return the (bucketed) loop time ``key`` will fire at, or None."""
+        tick = self._scheduled.get(key)
+        return None if tick is None else tick * self._resolution
+
+    def _discard(self, key: Hashable, tick: int) -> None:
+        del self._scheduled[key]
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            # Cancelled or rescheduled by an earlier action of the firing bucket
+            del self._firing[key]
+            return
+        del bucket[key]
+        if not bucket:
+            # The tick stays in the heap and is skipped lazily
+            del self._buckets[tick]
+
+    def _arm(self) -> None:
+        ticks = self._ticks
+        while ticks and ticks[0] not in self._buckets:
+            heapq.heappop(ticks)
+
+        if not ticks:
+            if self._handle is not None:
+                self._handle.cancel()
+                self._handle = None
+                self._armed_tick = None
+            return
+
+        head = ticks[0]
+        if head == self._armed_tick:
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self._loop.call_at(head * self._resolution, self._async_fire)
+        self._armed_tick = head
+
+    @callback
+    def _async_fire(self) -> None:
+        # asyncio may run the handle up to one clock resolution early
+        due = max(
+            self._armed_tick or 0, math.floor(self._loop.time() / self._resolution)
+        )
+        self._handle = None
+        self._armed_tick = None
+
+        ticks = self._ticks
+        while ticks and ticks[0] <= due:
+            bucket = self._buckets.pop(heapq.heappop(ticks), None)
+            if not bucket:
+                continue
+            # Actions may cancel or reschedule keys later in the same bucket
+            self._firing = bucket
+            for key in list(bucket):
+                if (action := bucket.pop(key, None)) is None:
+                    continue
+                del self._scheduled[key]
+                try:
+                    action()
+                except Exception:
+                    _LOGGER.exception("Error running scheduled action for %s", key)
+            self._firing = {}
+
+        self._arm()
+
+
+@callback
+def async_get_timer_wheel(hass: HomeAssistant) -> TimerWheel:
+    """Return the integration-wide timer wheel, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    wheel = domain_data.get(DATA_TIMER_WHEEL)
+    if wheel is None:
+        wheel = domain_data[DATA_TIMER_WHEEL] = TimerWheel(hass)
+    return wheel
@@ -0,0 +1,150 @@
+"""Numeric transform chains (scale, offset, unit conversion, rounding) for proxies."""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Callable, Iterable, Sequence
+
+from homeassistant.components.sensor import UNIT_CONVERTERS
+from homeassistant.util.unit_conversion import BaseUnitConverter
+
+__all__ = [
+    "CONVERTIBLE_UNITS",
+    "TRANSFORM_STEPS",
+    "TransformChain",
+    "unit_converter",
+]
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSFORM_SCALE = "scale"
+TRANSFORM_OFFSET = "offset"
+TRANSFORM_CONVERT = "convert"
+TRANSFORM_ROUND = "round"
+TRANSFORM_STEPS = (
+    TRANSFORM_SCALE,
+    TRANSFORM_OFFSET,
+    TRANSFORM_CONVERT,
+    TRANSFORM_ROUND,
+)
+
+_CONVERTERS: tuple[type[BaseUnitConverter], ...] = tuple(
+    dict.fromkeys(UNIT_CONVERTERS.values())
+)
+
+# Target units accepted by a `convert` step
+CONVERTIBLE_UNITS = frozenset(
+    unit
+    for converter in _CONVERTERS
+    for unit in converter.VALID_UNITS
+    if isinstance(unit, str)
+)
+
+Step = tuple[str, Any]
+NumberFunction = Callable[[float], float]
+
+
+def unit_converter(from_unit: str | None, to_unit: str) -> NumberFunction | None:
+    """Return the Home Assistant conversion ``from_unit`` -> ``to_unit``, if any."""
+    for converter in _CONVERTERS:
+        units = converter.VALID_UNITS
+        if from_unit in units and to_unit in units:
+            return converter.converter_factory(from_unit, to_unit)
+    return None
+
+
+def _affine(scale: float, offset: float) -> NumberFunction:
+    if not offset:
+        return lambda value: value * scale
+    return lambda value: value * scale + offset
+
+
+def _rounding(decimals: int) -> NumberFunction:
+    if decimals:
+        return lambda value: round(value, decimals)
+    return lambda value: int(round(value))
+
+
+def _compose(functions: Sequence[NumberFunction]) -> NumberFunction:
+    if not functions:
+        return float
+    if len(functions) == 1:
+        return functions[0]
+
+    def chained(value: float) -> float:
+        for function in functions:
+            value = function(value)
+        return value
+
+    return chained
+
+
+class TransformChain:
+    """Ordered numeric steps applied to the source value of a proxy.
+
+    The steps are compiled into one plain function per source unit, the first
+    time that unit is seen: consecutive ``scale``/``offset`` steps fold into a
+    single multiply-add, and ``convert`` binds Home Assistant's unit converter
+    for that unit pair. Applying the chain is then one float parse and one call.
+    """
+
+    __slots__ = ("_steps", "_compiled", "decimals")
+
+    def __init__(self, steps: Iterable[Step]) -> None:
+        self._steps: tuple[Step, ...] = tuple(steps)
+        # Source unit -> (function, emitted unit); function None = not convertible
+        self._compiled: dict[str | None, tuple[NumberFunction | None, str | None]] = {}
+        # Decimals of the result when the chain ends with rounding
+        self.decimals: int | None = None
+        if self._steps and self._steps[-1][0] == TRANSFORM_ROUND:
+            self.decimals = self._steps[-1][1]
+
+    def apply(self, state: str, unit: str | None) -> tuple[Any, str | None]:
+        """Return the transformed value of ``state`` and the unit to emit.
+
+        The value is None when ``state`` is not numeric or ``unit`` cannot be
+        converted.
+        """
+        compiled = self._compiled.get(unit)
+        if compiled is None:
+            compiled = self._compiled[unit] = self._compile(unit)
+        function, emitted_unit = compiled
+        if function is None:
+            return None, emitted_unit
+        try:
+            number = float(state)
+        except ValueError:
+            return None, emitted_unit
+        if not math.isfinite(number):
+            return None, emitted_unit
+        return function(number), emitted_unit
+
+    def _compile(self, unit: str | None) -> tuple[NumberFunction | None, str | None]:
+        functions: list[NumberFunction] = []
+        scale, offset = 1.0, 0.0
+        for kind, argument in self._steps:
+            if kind == TRANSFORM_SCALE:
+                scale *= argument
+                offset *= argument
+                continue
+            if kind == TRANSFORM_OFFSET:
+                offset += argument
+                continue
+
+            if (scale, offset) != (1.0, 0.0):
+                functions.append(_affine(scale, offset))
+                scale, offset = 1.0, 0.0
+            if kind == TRANSFORM_ROUND:
+                functions.append(_rounding(argument))
+            elif argument != unit:
+                converter = unit_converter(unit, argument)
+                if converter is None:
+                    _LOGGER.warning("Cannot convert unit %s to %s", unit, argument)
+                    return None, unit
+                functions.append(converter)
+                unit = argument
+
+        if (scale, offset) != (1.0, 0.0):
+            functions.append(_affine(scale, offset))
+        return _compose(functions), unit
@@ -3,110 +3,340 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Tuple
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Any, Mapping, Sequence, Tuple
 
+from homeassistant.components.sensor import RestoreSensor, SensorStateClass
 from homeassistant.components.utility_meter import DEFAULT_OFFSET
-from homeassistant.components.utility_meter.sensor import UtilityMeterSensor
+from homeassistant.components.utility_meter.sensor import (
+    ATTR_LAST_PERIOD,
+    ATTR_LAST_VALID_STATE,
+    UtilitySensorExtraStoredData,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .reset_scheduler import (
+    SUPPORTED_METER_TYPES,
+    async_get_reset_scheduler,
+    period_start,
+)
 
 __all__ = [
+    "SUPPORTED_METER_TYPES",
+    "UtilityMeterEngine",
     "VirtualUtilityMeter",
-    "UTILITY_METER_ALLOWED_KWARGS",
     "build_virtual_meter_entity",
 ]
 
 _LOGGER = logging.getLogger(__name__)
 
-UTILITY_METER_ALLOWED_KWARGS = {
-    "hass",
-    "source_entity",
-    "name",
-    "meter_type",
-    "meter_offset",
-    "net_consumption",
-    "tariff",
-    "tariff_entity",
-    "parent_meter",
-    "delta_values",
-    "cron_pattern",
-    "periodically_resetting",
-    "sensor_always_available",
-    "unique_id",
-}
-
-
-class VirtualUtilityMeter(UtilityMeterSensor):
-    """Thin wrapper around UtilityMeterSensor to expose unique_id."""
-
-    def __init__(self, **kwargs: Any) -> None:
-        allowed_kwargs = {
-            key: value
-            for key, value in kwargs.items()
-            if key in UTILITY_METER_ALLOWED_KWARGS
+ATTR_SOURCE_ID = "source"
+ATTR_METER_PERIOD = "meter_period"
+ATTR_LAST_RESET = "last_reset"
+STATUS_COLLECTING = "collecting"
+
+
+def _as_decimal(value: Any) -> Decimal | None:
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+    return number if number.is_finite() else None
+
+
+class UtilityMeterEngine:
+    """Accumulate every meter cycle of one proxy from a single delta stream.
+
+    The proxy feeds each written state into ``async_update``; the engine turns
+    it into one delta and adds it to all cycle totals, which are kept in plain
+    lists indexed by cycle. Cycle entities (``VirtualUtilityMeter``) only read
+    from the engine, so a proxy with four cycles costs one update path and no
+    extra state listeners. Period resets come from the shared
+    ``MeterResetScheduler``.
+    """
+
+    __slots__ = (
+        "_hass",
+        "_parent_entity_id",
+        "_meter_types",
+        "_offset",
+        "_totals",
+        "_last_periods",
+        "_last_resets",
+        "_restored",
+        "_entities",
+        "_last_value",
+        "_unit",
+        "_scheduled",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        parent_entity_id: str,
+        meter_types: Sequence[str],
+        offset: timedelta = DEFAULT_OFFSET,
+    ) -> None:
+        now = dt_util.now()
+        self._hass = hass
+        self._parent_entity_id = parent_entity_id
+        self._meter_types = tuple(meter_types)
+        self._offset = offset
+        self._totals = [Decimal(0)] * len(self._meter_types)
+        self._last_periods = [Decimal(0)] * len(self._meter_types)
+        self._last_resets = [
+            period_start(meter_type, now, offset) for meter_type in self._meter_types
+        ]
+        # Cycles seeded from a previous run; the others may be backfilled
+        self._restored = [False] * len(self._meter_types)
+        self._entities: list[VirtualUtilityMeter | None] = [None] * len(
+            self._meter_types
+        )
+        self._last_value: Decimal | None = None
+        self._unit: str | None = None
+        self._scheduled = False
+
+    @property
+    def parent_entity_id(self) -> str:
+        return self._parent_entity_id
+
+    @property
+    def meter_types(self) -> tuple[str, ...]:
+        return self._meter_types
+
+    @property
+    def offset(self) -> timedelta:
+        return self._offset
+
+    @property
+    def unit(self) -> str | None:
+        return self._unit
+
+    @property
+    def last_value(self) -> Decimal | None:
+        return self._last_value
+
+    def total(self, index: int) -> Decimal:
+        return self._totals[index]
+
+    def last_period(self, index: int) -> Decimal:
+        return self._last_periods[index]
+
+    def last_reset(self, index: int) -> datetime:
+        return self._last_resets[index]
+
+    @callback
+    def async_attach(self, index: int, entity: VirtualUtilityMeter) -> None:
+        """Attach the entity exposing cycle ``index``."""
+        self._entities[index] = entity
+        if not self._scheduled:
+            async_get_reset_scheduler(self._hass).async_register(self)
+            self._scheduled = True
+
+    @callback
+    def async_detach(self, index: int) -> None:
+        """Detach the entity of cycle ``index``; stop resetting once none remain."""
+        self._entities[index] = None
+        if all(entity is None for entity in self._entities):
+            self.async_shutdown()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop taking part in scheduled resets."""
+        if self._scheduled:
+            async_get_reset_scheduler(self._hass).async_unregister(self)
+            self._scheduled = False
+
+    @callback
+    def async_restore(
+        self, index: int, data: UtilitySensorExtraStoredData | None
+    ) -> None:
+        """Seed cycle ``index`` from restored meter data."""
+        if data is None:
+            return
+        self._restored[index] = True
+        if (total := _as_decimal(data.native_value)) is not None:
+            self._totals[index] = total
+        self._last_periods[index] = data.last_period
+        if data.last_reset is not None:
+            self._last_resets[index] = data.last_reset
+        if self._last_value is None:
+            self._last_value = data.last_valid_state
+        if self._unit is None:
+            self._unit = data.native_unit_of_measurement
+
+        # Catch up with a reset that was due while Home Assistant was down
+        current = period_start(self._meter_types[index], dt_util.now(), self._offset)
+        if self._last_resets[index] < current:
+            self._async_reset_index(index, current)
+
+    def unrestored_meter_types(self) -> tuple[str, ...]:
+        """Return the cycles that started from zero instead of restored data."""
+        return tuple(
+            meter_type
+            for meter_type, restored in zip(self._meter_types, self._restored)
+            if not restored
+        )
+
+    @callback
+    def async_backfill(self, usage: Mapping[str, Decimal]) -> None:
+        """Add the usage before the meters existed to the unrestored cycles."""
+        for meter_type, total in usage.items():
+            index = self._meter_types.index(meter_type)
+            if not self._restored[index]:
+                self._totals[index] += total
+        self.async_write_entities()
+
+    @callback
+    def async_update(self, value: Any, unit: str | None) -> None:
+        """Add the delta between ``value`` and the previous value to all cycles."""
+        new_value = _as_decimal(value)
+        if new_value is None:
+            # Unavailable/unknown: keep the last valid value as reference
+            return
+        self._unit = unit
+
+        last_value, self._last_value = self._last_value, new_value
+        if last_value is None:
+            return
+        delta = new_value - last_value
+        if delta <= 0:
+            # A falling total (e.g. device reset) is not consumption
+            return
+
+        totals = self._totals
+        for index in range(len(totals)):
+            totals[index] += delta
+        self.async_write_entities()
+
+    @callback
+    def async_reset_cycle(self, meter_type: str, period: datetime) -> bool:
+        """Start ``period`` for the ``meter_type`` cycle; return False if already started.
+
+        The caller writes the entities afterwards, see ``async_write_entities``.
+        """
+        index = self._meter_types.index(meter_type)
+        if self._last_resets[index] >= period:
+            return False
+        self._async_reset_index(index, period)
+        return True
+
+    @callback
+    def async_write_entities(self) -> None:
+        """Write the state of every attached cycle entity."""
+        for entity in self._entities:
+            if entity is not None and entity.hass is not None:
+                entity.async_write_ha_state()
+
+    def _async_reset_index(self, index: int, period: datetime) -> None:
+        self._last_periods[index] = self._totals[index]
+        self._totals[index] = Decimal(0)
+        self._last_resets[index] = period
+
+
+class VirtualUtilityMeter(RestoreSensor):
+    """One cycle of a ``UtilityMeterEngine``; it has no listener of its own."""
+
+    _attr_should_poll = False
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    # Utility meters are totalizing sensors; to avoid home assistant warnings about
+    # incompatible device_class/state_class combinations, device_class stays unset.
+    _attr_device_class = None
+
+    def __init__(
+        self,
+        engine: UtilityMeterEngine,
+        index: int,
+        name: str,
+        unique_id: str | None,
+    ) -> None:
+        self._engine = engine
+        self._index = index
+        self._attr_name = name
+        self._attr_unique_id = unique_id
+
+    @property
+    def meter_type(self) -> str:
+        return self._engine.meter_types[self._index]
+
+    @property
+    def native_value(self) -> Decimal:
+        return self._engine.total(self._index)
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        return self._engine.unit
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        engine = self._engine
+        return {
+            ATTR_SOURCE_ID: engine.parent_entity_id,
+            ATTR_METER_PERIOD: self.meter_type,
+            ATTR_LAST_PERIOD: str(engine.last_period(self._index)),
+            ATTR_LAST_VALID_STATE: str(engine.last_value),
+            ATTR_LAST_RESET: engine.last_reset(self._index).isoformat(),
         }
-        super().__init__(**allowed_kwargs)
-        # Ensure the utility meter does not inherit a mismatched device_class from its source.
-        # Utility meters are totalizing sensors; to avoid home assistant warnings about
-        # incompatible device_class/state_class combinations, explicitly clear device_class.
-        self._attr_device_class = None
-        self._attr_unique_id = kwargs.get("unique_id")
 
     @property
-    def unique_id(self) -> str | None:
-        return self._attr_unique_id
+    def extra_restore_state_data(self) -> UtilitySensorExtraStoredData:
+        engine = self._engine
+        return UtilitySensorExtraStoredData(
+            self.native_value,
+            self.native_unit_of_measurement,
+            engine.last_period(self._index),
+            engine.last_reset(self._index),
+            engine.last_value,
+            STATUS_COLLECTING,
+            None,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        # Same stored format as core utility meters, so existing meters keep their totals
+        restored = await self.async_get_last_extra_data()
+        if restored is not None:
+            self._engine.async_restore(
+                self._index,
+                UtilitySensorExtraStoredData.from_dict(restored.as_dict()),
+            )
+        self._engine.async_attach(self._index, self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._engine.async_detach(self._index)
 
 
 def build_virtual_meter_entity(
-    hass,
-    source_entity_id: str,
-    parent_entity_id: str | None,
-    base_object_id: str,
+    engine: UtilityMeterEngine,
+    meter_entity_id: str,
     meter_type: str,
     meter_name: str,
     meter_unique_id: str | None,
 ) -> Tuple[VirtualUtilityMeter, str]:
-    """Create a configured VirtualUtilityMeter and assign an entity_id.
+    """Create the entity exposing one cycle of ``engine`` as ``meter_entity_id``.
 
-    Following powercalc's pattern: directly build entity_id without async_generate_entity_id.
-    The entity registry will handle conflicts when the entity is added to Home Assistant.
+    The entity id comes from ``IdIndex.async_meter_entity_id``, which already
+    resolved conflicts, so the registry keeps it when the meter is added.
     """
-
-    # Build the entity_id directly, like powercalc does
-    # This avoids _2 suffix issues caused by async_generate_entity_id checking state machine
-    meter_entity_id = f"sensor.{base_object_id}_{meter_type}"
-
-    _LOGGER.debug(
-        "Building utility meter: entity_id=%s unique_id=%s",
-        meter_entity_id,
-        meter_unique_id,
+    utility_meter = VirtualUtilityMeter(
+        engine=engine,
+        index=engine.meter_types.index(meter_type),
+        name=meter_name,
+        unique_id=meter_unique_id,
     )
-    # Utility meters must track the proxy entity, not the original source
-    params: dict[str, Any] = {
-        "hass": hass,
-        "source_entity": parent_entity_id,  # Track the proxy, not the original source
-        "name": meter_name,
-        "meter_type": meter_type,
-        "meter_offset": DEFAULT_OFFSET,
-        "net_consumption": False,
-        "tariff": None,
-        "tariff_entity": None,
-        "parent_meter": parent_entity_id,
-        "delta_values": False,
-        "cron_pattern": None,
-        "periodically_resetting": False,
-        "sensor_always_available": True,
-        "unique_id": meter_unique_id,
-    }
-    utility_meter = VirtualUtilityMeter(**params)
     utility_meter.entity_id = meter_entity_id
 
     # Debug output for created virtual meter
     _LOGGER.debug(
         "Built virtual utility meter: name=%s entity_id=%s unique_id=%s meter_type=%s source=%s",
-        params.get("name"),
+        meter_name,
         meter_entity_id,
-        params.get("unique_id"),
+        meter_unique_id,
         meter_type,
-        parent_entity_id,
+        engine.parent_entity_id,
     )
 
     return utility_meter, meter_entity_id
@@ -0,0 +1,162 @@
+"""Fixed-size sample windows for windowed proxies (moving mean, min, max, rate)."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+
+__all__ = [
+    "SampleWindow",
+    "WINDOW_FUNCTIONS",
+    "WINDOW_MAX",
+    "WINDOW_MEAN",
+    "WINDOW_MIN",
+    "WINDOW_RATE",
+]
+
+WINDOW_MEAN = "mean"
+WINDOW_MIN = "min"
+WINDOW_MAX = "max"
+# Change per second between the oldest and the newest sample
+WINDOW_RATE = "rate"
+WINDOW_FUNCTIONS = (WINDOW_MEAN, WINDOW_MIN, WINDOW_MAX, WINDOW_RATE)
+
+# Recompute the float sum exactly after this many incremental changes
+SUM_RESYNC_INTERVAL = 10_000
+
+
+class SampleWindow:
+    """Ring buffer of (time, value) samples with an incrementally kept result.
+
+    Values and timestamps live in two preallocated ``array('d')`` of
+    ``capacity`` slots, so memory is fixed per proxy. Samples leave the window
+    when it is full or when they are older than ``duration`` seconds. Every
+    push and eviction is O(1) (amortised for min and max):
+
+    * ``mean`` keeps a running sum, resynced with ``math.fsum`` now and then
+    * ``min`` / ``max`` keep a monotonic deque of sample sequence numbers
+    * ``rate`` only needs the oldest and the newest sample
+    """
+
+    __slots__ = (
+        "function",
+        "duration",
+        "capacity",
+        "_values",
+        "_times",
+        "_next",
+        "_size",
+        "_sum",
+        "_changes",
+        "_extremes",
+        "_maximum",
+    )
+
+    def __init__(
+        self, function: str, capacity: int, duration: float | None = None
+    ) -> None:
+        if function not in WINDOW_FUNCTIONS:
+            raise ValueError(f"Unknown window function: {function}")
+        self.function = function
+        self.duration = duration
+        self.capacity = capacity
+        self._values = array("d", bytes(8 * capacity))
+        self._times = array("d", bytes(8 * capacity))
+        # Sequence number of the next sample; sample ``seq`` is in slot ``seq % capacity``
+        self._next = 0
+        self._size = 0
+        self._sum = 0.0
+        self._changes = 0
+        self._maximum = function == WINDOW_MAX
+        self._extremes: deque[int] | None = (
+            deque() if function in (WINDOW_MIN, WINDOW_MAX) else None
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, when: float, value: float) -> None:
+        """Add a sample taken at monotonic time ``when``."""
+        self.expire(when)
+        if self._size == self.capacity:
+            self._evict_oldest()
+
+        seq = self._next
+        slot = seq % self.capacity
+        self._values[slot] = value
+        self._times[slot] = when
+        self._next = seq + 1
+        self._size += 1
+
+        if self.function == WINDOW_MEAN:
+            self._sum += value
+            self._count_change()
+        elif (extremes := self._extremes) is not None:
+            values = self._values
+            capacity = self.capacity
+            if self._maximum:
+                while extremes and values[extremes[-1] % capacity] <= value:
+                    extremes.pop()
+            else:
+                while extremes and values[extremes[-1] % capacity] >= value:
+                    extremes.pop()
+            extremes.append(seq)
+
+    def expire(self, now: float) -> bool:
+        """Drop samples older than ``duration``; return True if any were dropped."""
+        if self.duration is None:
+            return False
+        cutoff = now - self.duration
+        times = self._times
+        dropped = False
+        while self._size and times[(self._next - self._size) % self.capacity] <= cutoff:
+            self._evict_oldest()
+            dropped = True
+        return dropped
+
+    def next_expiry(self) -> float | None:
+        """Return when the oldest sample leaves the window by age, if ever."""
+        if self.duration is None or not self._size:
+            return None
+        return self._times[(self._next - self._size) % self.capacity] + self.duration
+
+    def result(self) -> float | None:
+        """Return the windowed value, or None if there are not enough samples."""
+        size = self._size
+        if not size:
+            return None
+        function = self.function
+        if function == WINDOW_MEAN:
+            return self._sum / size
+        if function == WINDOW_RATE:
+            if size < 2:
+                return None
+            oldest = (self._next - size) % self.capacity
+            newest = (self._next - 1) % self.capacity
+            elapsed = self._times[newest] - self._times[oldest]
+            if elapsed <= 0:
+                return None
+            return (self._values[newest] - self._values[oldest]) / elapsed
+        return self._values[self._extremes[0] % self.capacity]
+
+    def _evict_oldest(self) -> None:
+        seq = self._next - self._size
+        self._size -= 1
+        if self.function == WINDOW_MEAN:
+            self._sum -= self._values[seq % self.capacity]
+            self._count_change()
+        elif (extremes := self._extremes) is not None and extremes[0] == seq:
+            extremes.popleft()
+
+    def _count_change(self) -> None:
+        self._changes += 1
+        if self._changes < SUM_RESYNC_INTERVAL:
+            return
+        # Drop the rounding error accumulated by incremental updates
+        self._changes = 0
+        values = self._values
+        capacity = self.capacity
+        self._sum = math.fsum(
+            values[seq % capacity] for seq in range(self._next - self._size, self._next)
+        )
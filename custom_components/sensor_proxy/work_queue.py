@@ -0,0 +1,149 @@
+"""Staggered, rate-limited work queue for proxy setup and meter creation."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Coroutine, Hashable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_WORK_QUEUE, DOMAIN
+
+__all__ = ["WorkQueue", "async_get_work_queue"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Jobs returning a coroutine that may run at the same time
+DEFAULT_CONCURRENCY = 4
+# Seconds of event loop time spent on queued work before yielding
+DEFAULT_TIME_BUDGET = 0.01
+
+Job = Callable[[], Coroutine[Any, Any, Any] | None]
+
+
+class WorkQueue:
+    """Run startup work in small slices of event loop time.
+
+    Proxies queue their setup here when they are added, and the meter
+    creation queue its flushes, instead of each doing its work right away.
+    One drain task runs the jobs in FIFO order: callback jobs run inline until
+    ``budget`` seconds of the current loop iteration are spent, then the drain
+    yields with ``asyncio.sleep(0)`` so state changes and other integrations
+    run in between. Jobs returning a coroutine run as tasks, at most
+    ``concurrency`` at a time, and call ``async_checkpoint`` to yield within
+    the same budget. Jobs are keyed like timer wheel deadlines: queueing a key
+    again replaces its pending job, and cancelling is O(1).
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        budget: float = DEFAULT_TIME_BUDGET,
+    ) -> None:
+        self._hass = hass
+        self._budget = budget
+        self._slots = asyncio.Semaphore(concurrency)
+        # Key -> (job, perf_counter time it was queued), in queueing order
+        self._pending: dict[Hashable, tuple[Job, float]] = {}
+        self._draining = False
+        self._slice_start = 0.0
+        self._running = 0
+        self._processed = 0
+        self._yields = 0
+        self._max_depth = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_last = 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @callback
+    def async_submit(self, key: Hashable, job: Job) -> None:
+        """Queue ``job``, replacing a pending job queued under ``key``."""
+        self._pending.pop(key, None)
+        self._pending[key] = (job, time.perf_counter())
+        self._max_depth = max(self._max_depth, len(self._pending))
+        if not self._draining:
+            self._draining = True
+            # Not eager: the submitting code finishes before the first job runs
+            self._hass.async_create_task(
+                self._async_drain(), "sensor_proxy work queue", eager_start=False
+            )
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Drop the pending job of ``key``, if it has not started yet."""
+        self._pending.pop(key, None)
+
+    async def async_checkpoint(self) -> None:
+        """Yield to the event loop once the current slice's budget is spent."""
+        if time.perf_counter() - self._slice_start < self._budget:
+            return
+        self._yields += 1
+        await asyncio.sleep(0)
+        self._slice_start = time.perf_counter()
+
+    async def _async_drain(self) -> None:
+        self._slice_start = time.perf_counter()
+        try:
+            while self._pending:
+                key = next(iter(self._pending))
+                job, queued = self._pending.pop(key)
+                wait = time.perf_counter() - queued
+                self._wait_last = wait
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+                self._processed += 1
+                try:
+                    result = job()
+                except Exception:
+                    _LOGGER.exception("Error running queued work for %s", key)
+                    result = None
+                if result is not None:
+                    await self._slots.acquire()
+                    self._running += 1
+                    self._hass.async_create_task(
+                        self._async_run(key, result), "sensor_proxy queued work"
+                    )
+                await self.async_checkpoint()
+        finally:
+            self._draining = False
+
+    async def _async_run(
+        self, key: Hashable, coroutine: Coroutine[Any, Any, Any]
+    ) -> None:
+        try:
+            await coroutine
+        except Exception:
+            _LOGGER.exception("Error running queued work for %s", key)
+        finally:
+            self._running -= 1
+            self._slots.release()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return queue depth and wait time metrics."""
+        return {
+            "depth": len(self._pending),
+            "max_depth": self._max_depth,
+            "running": self._running,
+            "processed": self._processed,
+            "yields": self._yields,
+            "wait_ms": {
+                "last": round(self._wait_last * 1000, 3),
+                "mean": round(self._wait_total / (self._processed or 1) * 1000, 3),
+                "max": round(self._wait_max * 1000, 3),
+            },
+        }
+
+
+@callback
+def async_get_work_queue(hass: HomeAssistant) -> WorkQueue:
+    """Return the integration-wide work queue, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (queue := domain_data.get(DATA_WORK_QUEUE)) is None:
+        queue = domain_data[DATA_WORK_QUEUE] = WorkQueue(hass)
+    return queue
@@ -0,0 +1 @@
+"""Tests for the Sensor Proxy integration."""
@@ -0,0 +1,16 @@
+"""Fixtures for the Sensor Proxy tests."""
+
+import pytest
+
+# Import the integration before the plugin puts its own testing_config
+# custom_components package on sys.path, which would otherwise shadow this
+# repo's namespace package in test modules that do not import it themselves
+import custom_components.sensor_proxy  # noqa: F401
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components/ in every test."""
+    yield
@@ -0,0 +1,212 @@
+"""Tests for aggregate proxies."""
+
+import logging
+import random
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.sensor_proxy.aggregate import (
+    AGGREGATE_FUNCTIONS,
+    create_aggregator,
+)
+
+POWER = {"device_class": "power", "state_class": "measurement"}
+W = {**POWER, "unit_of_measurement": "W"}
+KW = {**POWER, "unit_of_measurement": "kW"}
+ENERGY = {
+    "unit_of_measurement": "kWh",
+    "device_class": "energy",
+    "state_class": "total_increasing",
+}
+RECOMPUTE = {
+    "sum": sum,
+    "mean": lambda values: sum(values) / len(values),
+    "min": min,
+    "max": max,
+}
+
+
+async def _setup(hass: HomeAssistant, config: list[dict]) -> None:
+    assert await async_setup_component(hass, "sensor", {"sensor": config})
+    await hass.async_block_till_done()
+
+
+def _aggregate(function: str, sources: list[str] | str) -> dict:
+    return {
+        "platform": "sensor_proxy",
+        "aggregate": function,
+        "name": f"total_{function}",
+        "sources": sources,
+    }
+
+
+@pytest.mark.parametrize("function", AGGREGATE_FUNCTIONS)
+def test_aggregator_matches_recomputation(function: str) -> None:
+    """Incremental results equal a recomputation after every change."""
+    rng = random.Random(1)
+    aggregator = create_aggregator(function)
+    values: dict[str, float | None] = {}
+    for _ in range(2000):
+        key = f"sensor.s{rng.randrange(20)}"
+        value = None if rng.random() < 0.1 else float(rng.randint(-50, 50))
+        aggregator.update(key, value)
+        values[key] = value
+        if rng.random() < 0.02:
+            aggregator.remove(key)
+            del values[key]
+
+        present = [value for value in values.values() if value is not None]
+        assert aggregator.count == len(present)
+        if not present:
+            assert aggregator.result() is None
+            continue
+        assert aggregator.result() == pytest.approx(RECOMPUTE[function](present))
+        if function in ("min", "max"):
+            assert values[aggregator.result_key()] == aggregator.result()
+
+
+async def test_functions(hass: HomeAssistant) -> None:
+    """Sum, mean, min and max; unavailable sources are left out."""
+    for index, value in enumerate(["1.5", "2", "3.25"]):
+        hass.states.async_set(f"sensor.s{index}", value, W)
+    sources = ["sensor.s0", "sensor.s1", "sensor.s2"]
+    await _setup(hass, [_aggregate(function, sources) for function in RECOMPUTE])
+
+    assert hass.states.get("sensor.total_sum").state == "6.75"
+    assert hass.states.get("sensor.total_sum").attributes["unit_of_measurement"] == "W"
+    assert hass.states.get("sensor.total_mean").state == "2.25"
+    assert hass.states.get("sensor.total_min").state == "1.5"
+    assert hass.states.get("sensor.total_max").attributes["entity_id"] == "sensor.s2"
+
+    hass.states.async_set("sensor.s2", "unavailable")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.total_sum").state == "3.5"
+    assert hass.states.get("sensor.total_sum").attributes["valid_sources"] == 2
+    assert hass.states.get("sensor.total_max").state == "2.0"
+
+    hass.states.async_set("sensor.s0", "0.1", W)
+    hass.states.async_set("sensor.s1", "0.2", W)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.total_sum").state == "0.3"
+
+
+async def test_pattern_sources(hass: HomeAssistant) -> None:
+    """Sources matching the pattern later are added."""
+    hass.states.async_set("sensor.circuit_1_power", "10", W)
+    await _setup(hass, [_aggregate("sum", "sensor.circuit_*_power")])
+    assert hass.states.get("sensor.total_sum").state == "10"
+
+    hass.states.async_set("sensor.circuit_2_power", "5", W)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.total_sum")
+    assert state.state == "15"
+    assert state.attributes["sources"] == 2
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_energy_sum_keeps_unavailable_source(hass: HomeAssistant) -> None:
+    """A sum of totals keeps an unavailable source, so its meter counts once."""
+    hass.states.async_set("sensor.e1", "100", ENERGY)
+    hass.states.async_set("sensor.e2", "50", ENERGY)
+    config = {
+        **_aggregate("sum", ["sensor.e1", "sensor.e2"]),
+        "unique_id": "total",
+        "create_utility_meters": True,
+        "utility_meter_types": ["daily"],
+    }
+    await _setup(hass, [config])
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.total_sum")
+    assert state.state == "150"
+    assert state.attributes["state_class"] == "total_increasing"
+
+    hass.states.async_set("sensor.e1", "101", ENERGY)
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.e2", "unavailable")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.total_sum").state == "151"
+    hass.states.async_set("sensor.e2", "52", ENERGY)
+    await hass.async_block_till_done()
+    assert float(hass.states.get("sensor.total_sum_daily").state) == 3
+
+
+@pytest.mark.parametrize(
+    ("state", "expected"), [("5", "5"), ("unavailable", "unavailable")]
+)
+async def test_restored_until_a_source_reports(
+    hass: HomeAssistant, hass_storage: dict[str, Any], state: str, expected: str
+) -> None:
+    """The snapshot is kept while no source is loaded, not after one reports."""
+    hass_storage["sensor_proxy.states"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "sensor_proxy.states",
+        "data": {"sensor.total_sum": ["12", "W", "power", "measurement", None]},
+    }
+    await _setup(hass, [_aggregate("sum", ["sensor.a", "sensor.b"])])
+    restored = hass.states.get("sensor.total_sum")
+    assert restored.state == "12"
+    assert restored.attributes["restored"] is True
+
+    hass.states.async_set("sensor.a", state, W)
+    await hass.async_block_till_done()
+    live = hass.states.get("sensor.total_sum")
+    assert live.state == expected
+    assert "restored" not in live.attributes
+
+
+async def test_sources_converted_to_one_unit(hass: HomeAssistant) -> None:
+    """A kW source is summed with W sources in W."""
+    hass.states.async_set("sensor.a", "250", W)
+    hass.states.async_set("sensor.b", "1.5", KW)
+    await _setup(hass, [_aggregate("sum", ["sensor.a", "sensor.b"])])
+
+    state = hass.states.get("sensor.total_sum")
+    assert state.state == "1750"
+    assert state.attributes["unit_of_measurement"] == "W"
+
+    hass.states.async_set("sensor.b", "0.0125", KW)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.total_sum").state == "262.5"
+
+
+async def test_unit_source_switches_unit(hass: HomeAssistant) -> None:
+    """The other sources are converted again when the first one changes unit."""
+    hass.states.async_set("sensor.a", "500", W)
+    hass.states.async_set("sensor.b", "1", KW)
+    await _setup(hass, [_aggregate("max", ["sensor.a", "sensor.b"])])
+    assert hass.states.get("sensor.total_max").state == "1000"
+
+    hass.states.async_set("sensor.a", "0.5", KW)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.total_max")
+    assert state.state == "1.0"
+    assert state.attributes["unit_of_measurement"] == "kW"
+
+
+async def test_unconvertible_source_left_out(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """A source whose unit cannot be converted is dropped and logged once."""
+    hass.states.async_set("sensor.a", "250", W)
+    hass.states.async_set("sensor.b", "20", {"unit_of_measurement": "°C"})
+    with caplog.at_level(logging.WARNING):
+        await _setup(hass, [_aggregate("sum", ["sensor.a", "sensor.b"])])
+        hass.states.async_set("sensor.b", "21", {"unit_of_measurement": "°C"})
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.total_sum")
+    assert state.state == "250"
+    assert state.attributes["valid_sources"] == 1
+    assert caplog.text.count("leaves out sensor.b") == 1
+
+    hass.states.async_set("sensor.b", "0.25", KW)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.total_sum").state == "500"
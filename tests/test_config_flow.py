@@ -0,0 +1,155 @@
+"""Tests for the config flow."""
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+
+from custom_components.sensor_proxy.const import DATA_ID_INDEX, DOMAIN
+
+INTEGRATION = Path(__file__).parent.parent / "custom_components" / "sensor_proxy"
+POWER = {"unit_of_measurement": "W"}
+
+
+async def _start_multi(hass: HomeAssistant) -> dict:
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.MENU
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "multi"}
+    )
+
+
+async def _create_block(hass: HomeAssistant, block: dict, sensors: list[str]) -> dict:
+    result = await _start_multi(hass)
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], block)
+    assert result["step_id"] == "sensors"
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"sensors": sensors}
+    )
+
+
+def test_strings() -> None:
+    """Every error the flow shows has a text; the English translation matches."""
+    strings = json.loads((INTEGRATION / "strings.json").read_text())
+    translation = json.loads((INTEGRATION / "translations" / "en.json").read_text())
+    assert translation == strings
+
+    source = (INTEGRATION / "config_flow.py").read_text()
+    errors = set(re.findall(r'errors\[[^]]+\] = "(\w+)"', source))
+    assert errors == {
+        "invalid_template",
+        "unique_id_base_required",
+        "no_sources",
+        "no_sensors",
+        "invalid_config",
+        "ids_in_use",
+    }
+    assert errors <= strings["config"]["error"].keys()
+    assert {"user", "single", "multi", "sensors"} <= strings["config"]["step"].keys()
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_multi_entity_block(hass: HomeAssistant) -> None:
+    """Form errors, then one entry for the picked suffixes, keyed by unique_id_base."""
+    for suffix in ("power", "energy", "voltage"):
+        hass.states.async_set(f"sensor.dev_{suffix}", "1", POWER)
+    block = {
+        "source_base": "sensor.dev",
+        "name_base": "copy_dev",
+        "unique_id_base": "copy_dev",
+    }
+
+    result = await _start_multi(hass)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"source_base": "sensor.nope", "unique_id_base": "x"}
+    )
+    assert result["errors"] == {"source_base": "no_sources"}
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"source_base": "sensor.dev", "unique_id_base": ""}
+    )
+    assert result["errors"] == {"unique_id_base": "unique_id_base_required"}
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"source_base": "sensor.dev", "name_base": "x_{bogus}", "unique_id_base": "x"},
+    )
+    assert result["errors"] == {"name_base": "invalid_template"}
+
+    result = await _create_block(hass, block, ["power", "energy"])
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id == "copy_dev"
+    assert result["data"]["sensors"] == [{"suffix": "energy"}, {"suffix": "power"}]
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.copy_dev_power").state == "1"
+    assert hass.states.get("sensor.copy_dev_voltage") is None
+
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.copy_dev_power").state == "unavailable"
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_ids_in_use(hass: HomeAssistant) -> None:
+    """Proxies whose unique ids a YAML proxy uses are refused."""
+    hass.states.async_set("sensor.dev_power", "1", POWER)
+    hass.states.async_set("sensor.other_power", "1", POWER)
+    yaml_proxy = {
+        "platform": "sensor_proxy",
+        "source_entity_id": "sensor.dev_power",
+        "unique_id": "same_power",
+    }
+    assert await async_setup_component(hass, "sensor", {"sensor": [yaml_proxy]})
+    await hass.async_block_till_done()
+
+    result = await _create_block(
+        hass,
+        {"source_base": "sensor.other", "unique_id_base": "same_{suffix}"},
+        ["power"],
+    )
+    assert result["errors"] == {"base": "ids_in_use"}
+    assert len(hass.data[DOMAIN][DATA_ID_INDEX]) == 1
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_registered_proxies(hass: HomeAssistant) -> None:
+    """Proxies of an entry are registered; the same unique_id_base aborts."""
+    hass.states.async_set("sensor.dev_power", "1", POWER)
+    block = {"source_base": "sensor.dev", "unique_id_base": "copy"}
+    result = await _create_block(hass, block, ["power"])
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    registry = er.async_get(hass)
+    assert registry.async_get_entity_id("sensor", DOMAIN, "copy_power") is not None
+
+    result = await _start_multi(hass)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {**block, "name_base": "again"}
+    )
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_single_proxy(hass: HomeAssistant) -> None:
+    """The single-proxy step creates one entry keyed by its unique id."""
+    hass.states.async_set("sensor.src", "3")
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "single"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"source_entity_id": "sensor.src", "unique_id": "u1", "name": "one"},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.one").state == "3"
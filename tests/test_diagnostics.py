@@ -0,0 +1,21 @@
+"""Tests for the diagnostics data."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.sensor_proxy.const import DOMAIN
+
+
+async def test_dump_diagnostics_without_entry(hass: HomeAssistant) -> None:
+    """YAML-only installs get the diagnostics data from the service."""
+    hass.states.async_set("sensor.a", "1")
+    proxy = {"platform": "sensor_proxy", "source_entity_id": "sensor.a", "name": "pa"}
+    assert await async_setup_component(hass, "sensor", {"sensor": [proxy]})
+    await hass.async_block_till_done()
+
+    result = await hass.services.async_call(
+        DOMAIN, "dump_diagnostics", blocking=True, return_response=True
+    )
+    assert "entry" not in result
+    assert result["dispatcher"]["listeners"] == 1
+    assert {"stats", "meter_queue", "work_queue", "id_index"} <= result.keys()
@@ -0,0 +1,111 @@
+"""Tests for the shared state-change dispatcher and plain mirroring."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.sensor_proxy.dispatcher import async_get_dispatcher
+
+POWER = {"unit_of_measurement": "W", "device_class": "power"}
+
+
+async def _setup(hass: HomeAssistant, config: list[dict]) -> None:
+    assert await async_setup_component(hass, "sensor", {"sensor": config})
+    await hass.async_block_till_done()
+
+
+def _proxy(name: str, source: str = "sensor.src", **options) -> dict:
+    return {
+        "platform": "sensor_proxy",
+        "source_entity_id": source,
+        "name": name,
+        "unique_id": name,
+        **options,
+    }
+
+
+async def test_fan_out(hass: HomeAssistant) -> None:
+    """Each source event reaches every proxy of that source and no other."""
+    hass.states.async_set("sensor.src", "3", POWER)
+    await _setup(
+        hass,
+        [
+            _proxy("a"),
+            _proxy("b"),
+            _proxy("c", source="sensor.other"),
+        ],
+    )
+    assert hass.states.get("sensor.a").state == "3"
+
+    dispatcher = async_get_dispatcher(hass)
+    assert dispatcher.source_count == 2
+    assert dispatcher.listener_count == 3
+
+    hass.states.async_set("sensor.src", "5", POWER)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.a").state == "5"
+    assert hass.states.get("sensor.b").state == "5"
+    assert hass.states.get("sensor.b").attributes["unit_of_measurement"] == "W"
+    assert hass.states.get("sensor.c").state == "unavailable"
+
+    hass.states.async_set("sensor.src", "unavailable")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.a").state == "unavailable"
+
+
+async def test_register_unregister(hass: HomeAssistant) -> None:
+    """The bus listener is dropped with the last registered listener."""
+    dispatcher = async_get_dispatcher(hass)
+    seen: list[tuple[str, str]] = []
+
+    def first(event) -> None:
+        seen.append(("first", event.data["new_state"].state))
+        # Unregistering while being dispatched is allowed
+        unsub_first()
+
+    unsub_first = dispatcher.async_register("sensor.src", first)
+    unsub_second = dispatcher.async_register(
+        "sensor.src", lambda event: seen.append(("second", event.data["new_state"].state))
+    )
+    hass.states.async_set("sensor.src", "1")
+    hass.states.async_set("sensor.src", "2")
+    await hass.async_block_till_done()
+    assert seen == [("first", "1"), ("second", "1"), ("second", "2")]
+
+    unsub_second()
+    assert dispatcher.source_count == 0
+    assert dispatcher._unsub_bus is None
+
+
+async def test_unchanged_source_suppressed(hass: HomeAssistant) -> None:
+    """Forced updates with the same state and attributes are not written."""
+    await _setup(hass, [_proxy("copy")])
+    hass.states.async_set("sensor.src", "1", POWER)
+    await hass.async_block_till_done()
+    last_updated = hass.states.get("sensor.copy").last_updated
+
+    for _ in range(5):
+        hass.states.async_set("sensor.src", "1", POWER, force_update=True)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.copy").last_updated == last_updated
+    assert hass.data["sensor_proxy"]["write_stats"]["suppressed"] == 5
+
+
+async def test_attribute_filters(hass: HomeAssistant) -> None:
+    """Included and excluded attributes; units and classes are always kept."""
+    await _setup(
+        hass,
+        [
+            _proxy("inc", attributes_include=["a"]),
+            _proxy("exc", attributes_exclude=["forecast"]),
+        ],
+    )
+    hass.states.async_set("sensor.src", "1", {**POWER, "a": 1, "forecast": [1, 2]})
+    await hass.async_block_till_done()
+
+    included = hass.states.get("sensor.inc").attributes
+    assert included["a"] == 1
+    assert "forecast" not in included
+    assert included["unit_of_measurement"] == "W"
+    excluded = hass.states.get("sensor.exc").attributes
+    assert excluded["a"] == 1
+    assert "forecast" not in excluded
@@ -0,0 +1,102 @@
+"""Tests for flap damping (hold_down / max_hold_down)."""
+
+from datetime import timedelta
+
+import pytest
+import voluptuous as vol
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.sensor_proxy.config import build_proxy_definitions
+from custom_components.sensor_proxy.const import DATA_STATS, DATA_YAML_PROXIES, DOMAIN
+from custom_components.sensor_proxy.schema import PLATFORM_SCHEMA
+
+POWER = {"unit_of_measurement": "W"}
+BASE = {"platform": "sensor_proxy", "source_entity_id": "sensor.src", "name": "copy"}
+
+
+async def _setup(hass: HomeAssistant, **options):
+    config = {**BASE, "unique_id": "copy", **options}
+    assert await async_setup_component(hass, "sensor", {"sensor": [config]})
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][DATA_YAML_PROXIES]["copy"][1]
+
+
+async def _set(hass: HomeAssistant, state: str, attributes: dict = POWER) -> None:
+    hass.states.async_set("sensor.src", state, attributes)
+    await hass.async_block_till_done()
+
+
+async def _advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+def _state(hass: HomeAssistant) -> str:
+    return hass.states.get("sensor.copy").state
+
+
+async def test_hold_down(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Short outages are absorbed; repeated ones are held longer, up to the cap."""
+    proxy = await _setup(hass, hold_down=10, max_hold_down=30)
+    await _set(hass, "1")
+    written: list[str] = []
+    hass.bus.async_listen(
+        "state_changed",
+        lambda event: event.data["entity_id"] == "sensor.copy"
+        and written.append(event.data["new_state"].state),
+    )
+
+    await _set(hass, "unavailable", {})
+    assert _state(hass) == "1"
+    await _advance(hass, freezer, 5)
+    await _set(hass, "1")
+    assert _state(hass) == "1"
+    assert "unavailable" not in written
+    assert proxy._stats.flaps == 1
+    assert proxy._stats.flaps_absorbed == 1
+
+    # The second outage is held about twice as long
+    await _set(hass, "unknown", {})
+    await _advance(hass, freezer, 15)
+    assert _state(hass) == "1"
+    await _advance(hass, freezer, 6)
+    assert _state(hass) == "unavailable"
+    assert proxy._flap_damper.last_hold_down == pytest.approx(20, rel=0.01)
+    await _set(hass, "2")
+    assert _state(hass) == "2"
+
+    # The third one is capped at max_hold_down
+    await _set(hass, "unavailable", {})
+    assert proxy._flap_damper.last_hold_down == 30
+    await _set(hass, "3")
+    stats = hass.data[DOMAIN][DATA_STATS].as_dict()
+    assert stats["flapping_proxies"]["sensor.copy"] == {"flaps": 3, "absorbed": 2}
+    assert stats["totals"]["flaps"] == 3
+
+
+async def test_outages_counted_without_hold_down(hass: HomeAssistant) -> None:
+    """Without hold_down an outage is written at once but still counted."""
+    proxy = await _setup(hass)
+    await _set(hass, "1")
+    await _set(hass, "unavailable", {})
+    assert _state(hass) == "unavailable"
+    assert proxy._stats.flaps == 1
+
+
+def test_schema() -> None:
+    """max_hold_down needs hold_down and must not be shorter; it defaults to 16x."""
+    with pytest.raises(vol.Invalid):
+        PLATFORM_SCHEMA({**BASE, "max_hold_down": 5})
+    with pytest.raises(vol.Invalid):
+        PLATFORM_SCHEMA({**BASE, "hold_down": 10, "max_hold_down": 5})
+    (definition,) = build_proxy_definitions(
+        PLATFORM_SCHEMA({**BASE, "hold_down": "00:00:10"})
+    )
+    assert definition.flap.hold_down == 10
+    assert definition.flap.max_hold_down == 160
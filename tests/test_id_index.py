@@ -0,0 +1,93 @@
+"""Tests for the integration-wide id index."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.sensor_proxy.config import ProxyDefinition
+from custom_components.sensor_proxy.id_index import async_get_id_index
+
+
+async def test_claim_and_release(hass: HomeAssistant) -> None:
+    """Keys are claimed once; meter ids of another definition are skipped."""
+    index = async_get_id_index(hass)
+    first = ProxyDefinition("a", "sensor.a", "a_daily")
+    second = ProxyDefinition(
+        "b",
+        "sensor.b",
+        "b",
+        create_utility_meters=True,
+        utility_meter_types=("daily", "weekly"),
+        utility_unique_id_template="a_{cycle}",
+    )
+    assert index.async_find_collisions([first, second]) == {"b": ["a_daily"]}
+    assert index.async_claim([first, second], "test") == [first, second]
+    assert index.async_owner("a_daily") == "a_daily"
+    assert index.async_owner("a_weekly") == "b"
+
+    duplicate = ProxyDefinition("other", "sensor.c", "b")
+    assert index.async_claim([duplicate], "test") == []
+
+    assert not index.async_claim_meter("b", "a_daily")
+    assert index.async_claim_meter("b", "b_extra")
+    index.async_release(["b"])
+    assert len(index) == 1
+    assert "a_weekly" not in index
+    assert index.async_claim([duplicate], "test") == [duplicate]
+
+
+async def test_meter_entity_ids(hass: HomeAssistant) -> None:
+    """Meter entity ids get a suffix when taken, as the registry would pick."""
+    er.async_get(hass).async_get_or_create(
+        "sensor", "other", "x", suggested_object_id="taken"
+    )
+    hass.states.async_set("sensor.live", "1")
+    index = async_get_id_index(hass)
+
+    assert index.async_meter_entity_id(None, "taken") == "sensor.taken_2"
+    assert index.async_meter_entity_id(None, "live") == "sensor.live_2"
+    assert index.async_meter_entity_id(None, "x") == "sensor.x"
+    assert index.async_meter_entity_id(None, "x") == "sensor.x_2"
+
+    index.async_release_entity_ids(["sensor.x"])
+    assert index.async_meter_entity_id(None, "x") == "sensor.x"
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_meter_ids_match_index(hass: HomeAssistant) -> None:
+    """`*` in a meter template renders as indexed, even with a suffixed entity id."""
+    er.async_get(hass).async_get_or_create(
+        "sensor", "other", "x", suggested_object_id="pa"
+    )
+    energy = {
+        "unit_of_measurement": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+    }
+    hass.states.async_set("sensor.a", "1", energy)
+    proxy = {
+        "platform": "sensor_proxy",
+        "source_entity_id": "sensor.a",
+        "name": "pa",
+        "unique_id": "pa",
+        "create_utility_meters": True,
+        "utility_meter_types": ["daily"],
+        "utility_unique_id_template": "m_*_{cycle}",
+    }
+    assert await async_setup_component(hass, "sensor", {"sensor": [proxy]})
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    assert er.async_get(hass).async_get_entity_id("sensor", "sensor_proxy", "pa")
+    assert hass.states.get("sensor.pa_2") is not None
+    assert async_get_id_index(hass).async_owner("m_pa_daily") == "pa"
+    meter = er.async_get(hass).async_get_entity_id(
+        "sensor", "sensor_proxy", "m_pa_daily"
+    )
+    assert meter is not None
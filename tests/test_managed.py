@@ -0,0 +1,132 @@
+"""Tests for the create_proxies and remove_proxies services."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.sensor_proxy.const import DOMAIN
+
+ENERGY = {
+    "unit_of_measurement": "kWh",
+    "device_class": "energy",
+    "state_class": "total_increasing",
+}
+
+
+async def _call(hass: HomeAssistant, service: str, proxies: list) -> dict[str, Any]:
+    return await hass.services.async_call(
+        DOMAIN, service, {"proxies": proxies}, blocking=True, return_response=True
+    )
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_create_and_remove(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Items are validated one by one; removal also drops the meters."""
+    entry = MockConfigEntry(domain="test")
+    entry.add_to_hass(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={("test", "d")}
+    )
+    for index in range(3):
+        hass.states.async_set(f"sensor.src_{index}", str(index), ENERGY)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    result = await _call(
+        hass,
+        "create_proxies",
+        [
+            {
+                "source_entity_id": "sensor.src_0",
+                "unique_id": "p0",
+                "device_id": device.id,
+                "create_utility_meters": True,
+            },
+            {
+                "source_base": "sensor.src",
+                "unique_id_base": "m",
+                "sensors": [{"suffix": "1"}, {"suffix": "2"}],
+            },
+            {"source_entity_id": "sensor.src_0"},
+            {"source_entity_id": "sensor.src_0", "unique_id": "p0"},
+            {"source_base": "sensor.src", "unique_id_base": "w", "sensors": "*"},
+        ],
+    )
+    assert [item["status"] for item in result["results"]] == [
+        "created",
+        "created",
+        "invalid",
+        "exists",
+        "invalid",
+    ]
+    assert result["created"] == 3
+    await hass.async_block_till_done()
+    registry = er.async_get(hass)
+    proxy_id = result["results"][0]["entity_ids"][0]
+    assert registry.async_get(proxy_id).device_id == device.id
+    assert hass.states.get(result["results"][1]["entity_ids"][1]).state == "2"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    meters = [
+        entity_id
+        for entity_id in hass.states.async_entity_ids("sensor")
+        if entity_id.startswith(f"{proxy_id}_")
+    ]
+    assert meters
+
+    result = await _call(
+        hass,
+        "remove_proxies",
+        [
+            "p0",
+            {
+                "source_base": "sensor.src",
+                "unique_id_base": "m",
+                "sensors": [{"suffix": "1"}],
+            },
+            "nope",
+        ],
+    )
+    assert [item["status"] for item in result["results"]] == [
+        "removed",
+        "removed",
+        "not_found",
+    ]
+    await hass.async_block_till_done()
+    for entity_id in (proxy_id, *meters):
+        assert hass.states.get(entity_id) is None
+        assert registry.async_get(entity_id) is None
+
+    await hass.async_stop(force=True)
+    items = hass_storage["sensor_proxy.proxies"]["data"]["items"]
+    assert [item["keys"] for item in items] == [["m_2"]]
+
+
+async def test_platform_unavailable(hass: HomeAssistant) -> None:
+    """A service call fails instead of hanging when the platform never loads."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    with (
+        patch(
+            "custom_components.sensor_proxy.managed.async_load_platform",
+            AsyncMock(),
+        ),
+        patch("custom_components.sensor_proxy.managed.PLATFORM_TIMEOUT", 0.01),
+        pytest.raises(HomeAssistantError),
+    ):
+        await _call(hass, "create_proxies", [{"source_entity_id": "sensor.src"}])
@@ -0,0 +1,182 @@
+"""Tests for name templates and the validation of generated ids."""
+
+from datetime import timedelta
+
+import pytest
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.sensor_proxy.config import build_proxy_definitions
+from custom_components.sensor_proxy.naming import compile_template
+from custom_components.sensor_proxy.schema import PLATFORM_SCHEMA
+
+BLOCK = {"platform": "sensor_proxy", "source_base": "sensor.dev", "name_base": "c"}
+
+
+def test_render() -> None:
+    """Templates render in one pass and are cached by their source."""
+    template = compile_template("*_{suffix}_{cycle}x")
+    assert template.render({"*": "a", "suffix": "s", "cycle": "daily"}) == (
+        "a_s_dailyx"
+    )
+    assert compile_template("*_{suffix}_{cycle}x") is template
+    with pytest.raises(ValueError):
+        compile_template("{bogus}")
+
+
+def test_base_templates() -> None:
+    """A base without placeholders gets _{suffix}; placeholders render per item."""
+    config = PLATFORM_SCHEMA(
+        {
+            **BLOCK,
+            "name_base": "copy",
+            "unique_id_base": "u_{source_object_id}",
+            "sensors": [
+                {"suffix": "p"},
+                {"suffix": "q", "source_entity_id": "sensor.other"},
+            ],
+        }
+    )
+    definitions = build_proxy_definitions(config)
+    assert [d.name for d in definitions] == ["copy_p", "copy_q"]
+    assert [d.unique_id for d in definitions] == ["u_dev_p", "u_other"]
+
+
+@pytest.mark.parametrize(
+    ("config", "match"),
+    [
+        (
+            {
+                **BLOCK,
+                "sensors": [
+                    {"suffix": "p", "unique_id": "x"},
+                    {"suffix": "q", "unique_id": "x"},
+                ],
+            },
+            "collide",
+        ),
+        (
+            {
+                **BLOCK,
+                "sensors": [
+                    {
+                        "suffix": "p",
+                        "utility_meter_types": ["daily", "monthly"],
+                        "utility_unique_id_template": "m_*",
+                    }
+                ],
+            },
+            "collide",
+        ),
+        (
+            {**BLOCK, "name_base": "{device}_{suffix}", "sensors": [{"suffix": "p"}]},
+            "device_id",
+        ),
+        (
+            {
+                **BLOCK,
+                "name_base": "{device}",
+                "device_id": "abc",
+                "sensors": [{"suffix": "p"}],
+            },
+            "tell the proxies apart",
+        ),
+        (
+            {
+                "platform": "sensor_proxy",
+                "source_entity_id": "sensor.a",
+                "name": "a",
+                "utility_name_template": "{nope}",
+            },
+            "placeholder",
+        ),
+    ],
+)
+def test_invalid(config: dict, match: str) -> None:
+    """Unknown placeholders and colliding unique ids are rejected."""
+    with pytest.raises(vol.Invalid, match=match):
+        PLATFORM_SCHEMA(config)
+
+
+def test_valid_without_known_collisions() -> None:
+    """Equal names and cross-proxy meter ids are left to Home Assistant and the id index."""
+    PLATFORM_SCHEMA(
+        {
+            **BLOCK,
+            "sensors": [
+                {"suffix": "p", "name": "Same"},
+                {"suffix": "q", "name": "same"},
+            ],
+        }
+    )
+    PLATFORM_SCHEMA(
+        {
+            **BLOCK,
+            "sensors": [
+                {"suffix": "p", "utility_unique_id_template": "m_{cycle}"},
+                {"suffix": "q", "utility_unique_id_template": "m_{cycle}"},
+            ],
+        }
+    )
+
+
+async def test_equal_names_get_distinct_entity_ids(hass: HomeAssistant) -> None:
+    """Two proxies with the same name both load, as before."""
+    config = {
+        "sensor": [
+            {"platform": "sensor_proxy", "source_entity_id": "sensor.a", "name": "x"},
+            {"platform": "sensor_proxy", "source_entity_id": "sensor.b", "name": "x"},
+        ]
+    }
+    assert await async_setup_component(hass, "sensor", config)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.x") is not None
+    assert hass.states.get("sensor.x_2") is not None
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_device_and_meter_names(hass: HomeAssistant) -> None:
+    """{device} renders the device name's slug in proxy and meter names."""
+    entry = MockConfigEntry(domain="test")
+    entry.add_to_hass(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={("x", "1")}, name="Kitchen Plug"
+    )
+    attributes = {
+        "unit_of_measurement": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+    }
+    hass.states.async_set("sensor.dev_energy", "1.0", attributes)
+    config = {
+        **BLOCK,
+        "name_base": "{device}_{suffix}",
+        "unique_id_base": "p_{suffix}",
+        "device_id": device.id,
+        "sensors": [
+            {
+                "suffix": "energy",
+                "create_utility_meters": True,
+                "utility_meter_types": ["daily", "monthly"],
+                "utility_name_template": "{device}_{suffix}_{cycle}",
+                "utility_unique_id_template": "m_{source_object_id}_{cycle}",
+            }
+        ],
+    }
+    assert await async_setup_component(hass, "sensor", {"sensor": [config]})
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.kitchen_plug_energy").state == "1.0"
+    entries = {e.unique_id: e for e in er.async_get(hass).entities.values()}
+    assert "m_dev_energy_monthly" in entries
+    assert entries["m_dev_energy_daily"].original_name == "kitchen_plug_energy_daily"
@@ -0,0 +1,147 @@
+"""Tests for the sensor_proxy.reload service."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+PROXY = {
+    "platform": "sensor_proxy",
+    "source_entity_id": "sensor.a",
+    "name": "pa",
+    "unique_id": "pa",
+}
+BLOCK = {
+    "platform": "sensor_proxy",
+    "source_base": "sensor.dev",
+    "name_base": "b",
+    "unique_id_base": "b",
+    "sensors": [{"suffix": "x"}, {"suffix": "y"}],
+}
+
+
+async def _setup(hass: HomeAssistant, config: list[dict]) -> None:
+    assert await async_setup_component(hass, "sensor", {"sensor": config})
+    await hass.async_block_till_done()
+
+
+async def _reload(hass: HomeAssistant, config: list[dict]) -> dict:
+    with patch(
+        "homeassistant.config.async_hass_config_yaml",
+        return_value={"sensor": config},
+    ):
+        result = await hass.services.async_call(
+            "sensor_proxy", "reload", blocking=True, return_response=True
+        )
+    await hass.async_block_till_done()
+    return result
+
+
+async def test_reload_diff(hass: HomeAssistant) -> None:
+    """Only added, removed and changed proxies are touched."""
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.dev_x", "2")
+    hass.states.async_set("sensor.dev_y", "3")
+    await _setup(hass, [PROXY, BLOCK])
+    unchanged = hass.states.get("sensor.b_x")
+
+    block = {
+        **BLOCK,
+        "sensors": [
+            {"suffix": "x"},
+            {"suffix": "y", "source_entity_id": "sensor.a"},
+            {"suffix": "z"},
+        ],
+    }
+    result = await _reload(hass, [block])
+    assert result == {
+        "added": 1,
+        "removed": 1,
+        "reconfigured": 1,
+        "unchanged": 1,
+        "rejected": 0,
+    }
+    assert hass.states.get("sensor.pa") is None
+    assert hass.states.get("sensor.b_x") is unchanged
+    assert hass.states.get("sensor.b_y").state == "1"
+    assert hass.states.get("sensor.b_z").state == "unavailable"
+
+    result = await _reload(hass, [block])
+    assert result["unchanged"] == 3
+    assert result["added"] == result["removed"] == result["reconfigured"] == 0
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_reconfigured_proxy_keeps_meter_entries(hass: HomeAssistant) -> None:
+    """A changed proxy's utility meters keep their registry entries and settings."""
+    energy = {
+        "unit_of_measurement": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+    }
+    hass.states.async_set("sensor.a", "10", energy)
+    proxy = {**PROXY, "create_utility_meters": True, "utility_meter_types": ["daily"]}
+    await _setup(hass, [proxy])
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    meter_id = registry.async_get_entity_id("sensor", "sensor_proxy", "pa_daily")
+    assert meter_id == "sensor.pa_daily"
+    registry.async_update_entity(
+        meter_id, new_entity_id="sensor.my_meter", name="My meter"
+    )
+    await hass.async_block_till_done()
+
+    result = await _reload(hass, [{**proxy, "attributes_exclude": ["x"]}])
+    assert result["reconfigured"] == 1
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+    await hass.async_block_till_done()
+
+    entry = registry.async_get("sensor.my_meter")
+    assert entry is not None
+    assert entry.unique_id == "pa_daily"
+    assert entry.name == "My meter"
+    assert hass.states.get("sensor.my_meter") is not None
+    assert hass.states.get("sensor.pa_daily") is None
+
+
+async def test_invalid_config_keeps_proxies(hass: HomeAssistant) -> None:
+    """An invalid configuration fails the call and leaves the proxies running."""
+    await _setup(hass, [PROXY])
+    with pytest.raises(HomeAssistantError):
+        await _reload(hass, [{"platform": "sensor_proxy", "bogus": 1}])
+    assert hass.states.get("sensor.pa") is not None
+
+
+async def test_reload_pattern_block(hass: HomeAssistant) -> None:
+    """Proxies found by a pattern count as unchanged; removing the block stops it."""
+    block = {
+        "platform": "sensor_proxy",
+        "source_base": "sensor.dev",
+        "name_base": "p",
+        "unique_id_base": "p",
+        "sensors": "*",
+    }
+    hass.states.async_set("sensor.dev_a", "1")
+    await _setup(hass, [PROXY, block])
+    hass.states.async_set("sensor.dev_b", "2")
+    await hass.async_block_till_done()
+
+    result = await _reload(hass, [PROXY, block])
+    assert result["unchanged"] == 3
+    hass.states.async_set("sensor.dev_c", "3")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.p_c").state == "3"
+
+    result = await _reload(hass, [PROXY])
+    assert result["removed"] == 3
+    hass.states.async_set("sensor.dev_d", "4")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.p_d") is None
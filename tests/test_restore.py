@@ -0,0 +1,112 @@
+"""Tests for restoring the last known proxy state at startup."""
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.sensor_proxy.const import RESTORE_GRACE_PERIOD
+
+CONFIG = {
+    "sensor": [
+        {
+            "platform": "sensor_proxy",
+            "source_entity_id": "sensor.source",
+            "name": "copy",
+            "unique_id": "copy",
+        }
+    ]
+}
+
+
+@pytest.fixture
+def snapshot(hass_storage: dict[str, Any]) -> None:
+    """Store a snapshot of sensor.copy from a previous run."""
+    hass_storage["sensor_proxy.states"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "sensor_proxy.states",
+        "data": {"sensor.copy": ["12", "kWh", "energy", "total_increasing", None]},
+    }
+
+
+async def _setup(hass: HomeAssistant) -> None:
+    assert await async_setup_component(hass, "sensor", CONFIG)
+    await hass.async_block_till_done()
+
+
+async def _fire(hass: HomeAssistant, seconds: float) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+@pytest.mark.usefixtures("snapshot")
+async def test_restored_until_first_state(hass: HomeAssistant) -> None:
+    """The snapshot is shown until the source reports, then live data."""
+    await _setup(hass)
+    state = hass.states.get("sensor.copy")
+    assert state.state == "12"
+    assert state.attributes["restored"] is True
+    assert state.attributes["unit_of_measurement"] == "kWh"
+
+    hass.states.async_set("sensor.source", "13", {"unit_of_measurement": "kWh"})
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.copy")
+    assert state.state == "13"
+    assert "restored" not in state.attributes
+
+
+@pytest.mark.usefixtures("snapshot")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_placeholder_keeps_snapshot(hass: HomeAssistant) -> None:
+    """A source not loaded yet (restored placeholder) keeps the snapshot."""
+    await _setup(hass)
+    hass.states.async_set("sensor.source", STATE_UNAVAILABLE, {"restored": True})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.copy").state == "12"
+
+
+@pytest.mark.usefixtures("snapshot")
+async def test_unavailable_source_drops_snapshot(hass: HomeAssistant) -> None:
+    """A loaded source reporting unavailable makes the proxy unavailable."""
+    await _setup(hass)
+    hass.states.async_set("sensor.source", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.copy")
+    assert state.state == STATE_UNAVAILABLE
+    assert "restored" not in state.attributes
+
+
+@pytest.mark.usefixtures("snapshot")
+async def test_source_unavailable_at_start(hass: HomeAssistant) -> None:
+    """No snapshot is shown for a loaded source that is already unavailable."""
+    hass.states.async_set("sensor.source", STATE_UNAVAILABLE)
+    await _setup(hass)
+    assert hass.states.get("sensor.copy").state == STATE_UNAVAILABLE
+
+
+@pytest.mark.usefixtures("snapshot")
+async def test_grace_period_expires(hass: HomeAssistant) -> None:
+    """A source that never reports drops the snapshot after the grace period."""
+    await _setup(hass)
+    await _fire(hass, RESTORE_GRACE_PERIOD - 10)
+    assert hass.states.get("sensor.copy").state == "12"
+    await _fire(hass, RESTORE_GRACE_PERIOD + 1)
+    assert hass.states.get("sensor.copy").state == STATE_UNAVAILABLE
+
+
+async def test_snapshot_saved(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Written states are saved for the next start, after the save delay."""
+    await _setup(hass)
+    assert hass.states.get("sensor.copy").state == STATE_UNAVAILABLE
+    hass.states.async_set("sensor.source", "14", {"unit_of_measurement": "kWh"})
+    await hass.async_block_till_done()
+    await _fire(hass, 31)
+    assert hass_storage["sensor_proxy.states"]["data"] == {
+        "sensor.copy": ["14", "kWh", None, None, None]
+    }
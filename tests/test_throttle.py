@@ -0,0 +1,86 @@
+"""Tests for the min_interval, debounce and deadband update options."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+POWER = {"unit_of_measurement": "W"}
+
+
+async def _setup(hass: HomeAssistant, **options) -> None:
+    config = {
+        "platform": "sensor_proxy",
+        "source_entity_id": "sensor.src",
+        "name": "copy",
+        "unique_id": "copy",
+        **options,
+    }
+    assert await async_setup_component(hass, "sensor", {"sensor": [config]})
+    await hass.async_block_till_done()
+
+
+async def _set(hass: HomeAssistant, state: str, attributes: dict = POWER) -> None:
+    hass.states.async_set("sensor.src", state, attributes)
+    await hass.async_block_till_done()
+
+
+async def _advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+def _state(hass: HomeAssistant) -> str:
+    return hass.states.get("sensor.copy").state
+
+
+async def test_min_interval(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """The first change is written at once, the latest one after the interval."""
+    await _setup(hass, min_interval=5)
+    await _set(hass, "1")
+    assert _state(hass) == "1"
+
+    await _set(hass, "2")
+    await _set(hass, "3")
+    assert _state(hass) == "1"
+    await _advance(hass, freezer, 5.2)
+    assert _state(hass) == "3"
+
+    await _advance(hass, freezer, 10)
+    await _set(hass, "4")
+    assert _state(hass) == "4"
+
+
+async def test_debounce(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """A value is written once the source has been quiet for the debounce time."""
+    await _setup(hass, debounce=2)
+    for value in ("1", "2", "3"):
+        await _set(hass, value)
+        await _advance(hass, freezer, 1)
+    assert _state(hass) == "unavailable"
+
+    await _advance(hass, freezer, 1.2)
+    assert _state(hass) == "3"
+
+
+async def test_deadband(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Small changes are held back until the heartbeat; unavailable passes at once."""
+    await _setup(hass, deadband="10%")
+    await _set(hass, "100")
+    await _set(hass, "105")
+    assert _state(hass) == "100"
+    await _set(hass, "111")
+    assert _state(hass) == "111"
+
+    await _set(hass, "112")
+    assert _state(hass) == "111"
+    await _advance(hass, freezer, 301)
+    assert _state(hass) == "112"
+
+    await _set(hass, "unavailable", {})
+    assert _state(hass) == "unavailable"
@@ -0,0 +1,114 @@
+"""Tests for the shared timer wheel."""
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.sensor_proxy.timer_wheel import TimerWheel
+
+
+async def _fire(hass: HomeAssistant, seconds: float) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+async def test_runs_due_actions_once(hass: HomeAssistant) -> None:
+    """Each key runs once at its deadline; scheduling again replaces it."""
+    wheel = TimerWheel(hass)
+    calls = []
+    wheel.async_schedule_later("a", 1, lambda: calls.append("a1"))
+    wheel.async_schedule_later("a", 2, lambda: calls.append("a2"))
+    wheel.async_schedule_later("b", 1, lambda: calls.append("b"))
+    assert len(wheel) == 2
+
+    await _fire(hass, 1.5)
+    assert calls == ["b"]
+    await _fire(hass, 2.5)
+    assert calls == ["b", "a2"]
+    assert len(wheel) == 0
+
+
+async def test_cancel(hass: HomeAssistant) -> None:
+    """A cancelled key does not run."""
+    wheel = TimerWheel(hass)
+    calls = []
+    wheel.async_schedule_later("a", 1, lambda: calls.append("a"))
+    wheel.async_cancel("a")
+    wheel.async_cancel("unknown")
+    await _fire(hass, 2)
+    assert calls == []
+
+
+async def test_action_cancels_key_in_same_bucket(hass: HomeAssistant) -> None:
+    """An action may cancel a key due in the same tick; the others still run."""
+    wheel = TimerWheel(hass)
+    calls = []
+
+    def first() -> None:
+        calls.append("first")
+        wheel.async_cancel("second")
+
+    wheel.async_schedule_later("first", 1, first)
+    wheel.async_schedule_later("second", 1, lambda: calls.append("second"))
+    wheel.async_schedule_later("third", 1, lambda: calls.append("third"))
+
+    await _fire(hass, 2)
+    assert calls == ["first", "third"]
+    assert len(wheel) == 0
+
+
+async def test_action_reschedules_key_in_same_bucket(hass: HomeAssistant) -> None:
+    """An action may re-arm a key due in the same tick, e.g. a hold-down re-arming a debounce."""
+    wheel = TimerWheel(hass)
+    calls = []
+
+    def hold_down_expired() -> None:
+        calls.append("hold_down")
+        wheel.async_schedule_later("debounce", 5, lambda: calls.append("debounce2"))
+
+    wheel.async_schedule_later("hold_down", 1, hold_down_expired)
+    wheel.async_schedule_later("debounce", 1, lambda: calls.append("debounce1"))
+    wheel.async_schedule_later("other", 1, lambda: calls.append("other"))
+
+    await _fire(hass, 2)
+    assert calls == ["hold_down", "other"]
+    assert wheel.scheduled_at("debounce") is not None
+
+    await _fire(hass, 7)
+    assert calls == ["hold_down", "other", "debounce2"]
+    assert len(wheel) == 0
+
+
+async def test_action_reschedules_key_into_firing_tick(hass: HomeAssistant) -> None:
+    """Re-arming a pending key for the tick being fired runs only the new action."""
+    wheel = TimerWheel(hass)
+    calls = []
+    when = wheel.time() + 1
+
+    def first() -> None:
+        calls.append("first")
+        wheel.async_schedule_at("second", when, lambda: calls.append("second2"))
+
+    wheel.async_schedule_at("first", when, first)
+    wheel.async_schedule_at("second", when, lambda: calls.append("second1"))
+
+    await _fire(hass, 2)
+    await _fire(hass, 3)
+    assert calls == ["first", "second2"]
+    assert len(wheel) == 0
+
+
+async def test_failing_action_does_not_stop_bucket(hass: HomeAssistant) -> None:
+    """An exception in one action is logged and the rest of the bucket runs."""
+    wheel = TimerWheel(hass)
+    calls = []
+
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    wheel.async_schedule_later("fail", 1, fail)
+    wheel.async_schedule_later("ok", 1, lambda: calls.append("ok"))
+    await _fire(hass, 2)
+    assert calls == ["ok"]
@@ -0,0 +1,122 @@
+"""Tests for the window option and its ring buffer."""
+
+import random
+from datetime import timedelta
+
+import pytest
+import voluptuous as vol
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.sensor_proxy.schema import PLATFORM_SCHEMA
+from custom_components.sensor_proxy.window import WINDOW_FUNCTIONS, SampleWindow
+
+POWER = {"unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}
+ENERGY = {
+    "unit_of_measurement": "kWh",
+    "device_class": "energy",
+    "state_class": "total_increasing",
+}
+BASE = {"platform": "sensor_proxy", "source_entity_id": "sensor.src", "name": "copy"}
+
+
+async def _setup(hass: HomeAssistant, window: dict) -> None:
+    config = {**BASE, "unique_id": "copy", "window": window}
+    assert await async_setup_component(hass, "sensor", {"sensor": [config]})
+    await hass.async_block_till_done()
+
+
+async def _set(hass: HomeAssistant, state: str, attributes: dict = POWER) -> None:
+    hass.states.async_set("sensor.src", state, attributes)
+    await hass.async_block_till_done()
+
+
+async def _advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize("function", WINDOW_FUNCTIONS)
+def test_ring_buffer_matches_recomputation(function: str) -> None:
+    """The incremental result equals a recomputation over the live samples."""
+    rng = random.Random(1)
+    window = SampleWindow(function, 7, 5.0)
+    history: list[tuple[float, float]] = []
+    now = 0.0
+    for _ in range(2000):
+        now += rng.random()
+        value = float(rng.randint(-50, 50))
+        window.push(now, value)
+        history.append((now, value))
+
+        live = [sample for sample in history if sample[0] > now - 5.0][-7:]
+        values = [value for _, value in live]
+        assert len(window) == len(live)
+        result = window.result()
+        if function == "mean":
+            assert result == pytest.approx(sum(values) / len(values))
+        elif function == "min":
+            assert result == min(values)
+        elif function == "max":
+            assert result == max(values)
+        elif len(live) < 2:
+            assert result is None
+        else:
+            (first_at, first), (last_at, last) = live[0], live[-1]
+            assert result == pytest.approx((last - first) / (last_at - first_at))
+
+
+async def test_mean_over_samples(hass: HomeAssistant) -> None:
+    """A mean over the last max_samples values keeps the source unit."""
+    await _setup(hass, {"function": "mean", "max_samples": 3})
+    for value in ("1", "2", "3", "10"):
+        await _set(hass, value)
+
+    state = hass.states.get("sensor.copy")
+    assert state.state == "5.0"
+    assert state.attributes["unit_of_measurement"] == "W"
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_max_expires_by_age(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Samples older than duration leave the window without a new event."""
+    await _setup(hass, {"function": "max", "duration": 10})
+    await _set(hass, "100")
+    await _advance(hass, freezer, 5)
+    await _set(hass, "20")
+    assert hass.states.get("sensor.copy").state == "100"
+
+    await _advance(hass, freezer, 5.5)
+    assert hass.states.get("sensor.copy").state == "20"
+    await _advance(hass, freezer, 5.5)
+    assert hass.states.get("sensor.copy").state == "unknown"
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_rate(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """A rate is reported per second, as a measurement without device class."""
+    hass.states.async_set("sensor.src", "0", ENERGY)
+    await _setup(hass, {"function": "rate", "duration": 60})
+    await _advance(hass, freezer, 10)
+    await _set(hass, "0.5", ENERGY)
+
+    state = hass.states.get("sensor.copy")
+    assert float(state.state) == pytest.approx(0.05, rel=0.02)
+    assert state.attributes["unit_of_measurement"] == "kWh/s"
+    assert state.attributes["state_class"] == "measurement"
+    assert "device_class" not in state.attributes
+
+
+def test_schema() -> None:
+    """Unknown functions are rejected; max_samples defaults to 100."""
+    with pytest.raises(vol.Invalid):
+        PLATFORM_SCHEMA({**BASE, "window": {"function": "median"}})
+    config = PLATFORM_SCHEMA({**BASE, "window": {"function": "mean"}})
+    assert config["window"]["max_samples"] == 100